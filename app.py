@@ -1,10 +1,48 @@
+import atexit
+
 from flask import Flask
 from place.api import place_bp
 from weather.api import weather_bp
+from place.dao import MySQLCityDAO, MongoDBCityDAO
+from weather.dao import (MySQLGeneralWeatherDAO, MongoDBGeneralWeatherDAO,
+                         MySQLWeatherStatusDAO, MongoDBWeatherStatusDAO)
+from common.dao_provider import DAOProvider
+from common.settings import get_mysql_config, get_mongodb_config
+
+def create_dao_provider(provider: DAOProvider|None = None) -> DAOProvider:
+    """
+    Tạo DAOProvider của ứng dụng với các DAO được dùng bởi các API.
+
+    Args:
+        provider (DAOProvider | None, optional): DAOProvider để đăng ký các DAO vào,
+            None để tạo mới. Defaults to None.
+
+    Returns:
+        DAOProvider: DAOProvider đã đăng ký các DAO `city`, `general_weather`
+            và `weather_status` trên MySQL và MongoDB
+    """
+    if provider is None:
+        provider = DAOProvider()
+    daos = {
+        'city': (MySQLCityDAO, MongoDBCityDAO),
+        'general_weather': (MySQLGeneralWeatherDAO, MongoDBGeneralWeatherDAO),
+        'weather_status': (MySQLWeatherStatusDAO, MongoDBWeatherStatusDAO)
+    }
+    for name, (mysql_dao, mongodb_dao) in daos.items():
+        provider.register(name, 'MySQL', lambda dao=mysql_dao: dao(**get_mysql_config()))
+        provider.register(name, 'MongoDB', lambda dao=mongodb_dao: dao(**get_mongodb_config()))
+    return provider
+
 app = Flask(__name__)
 
+# Các DAO được tạo một lần cho cả ứng dụng, các API lấy qua `app.extensions['dao_provider']`
+dao_provider = create_dao_provider()
+app.extensions['dao_provider'] = dao_provider
+atexit.register(dao_provider.teardown)
+
 app.register_blueprint(place_bp, url_prefix='/api')
 app.register_blueprint(weather_bp, url_prefix='/api')
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    dao_provider.warm()
+    app.run(debug=True)
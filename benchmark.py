@@ -0,0 +1,635 @@
+"""
+Module `benchmark` cung cấp các hàm đo hiệu năng cho các quy trình
+của dự án. Các benchmark không cần kết nối tới Open Weather Map thật,
+thay vào đó sẽ sử dụng một server giả lập chạy trên localhost.
+
+Chạy bằng lệnh:
+```bash
+python benchmark.py <tên benchmark>
+```
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import os
+init_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
+import sys
+sys.path.append(init_dir)
+
+import json
+import time
+import threading
+import argparse
+import asyncio
+import logging
+from typing import Callable, Dict, List
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ghi log ra stderr, để các lần đo không ghi vào etl_log.log
+# (logging.basicConfig trong etl.py không làm gì khi logging đã được cấu hình)
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s',
+                    datefmt='%Y-%m-%d %H:%M:%S')
+
+FAKE_WEATHER_RESPONSE = {
+    'coord': {'lon': 105.854, 'lat': 21.0294},
+    'weather': [{'id': 501, 'main': 'Rain', 'description': 'moderate rain', 'icon': '10d'}],
+    'base': 'stations',
+    'main': {'temp': 284.2, 'feels_like': 282.93, 'temp_min': 283.06, 'temp_max': 286.82,
+             'pressure': 1021, 'humidity': 60, 'sea_level': 1021, 'grnd_level': 910},
+    'visibility': 10000,
+    'wind': {'speed': 4.09, 'deg': 121, 'gust': 3.47},
+    'rain': {'1h': 2.73},
+    'clouds': {'all': 83},
+    'dt': 1726660758,
+    'sys': {'type': 1, 'id': 6736, 'country': 'VN', 'sunrise': 1726636384, 'sunset': 1726680975},
+    'timezone': 25200,
+    'id': 1581130,
+    'name': 'Ha Noi',
+    'cod': 200
+}
+
+FAKE_AIR_RESPONSE = {
+    'coord': {'lon': 105.854, 'lat': 21.0294},
+    'list': [{'main': {'aqi': 3},
+              'components': {'co': 700.95, 'no': 0.02, 'no2': 12.17, 'o3': 54.36,
+                             'so2': 10.73, 'pm2_5': 35.52, 'pm10': 44.49, 'nh3': 5.95},
+              'dt': 1726660758}]
+}
+
+class _FakeOpenWeatherHandler(BaseHTTPRequestHandler):
+    """
+    Handler của server giả lập Open Weather Map, mỗi response sẽ bị
+    trễ một khoảng `latency` giây để mô phỏng độ trễ mạng.
+    """
+
+    latency: float = 0.05
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        if self.path.startswith('/data/2.5/air_pollution'):
+            body = FAKE_AIR_RESPONSE
+        else:
+            body = FAKE_WEATHER_RESPONSE
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class _FakeOpenWeatherServer(ThreadingHTTPServer):
+    """
+    Server giả lập Open Weather Map, hàng đợi kết nối đủ lớn để các benchmark
+    gửi nhiều request đồng thời không bị từ chối kết nối (phải chờ kết nối lại).
+    """
+
+    request_queue_size = 128
+    daemon_threads = True
+
+def start_fake_open_weather_server(latency: float = 0.05) -> ThreadingHTTPServer:
+    """
+    Khởi động server giả lập Open Weather Map trên một cổng ngẫu nhiên của localhost
+    và trỏ các URL của module `weather.business` tới server này.
+
+    Args:
+        latency (float, optional): Độ trễ (giây) của mỗi response. Defaults to 0.05.
+
+    Returns:
+        ThreadingHTTPServer: Server đang chạy, gọi `shutdown()` để dừng.
+    """
+    import tempfile
+    import weather.business as weather_business
+    from common.settings import set_config_file
+
+    _FakeOpenWeatherHandler.latency = latency
+    server = _FakeOpenWeatherServer(('127.0.0.1', 0), _FakeOpenWeatherHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    weather_business.WEATHER_BASE_URL = f'{base_url}/data/2.5/weather'
+    weather_business.AIR_BASE_URL = f'{base_url}/data/2.5/air_pollution'
+    
+    # Dùng một file cấu hình tạm thời với API Key giả
+    config_file = os.path.join(tempfile.mkdtemp(), 'config.json')
+    with open(config_file, 'w') as file:
+        json.dump({'OPEN_WEATHER_MAP_API_KEY': 'fake-api-key'}, file)
+    set_config_file(config_file)
+    return server
+
+def _fake_cities(n: int) -> list:
+    """
+    Tạo ra n thành phố giả để đo hiệu năng.
+
+    Args:
+        n (int): Số thành phố
+
+    Returns:
+        list[City]: Danh sách các thành phố
+    """
+    from place.model import City
+    return [City(city_id=i, name=f'City {i}', lon=105.854, lat=21.0294, time_zone=7)
+            for i in range(1, n + 1)]
+
+def _timeit(func: Callable) -> float:
+    """
+    Đo thời gian thực hiện một hàm.
+
+    Args:
+        func (Callable): Hàm cần đo
+
+    Returns:
+        float: Thời gian thực hiện (giây)
+    """
+    start_time = time.perf_counter()
+    func()
+    return time.perf_counter() - start_time
+
+def bench_extract(n_cities: int = 62, latency: float = 0.05) -> Dict[str, float]:
+    """
+    So sánh thời gian extract dữ liệu của n thành phố giữa các chế độ tuần tự,
+    thread pool và asyncio, dùng server giả lập Open Weather Map. Các trường hợp
+    `_limited` dùng HTTP client có bộ giới hạn số request đồng thời (tối đa 16).
+
+    Args:
+        n_cities (int, optional): Số thành phố. Defaults to 62.
+        latency (float, optional): Độ trễ (giây) của mỗi response. Defaults to 0.05.
+
+    Returns:
+        Dict[str, float]: Thời gian thực hiện (giây) của từng chế độ
+    """
+    import aiohttp
+    import etl
+    from common.http_client import HTTPClient, set_client
+
+    server = start_fake_open_weather_server(latency)
+    cities = _fake_cities(n_cities)
+
+    async def run_async():
+        async with aiohttp.ClientSession() as session:
+            return await etl._async_extract_all(cities, session, asyncio.Semaphore(50))
+
+    try:
+        results = {'sequential': _timeit(lambda: etl._extract_all(cities, max_workers=1))}
+        with etl._http_client_for(16):
+            results['thread_pool'] = _timeit(lambda: etl._extract_all(cities, max_workers=16))
+        results['asyncio'] = _timeit(lambda: asyncio.run(run_async()))
+
+        limited_client = HTTPClient(pool_size=32, max_concurrency=16)
+        old_client = set_client(limited_client)
+        try:
+            results['thread_pool_limited'] = _timeit(lambda: etl._extract_all(cities, max_workers=16))
+            results['asyncio_limited'] = _timeit(lambda: asyncio.run(run_async()))
+        finally:
+            set_client(old_client)
+            limited_client.close()
+    finally:
+        server.shutdown()
+    return results
+
+def bench_response_cache(n_cities: int = 62, latency: float = 0.05) -> Dict[str, float|int]:
+    """
+    So sánh thời gian extract dữ liệu của n thành phố khi chưa có và đã có dữ liệu
+    trong response cache (bộ nhớ và đĩa), dùng server giả lập Open Weather Map.
+
+    Args:
+        n_cities (int, optional): Số thành phố. Defaults to 62.
+        latency (float, optional): Độ trễ (giây) của mỗi response. Defaults to 0.05.
+
+    Returns:
+        Dict[str, float | int]: Thời gian thực hiện (giây) của từng lần chạy và số hit/miss
+    """
+    import tempfile
+    import etl
+    from weather.business import set_response_cache
+    from common.response_cache import MemoryResponseCache, DiskResponseCache
+
+    server = start_fake_open_weather_server(latency)
+    # Tọa độ khác nhau để mỗi thành phố có khóa cache riêng
+    cities = _fake_cities(n_cities)
+    for city in cities:
+        city.lat += city.city_id / 100
+
+    caches = {
+        'memory': MemoryResponseCache(ttl=600),
+        'disk': DiskResponseCache(os.path.join(tempfile.mkdtemp(), 'cache.sqlite3'), ttl=600)
+    }
+    results: Dict[str, float|int] = {}
+    try:
+        for name, cache in caches.items():
+            old_cache = set_response_cache(cache)
+            try:
+                with etl._http_client_for(16):
+                    results[f'{name}_cold'] = _timeit(lambda: etl._extract_all(cities, max_workers=16))
+                    results[f'{name}_warm'] = _timeit(lambda: etl._extract_all(cities, max_workers=16))
+            finally:
+                set_response_cache(old_cache)
+            results[f'{name}_hits'], results[f'{name}_misses'] = cache.stats()
+    finally:
+        caches['disk'].close()
+        server.shutdown()
+    return results
+
+class _MongoCommandCounter:
+    """
+    Đếm số lệnh (find, aggregate, getMore,...) được gửi tới MongoDB, dùng
+    cơ chế command monitoring của pymongo. Listener phải được đăng ký trước
+    khi tạo MongoClient.
+    """
+
+    def __init__(self):
+        from pymongo import monitoring
+
+        class Listener(monitoring.CommandListener):
+            def started(listener, event):
+                if self.enabled:
+                    self.count += 1
+
+            def succeeded(listener, event):
+                pass
+
+            def failed(listener, event):
+                pass
+
+        self.count = 0
+        self.enabled = False
+        monitoring.register(Listener())
+
+    def measure(self, func: Callable) -> int:
+        """
+        Đếm số lệnh được gửi tới MongoDB khi thực hiện một hàm.
+
+        Args:
+            func (Callable): Hàm cần đo
+
+        Returns:
+            int: Số lệnh đã gửi
+        """
+        self.count = 0
+        self.enabled = True
+        try:
+            func()
+        finally:
+            self.enabled = False
+        return self.count
+
+def bench_mongo_reads(n_statuses: int = 2000,
+                      db_name: str = 'weather_vietnam_benchmark') -> Dict[str, float|int]:
+    """
+    So sánh số lệnh gửi tới MongoDB và thời gian đọc lịch sử thời tiết của một thành phố
+    giữa cách đọc cũ (mỗi general weather một lệnh `find_one`) và `MongoDBWeatherStatusDAO.get_all`
+    (một aggregation pipeline với `$lookup`). Cần một mongod chạy ở địa chỉ trong cấu hình
+    `MONGODB`, dữ liệu được tạo trong CSDL tạm `db_name` và bị xóa khi kết thúc.
+
+    Args:
+        n_statuses (int, optional): Số trạng thái thời tiết của thành phố. Defaults to 2000.
+        db_name (str, optional): Tên CSDL tạm. Defaults to 'weather_vietnam_benchmark'.
+
+    Returns:
+        Dict[str, float | int]: Số lệnh và thời gian thực hiện (giây) của từng cách đọc
+    """
+    import datetime
+    from common.settings import get_mongodb_config
+    from weather.model import WeatherStatus
+    from weather.dao import MongoDBWeatherStatusDAO
+
+    counter = _MongoCommandCounter()
+    config = get_mongodb_config()
+    config['db'] = db_name
+    dao = MongoDBWeatherStatusDAO(**config)
+    general_collection = dao._general_weather_collection
+    status_collection = dao._weather_status_collection
+
+    # Tạo dữ liệu giả
+    with open(os.path.join(init_dir, 'db', 'init_general_weather_json.json'), 'r') as file:
+        general_collection.insert_many(json.load(file))
+    start = datetime.datetime(2025, 1, 1)
+    status_collection.insert_many([{
+        'city_id': 1, 'collect_time': start + datetime.timedelta(hours=i),
+        'temp': 300.0, 'feels_temp': 301.0, 'pressure': 1010, 'humidity': 70, 'sea_level': 1010,
+        'grnd_level': 1000, 'visibility': 10000, 'wind_speed': 2.0, 'wind_deg': 90, 'wind_gust': 3.0,
+        'clouds_all': 40, 'rain': None, 'sunrise': start, 'sunset': start, 'aqi': 2, 'pm2_5': 10.0,
+        'general_weathers': [{'status_id': 500}, {'status_id': 801}]
+    } for i in range(n_statuses)])
+
+    def read_naive():
+        statuses = []
+        for result in status_collection.find({'city_id': 1}):
+            result['general_weathers'] = [general_collection.find_one({'status_id': item['status_id']})
+                                          for item in result['general_weathers']]
+            statuses.append(WeatherStatus.from_json(result))
+        return statuses
+
+    try:
+        results: Dict[str, float|int] = {
+            'naive_commands': counter.measure(read_naive),
+            'lookup_commands': counter.measure(lambda: dao.get_all(1)),
+            'naive_time': _timeit(read_naive),
+            'lookup_time': _timeit(lambda: dao.get_all(1))
+        }
+    finally:
+        dao._client.drop_database(db_name)
+    return results
+
+def _sample_weather_status():
+    """
+    Tạo một trạng thái thời tiết mẫu, đầy đủ các trường.
+
+    Returns:
+        WeatherStatus: Trạng thái thời tiết mẫu
+    """
+    import datetime
+    from weather.model import WeatherStatus, GeneralWeather
+    start = datetime.datetime(2025, 1, 1)
+    return WeatherStatus(
+        city_id=1, collect_time=start, temp=300.0, feels_temp=301.0, pressure=1010,
+        humidity=70, sea_level=1010, grnd_level=1000, visibility=10000, wind_speed=2.0,
+        wind_deg=90, wind_gust=3.0, clouds_all=40, rain=0.5, sunrise=start, sunset=start,
+        aqi=2, pm2_5=10.0, general_weathers=[GeneralWeather.of(500), GeneralWeather.of(801)]
+    )
+
+class _DictWeatherStatus:
+    """
+    Đối tượng có cùng các thuộc tính với WeatherStatus nhưng lưu trong `__dict__`
+    (như WeatherStatus trước khi dùng `__slots__`), chỉ dùng để so sánh bộ nhớ.
+    """
+
+    def __init__(self, values: dict):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+def _traced_bytes(factory: Callable[[], list]) -> int:
+    """
+    Đo lượng bộ nhớ được cấp phát (và còn giữ lại) khi tạo ra một danh sách đối tượng.
+
+    Args:
+        factory (Callable[[], list]): Hàm tạo danh sách đối tượng
+
+    Returns:
+        int: Số byte còn được giữ bởi danh sách
+    """
+    import gc
+    import tracemalloc
+    gc.collect()
+    tracemalloc.start()
+    try:
+        snapshot_start = tracemalloc.take_snapshot()
+        objects = factory()
+        snapshot_end = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    size = sum(stat.size_diff for stat in snapshot_end.compare_to(snapshot_start, 'filename'))
+    del objects
+    return size
+
+def bench_model_memory(n_statuses: int = 100_000) -> Dict[str, float|int]:
+    """
+    So sánh bộ nhớ của mỗi đối tượng WeatherStatus (dùng `__slots__`) với một đối tượng
+    cùng thuộc tính lưu trong `__dict__`. Các đối tượng dùng chung giá trị của một trạng thái
+    mẫu, nên chỉ phần bộ nhớ của bản thân đối tượng được tính.
+
+    Args:
+        n_statuses (int, optional): Số đối tượng được tạo. Defaults to 100_000.
+
+    Returns:
+        Dict[str, float | int]: Số byte trung bình mỗi đối tượng và tổng số MB của từng cách lưu
+    """
+    from weather.model import WeatherStatus
+
+    sample = _sample_weather_status()
+    attributes = [f'_WeatherStatus{name}' for name in WeatherStatus.__slots__]
+    values = {attribute: getattr(sample, attribute) for attribute in attributes}
+
+    def build_dict_statuses():
+        return [_DictWeatherStatus(values) for _ in range(n_statuses)]
+
+    def build_slots_statuses():
+        statuses = []
+        for _ in range(n_statuses):
+            status = WeatherStatus.__new__(WeatherStatus)
+            for attribute, value in values.items():
+                setattr(status, attribute, value)
+            statuses.append(status)
+        return statuses
+
+    dict_bytes = _traced_bytes(build_dict_statuses)
+    slots_bytes = _traced_bytes(build_slots_statuses)
+    return {
+        'dict_bytes_per_instance': dict_bytes / n_statuses,
+        'slots_bytes_per_instance': slots_bytes / n_statuses,
+        'dict_total_mb': dict_bytes / 2**20,
+        'slots_total_mb': slots_bytes / 2**20
+    }
+
+def bench_from_db_row(n_rows: int = 10_000) -> Dict[str, float]:
+    """
+    So sánh chi phí tạo mỗi trạng thái thời tiết từ một dòng của MySQL (các cột decimal
+    là `Decimal`) giữa `WeatherStatus.from_tuple` (qua tất cả các setter) và
+    `WeatherStatus._from_db_row` (không kiểm tra lại).
+
+    Args:
+        n_rows (int, optional): Số dòng được chuyển đổi. Defaults to 10_000.
+
+    Returns:
+        Dict[str, float]: Thời gian trung bình mỗi dòng (micro giây) của từng cách
+    """
+    from decimal import Decimal
+    from weather.model import WeatherStatus, GeneralWeather
+
+    sample = _sample_weather_status()
+    row = tuple(Decimal(str(value)) if isinstance(value, float) else value
+                for value in sample.to_tuple()[:18])
+    conditions = [general_weather.to_tuple() for general_weather in sample.general_weathers]
+    general_weathers = [GeneralWeather.of(status_id, description) for status_id, description in conditions]
+    rows = [row] * n_rows
+
+    from_tuple_time = min(_timeit(lambda: [WeatherStatus.from_tuple(row + (conditions, )) for row in rows])
+                          for _ in range(3))
+    from_db_row_time = min(_timeit(lambda: [WeatherStatus._from_db_row(row, list(general_weathers)) for row in rows])
+                           for _ in range(3))
+    return {
+        'from_tuple_us_per_row': from_tuple_time / n_rows * 1e6,
+        'from_db_row_us_per_row': from_db_row_time / n_rows * 1e6
+    }
+
+def bench_api_latency(n_requests: int = 200, db: str = 'MongoDB',
+                      endpoint: str|None = '/api/weather/general_status') -> Dict[str, float]:
+    """
+    So sánh độ trễ của API giữa cách cũ (mỗi request tạo DAO mới với MongoClient/kết nối MySQL
+    riêng và đọc lại các file sql) và DAOProvider của ứng dụng (DAO được tạo một lần). Đo riêng thời gian lấy DAO và,
+    nếu có `endpoint`, thời gian của cả request qua Flask test client (cần CSDL `db` đang chạy).
+
+    Args:
+        n_requests (int, optional): Số request mỗi cách. Defaults to 200.
+        db (str, optional): DBMS được truyền vào tham số `db` của API. Defaults to 'MongoDB'.
+        endpoint (str | None, optional): API cần đo, None để chỉ đo thời gian lấy DAO.
+            Defaults to '/api/weather/general_status'.
+
+    Returns:
+        Dict[str, float]: Thời gian trung bình mỗi lần lấy DAO (micro giây) và mỗi request (mili giây)
+    """
+    import common.dao as common_dao
+    from pymongo import MongoClient
+    from app import app, create_dao_provider
+    from common.dao_provider import DAOProvider
+    from db.sql_reader import SQLFileReader, QueryRegistry
+
+    # Các tài nguyên riêng của từng DAO, được đóng sau khi đo xong
+    mongo_clients: List[MongoClient] = []
+    mysql_pools: List[common_dao.MySQLConnectionPool] = []
+
+    class UncachedQueryRegistry(QueryRegistry):
+        # Đọc lại file sql mỗi lần lấy reader
+        def get_reader(self, sql_file_path: str) -> SQLFileReader:
+            reader = SQLFileReader()
+            reader.read(sql_file_path=self.normalize_path(sql_file_path))
+            return reader
+
+    uncached_registry = UncachedQueryRegistry()
+
+    def new_mongo_client(uri: str) -> MongoClient:
+        client = MongoClient(uri)
+        mongo_clients.append(client)
+        return client
+
+    def new_mysql_pool(host: str, db: str, user: str, password: str, name: str|None = None,
+                       **pool_options) -> common_dao.MySQLConnectionPool:
+        # Một kết nối riêng, được mở ngay khi tạo DAO
+        pool = common_dao.MySQLConnectionPool(name or f'{user}@{host}/{db}', host, db, user, password, size=1)
+        mysql_pools.append(pool)
+        pool.release(pool.acquire())
+        return pool
+
+    class PerRequestDAOProvider(DAOProvider):
+        # Tạo DAO mới cho mỗi lần lấy như các API trước khi có DAOProvider: mỗi DAO có
+        # MongoClient/kết nối MySQL riêng và đọc lại các file sql
+        def get(self, name: str, dbms: str) -> object:
+            shared = (common_dao.get_mongo_client, common_dao.get_mysql_pool, common_dao.get_query_registry)
+            common_dao.get_mongo_client = new_mongo_client
+            common_dao.get_mysql_pool = new_mysql_pool
+            common_dao.get_query_registry = lambda: uncached_registry
+            try:
+                return self._factories[(name, dbms)]()
+            finally:
+                common_dao.get_mongo_client, common_dao.get_mysql_pool, common_dao.get_query_registry = shared
+
+    shared_provider = app.extensions['dao_provider']
+    per_request_provider = create_dao_provider(PerRequestDAOProvider())
+    shared_provider.warm([db])
+
+    try:
+        results: Dict[str, float] = {
+            'resolve_before_us': _timeit(lambda: [per_request_provider.get('weather_status', db)
+                                                  for _ in range(n_requests)]) / n_requests * 1e6,
+            'resolve_after_us': _timeit(lambda: [shared_provider.get('weather_status', db)
+                                                 for _ in range(n_requests)]) / n_requests * 1e6
+        }
+        if endpoint is not None:
+            client = app.test_client()
+            url = f'{endpoint}?db={db}'
+            try:
+                app.extensions['dao_provider'] = per_request_provider
+                results['request_before_ms'] = _timeit(lambda: [client.get(url) for _ in range(n_requests)]) / n_requests * 1e3
+            finally:
+                app.extensions['dao_provider'] = shared_provider
+            results['request_after_ms'] = _timeit(lambda: [client.get(url) for _ in range(n_requests)]) / n_requests * 1e3
+    finally:
+        for mongo_client in mongo_clients:
+            mongo_client.close()
+        for pool in mysql_pools:
+            pool.close()
+    return results
+
+def bench_dao_stress(dbms: str = 'MySQL', n_calls: int = 400, max_workers: int = 32,
+                     city_id: int = 999_999) -> Dict[str, float|int]:
+    """
+    Kiểm tra độ an toàn luồng của một weather status DAO: chạy đồng thời `n_calls` lời gọi
+    `insert`/`get_all` (xen kẽ) từ một thread pool trên cùng một DAO, sau đó kiểm tra số trạng thái
+    đã lưu. Cần CSDL `dbms` chạy ở địa chỉ trong cấu hình, dữ liệu được tạo cho thành phố tạm `city_id`
+    và bị xóa khi kết thúc.
+
+    Args:
+        dbms (str, optional): `'MySQL'` hoặc `'MongoDB'`. Defaults to 'MySQL'.
+        n_calls (int, optional): Tổng số lời gọi. Defaults to 400.
+        max_workers (int, optional): Số thread của thread pool. Defaults to 32.
+        city_id (int, optional): Id của thành phố tạm. Defaults to 999_999.
+
+    Returns:
+        Dict[str, float | int]: Số lời gọi, số lỗi, số trạng thái đã thêm và đã lưu, thời gian và thông lượng
+    """
+    import datetime
+    from concurrent.futures import ThreadPoolExecutor
+    from common.settings import get_mysql_config, get_mongodb_config
+    from place.model import City, Country
+    from place.dao import MySQLCityDAO
+    from weather.model import WeatherStatus, GeneralWeather
+    from weather.dao import MySQLWeatherStatusDAO, MongoDBWeatherStatusDAO
+
+    city_dao = None
+    if dbms == 'MySQL':
+        city_dao = MySQLCityDAO(**get_mysql_config())
+        city_dao.insert(City(city_id=city_id, name='Stress City', lon=105.854, lat=21.0294,
+                             time_zone=7, country=Country.of('VN')))
+        weather_dao = MySQLWeatherStatusDAO(**get_mysql_config())
+    else:
+        weather_dao = MongoDBWeatherStatusDAO(**get_mongodb_config())
+
+    start = datetime.datetime(2025, 1, 1)
+    def call(index: int) -> int:
+        if index % 2 == 0:
+            weather_dao.insert(WeatherStatus(
+                city_id=city_id, collect_time=start + datetime.timedelta(minutes=index),
+                temp=300.0, humidity=70, general_weathers=[GeneralWeather.of(800)]
+            ))
+            return 1
+        weather_dao.get_all(city_id)
+        return 0
+
+    errors = 0
+    inserted = 0
+    try:
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(call, index) for index in range(n_calls)]
+            for future in futures:
+                try:
+                    inserted += future.result()
+                except Exception:
+                    errors += 1
+        elapsed = time.perf_counter() - start_time
+        stored = len(weather_dao.get_all(city_id))
+    finally:
+        weather_dao.delete_all(city_id)
+        if city_dao is not None:
+            city_dao.delete(city_id)
+    return {
+        'calls': n_calls,
+        'errors': errors,
+        'inserted': inserted,
+        'stored': stored,
+        'time': elapsed,
+        'calls_per_second': n_calls / elapsed
+    }
+
+BENCHMARKS: Dict[str, Callable[[], dict]] = {
+    'extract': bench_extract,
+    'response_cache': bench_response_cache,
+    'mongo_reads': bench_mongo_reads,
+    'model_memory': bench_model_memory,
+    'from_db_row': bench_from_db_row,
+    'api_latency': bench_api_latency,
+    'dao_stress': bench_dao_stress
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks of WeatherVietnam')
+    parser.add_argument('name', choices=list(BENCHMARKS.keys()))
+    args = parser.parse_args()
+
+    for key, value in BENCHMARKS[args.name]().items():
+        print(f'{key}: {value:.4f}' if isinstance(value, float) else f'{key}: {value}')
@@ -7,8 +7,8 @@ Author:
 Last Modified Date: 
     02/02/2025
 Module:
-    `dao`
+    `dao`, `dao_provider`, `http_client`, `interning`, `rate_limit`, `response_cache`, `settings`
 """
-from . import dao
+from . import dao, dao_provider, http_client, interning, rate_limit, response_cache, settings
 
-__all__ = ['dao']
\ No newline at end of file
+__all__ = ['dao', 'dao_provider', 'http_client', 'interning', 'rate_limit', 'response_cache', 'settings']
\ No newline at end of file
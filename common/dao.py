@@ -5,7 +5,7 @@ mà mọi Data Access Object (DAO) cần phải có.
 Author: 
     Lê Minh Triết
 Last Modified Date: 
-    02/02/2025
+    18/10/2026
 """
 
 # Cấu hình đường dẫn tới thư mục ban đầu
@@ -14,12 +14,20 @@ init_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 import sys
 sys.path.append(init_dir)
 
-from typing import Dict, List
+import time
+import atexit
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
 
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.abstracts import MySQLConnectionAbstract, MySQLCursorAbstract
+from mysql.connector.cursor import MySQLCursorPrepared
 
-from db.sql_reader import SQLFileReader
+from db.sql_reader import SQLFileReader, get_query_registry
+from common.settings import get_mysql_pool_config, get_mongodb_pool_config
 
 from pymongo import MongoClient
 from pymongo.collection import Collection
@@ -52,14 +60,293 @@ class NotExistDataException(DAOException):
         """
         super().__init__(message)
         
+class MySQLConnectionPool:
+    """
+    Pool các kết nối tới MySQL, có thể dùng chung giữa nhiều thread. Kết nối chỉ được tạo
+    khi cần (tối đa `size` kết nối), khi pool hết kết nối thì thread mượn sẽ phải chờ tối đa
+    `checkout_timeout` giây. Các kết nối đã nằm trong pool lâu hơn `validate_idle` giây sẽ
+    được kiểm tra (ping) trước khi cho mượn, kết nối hỏng sẽ bị bỏ và thay bằng kết nối mới.
+    Kết nối có thao tác bị lỗi (xem `mark_failed`) được kiểm tra lại ngay khi được trả lại.
+    """
+    
+    def __init__(self, name: str, host: str, db: str, user: str, password: str,
+                 size: int = 5, checkout_timeout: float = 10.0, validate_idle: float = 30.0):
+        """
+        Khởi tạo một pool kết nối MySQL.
+
+        Args:
+            name (str): Tên của pool
+            host (str): Máy chủ CSDL.
+            db (str): Tên của CSDL.
+            user (str): Tên đăng nhập để truy cập vào CSDL.
+            password (str): Mật khẩu bạn dùng để truy cập CSDL với tên đăng nhập trên.
+            size (int, optional): Số kết nối tối đa. Defaults to 5.
+            checkout_timeout (float, optional): Thời gian tối đa (giây) chờ mượn kết nối. Defaults to 10.0.
+            validate_idle (float, optional): Kết nối không được dùng lâu hơn số giây này sẽ được
+                ping trước khi cho mượn, 0 để luôn kiểm tra. Defaults to 30.0.
+        """
+        if size < 1 or checkout_timeout <= 0 or validate_idle < 0:
+            raise ValueError("Invalid pool configuration!")
+        self._name = name
+        self._connect_args = {'host': host, 'database': db, 'user': user, 'password': password}
+        self._size = size
+        self._checkout_timeout = checkout_timeout
+        self._validate_idle = validate_idle
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        # Các kết nối rảnh cùng thời điểm được trả lại, lấy theo LIFO
+        self._idle: List[tuple[MySQLConnectionAbstract, float]] = []
+        # Các kết nối đang được mượn có thao tác bị lỗi
+        self._failed: set[MySQLConnectionAbstract] = set()
+        self._closed = False
+    
+    @property
+    def name(self) -> str:
+        return self._name
+    
+    @property
+    def size(self) -> int:
+        return self._size
+    
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+    
+    def _discard(self, connection: MySQLConnectionAbstract) -> None:
+        """
+        Đóng hẳn một kết nối, bỏ qua lỗi nếu kết nối đã hỏng.
+
+        Args:
+            connection (MySQLConnectionAbstract): Kết nối cần đóng
+        """
+        try:
+            connection.close()
+        except Error:
+            pass
+    
+    def acquire(self) -> MySQLConnectionAbstract:
+        """
+        Mượn một kết nối từ pool, kết nối phải được trả lại bằng `release`.
+
+        Raises:
+            DAOException: Nếu pool đã đóng, hết thời gian chờ hoặc không kết nối được tới CSDL
+
+        Returns:
+            MySQLConnectionAbstract: Kết nối được mượn
+        """
+        if self._closed:
+            raise DAOException(f"Pool {self._name} is closed!")
+        if not self._slots.acquire(timeout=self._checkout_timeout):
+            raise DAOException(f"Timed out waiting for a connection from pool {self._name}!")
+        try:
+            while True:
+                with self._lock:
+                    connection, returned_at = self._idle.pop() if self._idle else (None, 0.0)
+                if connection is None:
+                    return mysql.connector.connect(**self._connect_args)
+                if time.monotonic() - returned_at < self._validate_idle or connection.is_connected():
+                    return connection
+                self._discard(connection)
+        except Error as ex:
+            self._slots.release()
+            raise DAOException(ex.msg)
+        except BaseException:
+            self._slots.release()
+            raise
+    
+    def mark_failed(self, connection: MySQLConnectionAbstract) -> None:
+        """
+        Đánh dấu một kết nối đang được mượn có thao tác bị lỗi (ví dụ mất kết nối tới
+        máy chủ), kết nối sẽ được kiểm tra lại khi được trả lại và bị bỏ nếu đã hỏng.
+
+        Args:
+            connection (MySQLConnectionAbstract): Kết nối đã mượn
+        """
+        with self._lock:
+            self._failed.add(connection)
+    
+    def release(self, connection: MySQLConnectionAbstract) -> None:
+        """
+        Trả lại một kết nối đã mượn. Transaction còn dở (kể cả snapshot của các câu lệnh
+        SELECT) sẽ bị rollback để lần mượn sau thấy dữ liệu mới nhất. Kết nối đã bị đánh
+        dấu lỗi bằng `mark_failed` sẽ bị bỏ nếu không còn kết nối được tới máy chủ.
+
+        Args:
+            connection (MySQLConnectionAbstract): Kết nối đã mượn
+        """
+        try:
+            with self._lock:
+                failed = connection in self._failed
+                self._failed.discard(connection)
+            if self._closed or (failed and not connection.is_connected()):
+                self._discard(connection)
+                return
+            try:
+                if connection.in_transaction:
+                    connection.rollback()
+            except Error:
+                self._discard(connection)
+                return
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+        finally:
+            self._slots.release()
+    
+    @contextmanager
+    def connection(self) -> Iterator[MySQLConnectionAbstract]:
+        """
+        Mượn một kết nối trong một khối `with`, kết nối được trả lại khi ra khỏi khối.
+
+        Yields:
+            MySQLConnectionAbstract: Kết nối được mượn
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+    
+    def close(self) -> None:
+        """
+        Đóng pool và các kết nối đang rảnh, các kết nối đang được mượn sẽ bị đóng khi được trả lại.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._discard(connection)
+
+_mysql_pools: Dict[str, MySQLConnectionPool] = {}
+_mysql_pools_lock = threading.Lock()
+
+def get_mysql_pool(host: str, db: str, user: str, password: str,
+                   name: str|None = None, **pool_options) -> MySQLConnectionPool:
+    """
+    Lấy pool kết nối MySQL dùng chung của tiến trình theo tên, tạo mới nếu chưa có.
+    Các tham số của pool mới mặc định lấy từ mục `MYSQL_POOL` trong cấu hình.
+
+    Args:
+        host (str): Máy chủ CSDL.
+        db (str): Tên của CSDL.
+        user (str): Tên đăng nhập để truy cập vào CSDL.
+        password (str): Mật khẩu bạn dùng để truy cập CSDL với tên đăng nhập trên.
+        name (str | None, optional): Tên của pool, mặc định là `'user@host/db'`. Defaults to None.
+        **pool_options: Các tham số `size`, `checkout_timeout`, `validate_idle` của pool mới
+
+    Returns:
+        MySQLConnectionPool: Pool kết nối
+    """
+    if name is None:
+        name = f'{user}@{host}/{db}'
+    pool = _mysql_pools.get(name)
+    if pool is None:
+        with _mysql_pools_lock:
+            pool = _mysql_pools.get(name)
+            if pool is None:
+                options = get_mysql_pool_config()
+                options.update(pool_options)
+                pool = MySQLConnectionPool(name, host, db, user, password, **options)
+                _mysql_pools[name] = pool
+    return pool
+
+def close_mysql_pools() -> None:
+    """
+    Đóng tất cả các pool kết nối MySQL của tiến trình.
+    """
+    with _mysql_pools_lock:
+        pools = list(_mysql_pools.values())
+        _mysql_pools.clear()
+    for pool in pools:
+        pool.close()
+
+atexit.register(close_mysql_pools)
+
+# Các prepared cursor (mỗi cursor giữ một statement đã prepare trên server) của từng kết nối,
+# theo câu lệnh SQL, kèm đúng đối tượng câu lệnh đã dùng để prepare. Bị xóa cùng với kết nối.
+_prepared_cursors: 'weakref.WeakKeyDictionary[MySQLConnectionAbstract, Dict[str, tuple[MySQLCursorPrepared, str]]]' = \
+    weakref.WeakKeyDictionary()
+_prepared_cursors_lock = threading.Lock()
+
+class PreparedStatementCursor:
+    """
+    Cursor dùng lại các prepared statement của một kết nối: mỗi câu lệnh SQL chỉ được
+    prepare một lần trên mỗi kết nối (ở lần execute đầu tiên), các lần sau chỉ execute.
+    Chỉ được dùng bởi thread đang mượn kết nối. Số lần prepare/execute được đếm
+    trong `db.sql_reader.get_query_registry()`.
+    """
+    
+    def __init__(self, connection: MySQLConnectionAbstract):
+        """
+        Khởi tạo một cursor trên một kết nối đã mượn.
+
+        Args:
+            connection (MySQLConnectionAbstract): Kết nối đã mượn
+        """
+        self._connection = connection
+        with _prepared_cursors_lock:
+            self._cursors = _prepared_cursors.setdefault(connection, {})
+        self._current: MySQLCursorPrepared|None = None
+    
+    def _consume_result(self) -> None:
+        """
+        Đọc hết các dòng chưa đọc của câu lệnh trước, để kết nối có thể thực hiện câu lệnh khác.
+        """
+        if self._current is not None and self._connection.unread_result:
+            self._current.fetchall()
+    
+    def execute(self, operation: str, params: tuple = ()) -> None:
+        """
+        Thực hiện một câu lệnh, prepare câu lệnh nếu kết nối chưa prepare lần nào.
+
+        Args:
+            operation (str): Câu lệnh SQL
+            params (tuple, optional): Các tham số của câu lệnh. Defaults to ().
+        """
+        self._consume_result()
+        registry = get_query_registry()
+        entry = self._cursors.get(operation)
+        if entry is None:
+            entry = (self._connection.cursor(prepared=True), operation)
+            self._cursors[operation] = entry
+            registry.count_prepare()
+        cursor, prepared_operation = entry
+        self._current = cursor
+        # mysql-connector chỉ bỏ qua bước prepare khi nhận lại đúng đối tượng câu lệnh đã
+        # prepare (so sánh `is`), nên luôn truyền đối tượng được lưu lần đầu
+        cursor.execute(prepared_operation, params)
+        registry.count_execute()
+    
+    def fetchone(self) -> tuple|None:
+        return self._current.fetchone()
+    
+    def fetchall(self) -> list[tuple]:
+        return self._current.fetchall()
+    
+    def close(self) -> None:
+        """
+        Kết thúc việc dùng cursor, các statement vẫn được giữ lại trên kết nối để dùng lại.
+        """
+        self._consume_result()
+        self._current = None
+
 class BasicMySQLDAO:
     """
     Cung cấp các phương thức cơ bản mà một DAO với CSDL MySQL cần phải có.
     Đó là các phương thức để kết nối tới CSDL và phương thức để đọc các 
     câu lệnh cho phép từ một file sql.
+    
+    DAO không giữ kết nối riêng, mỗi thao tác sẽ mượn một kết nối từ pool dùng chung
+    của tiến trình (xem `get_mysql_pool`) và trả lại ngay khi xong.
+    
+    An toàn luồng: sau khi khởi tạo, trạng thái của DAO (pool, các câu lệnh đã đọc)
+    chỉ được đọc, mỗi lời gọi dùng kết nối và cursor riêng, nên một DAO có thể dùng chung
+    giữa nhiều thread (ví dụ các worker của Flask hoặc các thread của ETL). Mỗi thao tác
+    là một transaction riêng, không có transaction nào kéo dài qua nhiều lời gọi. Số thao tác
+    chạy đồng thời bị giới hạn bởi `size` của pool, các thread còn lại sẽ chờ.
     """
     
-    def __init__(self, host: str, db: str, user: str, password: str, queriesFile: str|list[str]|None = None):
+    def __init__(self, host: str, db: str, user: str, password: str, queriesFile: str|list[str]|None = None,
+                 pool_name: str|None = None):
         """
         Khởi tạo một DAO chung cho các DAO dùng CSDL MySQL.
         
@@ -71,14 +358,17 @@ class BasicMySQLDAO:
             password (str): Mật khẩu bạn dùng để truy cập CSDL với tên đăng nhập trên.
             queriesFile (str | list[str] | None, optional): Đường dẫn tới các file
                 sql cần đọc, có thể có nhiều đường dẫn tới nhiều file. Defaults to None.
+            pool_name (str | None, optional): Tên của pool kết nối dùng chung, mặc định
+                là `'user@host/db'`. Defaults to None.
         """
-        self.connect_(host, db, user, password)
+        self.connect_(host, db, user, password, pool_name)
         self._sqlFileReaders: Dict[str, SQLFileReader] = {}
         self.get_sql_file_reader_(queriesFile)
         
-    def connect_(self, host: str, db: str, user: str, password: str):
+    def connect_(self, host: str, db: str, user: str, password: str, pool_name: str|None = None):
         """
-        Thiết lập kết nối tới CSDL với các thông tin được truyền vào.
+        Lấy pool kết nối dùng chung tới CSDL với các thông tin được truyền vào.
+        Kết nối chỉ thực sự được tạo khi có thao tác đầu tiên cần tới.
         
         Args:
             host (str): Máy chủ CSDL. Nếu bạn sử dụng localhost (địa chỉ loopback) 
@@ -86,27 +376,63 @@ class BasicMySQLDAO:
             db (str): Tên của CSDL.
             user (str): Tên đăng nhập để truy cập vào CSDL, thông thường là `'root'`.
             password (str): Mật khẩu bạn dùng để truy cập CSDL với tên đăng nhập trên.
+            pool_name (str | None, optional): Tên của pool kết nối. Defaults to None.
+        """
+        self._pool = get_mysql_pool(host, db, user, password, name=pool_name)
         
+    def checkout_(self, prepared: bool = False) -> tuple[MySQLConnectionAbstract,
+                                                         MySQLCursorAbstract|PreparedStatementCursor]:
+        """
+        Mượn một kết nối từ pool và mở một cursor trên kết nối đó. Kết nối phải
+        được trả lại bằng `release_` (thường đặt trong khối `finally`).
+
+        Args:
+            prepared (bool, optional): Dùng prepared statement, các statement được giữ lại
+                trên kết nối và dùng lại ở các lần sau (xem `PreparedStatementCursor`). Defaults to False.
+
         Raises:
-            DAOException: Nếu kết nối có vấn đề
+            DAOException: Nếu không mượn được kết nối hoặc không mở được cursor
+
+        Returns:
+            tuple[MySQLConnectionAbstract, MySQLCursorAbstract | PreparedStatementCursor]: Kết nối và cursor
         """
+        connection = self._pool.acquire()
         try:
-            self._connection = mysql.connector.connect(
-                host=host,
-                database=db,
-                user=user,
-                password=password
-            )              
+            if prepared:
+                return connection, PreparedStatementCursor(connection)
+            return connection, connection.cursor()
         except Error as ex:
+            self._pool.mark_failed(connection)
+            self._pool.release(connection)
             raise DAOException(ex.msg)
         
+    def mark_failed_(self, connection: MySQLConnectionAbstract) -> None:
+        """
+        Báo cho pool biết thao tác trên kết nối đã mượn bị lỗi, để kết nối được kiểm tra
+        lại khi trả về pool thay vì cho mượn tiếp một kết nối đã hỏng.
+
+        Args:
+            connection (MySQLConnectionAbstract): Kết nối đã mượn
+        """
+        self._pool.mark_failed(connection)
+        
+    def release_(self, connection: MySQLConnectionAbstract) -> None:
+        """
+        Trả lại kết nối đã mượn bằng `checkout_` cho pool.
+
+        Args:
+            connection (MySQLConnectionAbstract): Kết nối đã mượn
+        """
+        self._pool.release(connection)
+        
     def get_sql_file_reader_(self, queriesFile: str|list[str]|None):
         """
         Đọc các file sql và lấy những câu lệnh hợp lệ từ file đó.
         
         Các câu lệnh sẽ được lưu vào 1 dict (attribute của class), với
         key là định danh của file (đường dẫn tới file đó) và value là
-        list các câu lệnh hợp lệ được đọc từ file đó.
+        list các câu lệnh hợp lệ được đọc từ file đó. Mỗi file chỉ được
+        đọc một lần mỗi tiến trình (xem `db.sql_reader.QueryRegistry`).
         
         Có thể xem thêm module `db.info`.
         
@@ -125,23 +451,71 @@ class BasicMySQLDAO:
             queriesFiles = queriesFile
         for file in queriesFiles:
             try:
-                newFileReader = SQLFileReader()
                 sql_file_path = os.path.join(init_dir, file)
-                newFileReader.read(sql_file_path=sql_file_path)
-                self._sqlFileReaders[file] = newFileReader
+                self._sqlFileReaders[file] = get_query_registry().get_reader(sql_file_path)
             except Exception as ioException:
                 raise DAOException(f"Can't read {file}!")
                 
     def close_connection(self):
         """
-        Đóng lại kết nối tới CSDL hiện tại.
+        Giữ lại để tương thích: DAO không còn giữ kết nối riêng (các kết nối được trả lại
+        pool sau mỗi thao tác) nên không cần đóng. Để đóng các pool dùng `close_mysql_pools`.
         """
-        self._connection.close()
+        pass
+
+_mongo_clients: Dict[str, MongoClient] = {}
+_mongo_clients_lock = threading.Lock()
+
+def get_mongo_client(uri: str) -> MongoClient:
+    """
+    Lấy MongoClient dùng chung của tiến trình theo URI (đã bao gồm thông tin đăng nhập),
+    tạo mới nếu chưa có. Mỗi MongoClient có pool kết nối và các thread giám sát riêng nên
+    mỗi máy chủ chỉ nên có một client. Kích thước pool lấy từ mục `MONGODB_POOL` trong cấu hình.
+
+    Args:
+        uri (str): URI kết nối tới MongoDB
+
+    Returns:
+        MongoClient: Client dùng chung
+    """
+    client = _mongo_clients.get(uri)
+    if client is None:
+        with _mongo_clients_lock:
+            client = _mongo_clients.get(uri)
+            if client is None:
+                pool_config = get_mongodb_pool_config()
+                options = {
+                    'maxPoolSize': pool_config['max_pool_size'],
+                    'minPoolSize': pool_config['min_pool_size'],
+                    'maxIdleTimeMS': pool_config['max_idle_time_ms'],
+                    'waitQueueTimeoutMS': pool_config['wait_queue_timeout_ms']
+                }
+                client = MongoClient(uri, **{key: value for key, value in options.items() if value is not None})
+                _mongo_clients[uri] = client
+    return client
+
+def close_mongo_clients() -> None:
+    """
+    Đóng tất cả các MongoClient dùng chung của tiến trình.
+    """
+    with _mongo_clients_lock:
+        clients = list(_mongo_clients.values())
+        _mongo_clients.clear()
+    for client in clients:
+        client.close()
+
+atexit.register(close_mongo_clients)
 
 class BasicMongoDBDAO:
     """
     Cung cấp các phương thức cơ bản mà một DAO với CSDL MongoDB cần phải có.
     Đó là các phương thức để kết nối tới CSDL.
+    
+    Các DAO cùng URI dùng chung một MongoClient (xem `get_mongo_client`).
+    
+    An toàn luồng: MongoClient và các Collection của pymongo an toàn khi dùng từ nhiều
+    thread, DAO không có trạng thái nào khác bị thay đổi sau khi khởi tạo, nên một DAO
+    có thể dùng chung giữa nhiều thread.
     """
     
     def __init__(self, host: str, port: int,
@@ -183,8 +557,8 @@ class BasicMongoDBDAO:
         else:
             uri = f'mongodb://{host}:{port}/'
             
-        # Lấy kết nối db và các collection được yêu cầu
-        self._client = MongoClient(uri)
+        # Lấy client dùng chung, kết nối db và các collection được yêu cầu
+        self._client = get_mongo_client(uri)
         this_db = self._client[db]
         
         self._collections = None
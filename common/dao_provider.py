@@ -0,0 +1,111 @@
+"""
+Module `dao_provider` cung cấp một bộ quản lý DAO ở mức ứng dụng. Các DAO được
+tạo một lần (kể cả việc đọc và parse các file sql) rồi dùng lại cho mọi request,
+nên mỗi lần lấy DAO chỉ còn là một lần tra cứu dict.
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import os
+init_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+import sys
+sys.path.append(init_dir)
+
+import logging
+import threading
+from typing import Callable, Dict, Iterable
+
+from common.dao import close_mysql_pools, close_mongo_clients
+
+class DAOProvider:
+    """
+    Quản lý các DAO dùng chung của ứng dụng theo tên DAO và DBMS. Mỗi DAO được tạo
+    từ factory đã đăng ký ở lần lấy đầu tiên (hoặc khi `warm`), các lần sau dùng lại.
+    Có thể dùng chung giữa nhiều thread.
+    """
+
+    def __init__(self):
+        """
+        Khởi tạo một DAOProvider chưa có factory nào.
+        """
+        self._factories: Dict[tuple[str, str], Callable[[], object]] = {}
+        self._daos: Dict[tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, dbms: str, factory: Callable[[], object]) -> None:
+        """
+        Đăng ký factory tạo DAO cho một tên DAO và một DBMS.
+
+        Args:
+            name (str): Tên DAO (ví dụ `'city'`)
+            dbms (str): DBMS mà DAO sử dụng (ví dụ `'MySQL'`, `'MongoDB'`)
+            factory (Callable[[], object]): Hàm tạo DAO
+        """
+        with self._lock:
+            self._factories[(name, dbms)] = factory
+            self._daos.pop((name, dbms), None)
+
+    def get(self, name: str, dbms: str) -> object:
+        """
+        Lấy DAO dùng chung theo tên và DBMS, tạo mới nếu chưa có.
+
+        Args:
+            name (str): Tên DAO
+            dbms (str): DBMS mà DAO sử dụng
+
+        Raises:
+            KeyError: Nếu chưa có factory nào được đăng ký cho (name, dbms)
+
+        Returns:
+            object: DAO dùng chung
+        """
+        key = (name, dbms)
+        dao = self._daos.get(key)
+        if dao is None:
+            with self._lock:
+                dao = self._daos.get(key)
+                if dao is None:
+                    if key not in self._factories:
+                        raise KeyError(f"No DAO registered for {name} on {dbms}!")
+                    dao = self._factories[key]()
+                    self._daos[key] = dao
+        return dao
+
+    def warm(self, dbms: Iterable[str]|None = None) -> int:
+        """
+        Tạo trước các DAO đã đăng ký (ví dụ khi khởi động ứng dụng). DAO nào tạo lỗi sẽ
+        được ghi log và bỏ qua, sẽ được tạo lại ở lần lấy sau.
+
+        Args:
+            dbms (Iterable[str] | None, optional): Chỉ tạo các DAO của các DBMS này,
+                None để tạo tất cả. Defaults to None.
+
+        Returns:
+            int: Số DAO đã sẵn sàng
+        """
+        dbms = None if dbms is None else set(dbms)
+        ready = 0
+        for name, key_dbms in list(self._factories):
+            if dbms is not None and key_dbms not in dbms:
+                continue
+            try:
+                self.get(name, key_dbms)
+                ready += 1
+            except Exception as e:
+                logging.warning(f'Failed to create {name} DAO on {key_dbms}: {e}')
+        return ready
+
+    def teardown(self) -> None:
+        """
+        Bỏ tất cả các DAO đã tạo và đóng các pool kết nối MySQL, MongoClient dùng chung.
+        """
+        with self._lock:
+            self._daos.clear()
+        close_mysql_pools()
+        close_mongo_clients()
+
+    def __len__(self) -> int:
+        return len(self._daos)
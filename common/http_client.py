@@ -0,0 +1,251 @@
+"""
+Module `http_client` cung cấp một HTTP client dùng chung, có pool kết nối
+(keep-alive), timeout và chính sách retry, để gọi tới các API của
+Open Weather Map.
+
+Một client dùng chung cho toàn bộ tiến trình được quản lý bởi các hàm
+`get_client`, `set_client` và `close_client`.
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import time
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from common.settings import get_http_config
+from common.rate_limit import TokenBucket, AdaptiveConcurrencyLimiter
+
+class HTTPClient:
+    """
+    HTTP client dựa trên `requests.Session`, giữ lại các kết nối đã mở để dùng lại
+    cho các request sau (tránh phải bắt tay TCP/TLS lại từ đầu).
+    
+    Mọi request đi qua client đều dùng chung một token bucket (giới hạn theo quota
+    mỗi phút) và một bộ giới hạn số request đồng thời tự điều chỉnh. Các response
+    429/5xx được thử lại bởi chính client để các bộ giới hạn nhận biết được.
+
+    Một `HTTPClient` có thể được dùng chung bởi nhiều thread.
+    """
+
+    def __init__(self, pool_size: int = 10,
+                 connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 max_retries: int = 3, backoff_factor: float = 0.5,
+                 retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+                 calls_per_minute: float|None = None,
+                 max_concurrency: int|None = None,
+                 initial_concurrency: int|None = None):
+        """
+        Khởi tạo một HTTP client.
+
+        Args:
+            pool_size (int, optional): Số kết nối tối đa được giữ lại cho mỗi host. Defaults to 10.
+            connect_timeout (float, optional): Thời gian chờ kết nối tối đa (giây). Defaults to 3.05.
+            read_timeout (float, optional): Thời gian chờ đọc response tối đa (giây). Defaults to 10.0.
+            max_retries (int, optional): Số lần thử lại tối đa của 1 request. Defaults to 3.
+            backoff_factor (float, optional): Hệ số thời gian chờ giữa các lần thử lại,
+                lần thử thứ n sẽ chờ `backoff_factor * 2^(n-1)` giây. Defaults to 0.5.
+            retry_statuses (tuple[int, ...], optional): Các status code sẽ được thử lại.
+                Defaults to (429, 500, 502, 503, 504).
+            calls_per_minute (float | None, optional): Quota số request mỗi phút, None nếu
+                không giới hạn. Defaults to None.
+            max_concurrency (int | None, optional): Số request đồng thời tối đa, None nếu
+                không giới hạn. Defaults to None.
+            initial_concurrency (int | None, optional): Số request đồng thời ban đầu, chỉ dùng khi
+                có `max_concurrency`. Nếu là None thì bắt đầu từ `max_concurrency` và chỉ giảm
+                khi gặp 429/5xx. Defaults to None.
+        """
+        if pool_size < 1:
+            raise ValueError("Pool size is positive!")
+        self._pool_size = pool_size
+        self._timeout = (connect_timeout, read_timeout)
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._retry_statuses = frozenset(retry_statuses)
+        
+        self._rate_limiter = TokenBucket(calls_per_minute) if calls_per_minute else None
+        self._concurrency_limiter = None
+        if max_concurrency:
+            self._concurrency_limiter = AdaptiveConcurrencyLimiter(
+                initial_limit=initial_concurrency, max_limit=max_concurrency
+            )
+
+        # urllib3 chỉ thử lại các lỗi kết nối, còn các status code lỗi do client xử lý
+        retry = Retry(
+            total=max_retries,
+            status=0,
+            backoff_factor=backoff_factor,
+            allowed_methods=('GET', ),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=retry)
+
+        self._session = requests.Session()
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return self._timeout
+
+    @property
+    def max_retries(self) -> int:
+        return self._max_retries
+
+    @property
+    def rate_limiter(self) -> TokenBucket|None:
+        return self._rate_limiter
+
+    @property
+    def concurrency_limiter(self) -> AdaptiveConcurrencyLimiter|None:
+        return self._concurrency_limiter
+
+    def is_retry_status(self, status: int) -> bool:
+        """
+        Kiểm tra một status code có cần thử lại hay không.
+
+        Args:
+            status (int): Status code của response
+
+        Returns:
+            bool: True nếu cần thử lại
+        """
+        return status in self._retry_statuses
+
+    def retry_delay(self, attempt: int, retry_after: str|None = None) -> float:
+        """
+        Tính thời gian chờ trước lần thử lại tiếp theo. Ưu tiên header `Retry-After`.
+
+        Args:
+            attempt (int): Số thứ tự của lần thử vừa thất bại (bắt đầu từ 0)
+            retry_after (str | None, optional): Giá trị header `Retry-After` (giây). Defaults to None.
+
+        Returns:
+            float: Thời gian chờ (giây)
+        """
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        return self._backoff_factor * (2 ** attempt)
+
+    def get_json(self, url: str, params: dict|None = None) -> dict|list:
+        """
+        Gửi một GET request và trả về response dạng JSON.
+
+        Args:
+            url (str): URL cần lấy dữ liệu
+            params (dict | None, optional): Các tham số của request. Defaults to None.
+
+        Raises:
+            requests.HTTPError: Nếu response có status code lỗi (sau khi đã thử lại).
+
+        Returns:
+            dict | list: Response dạng JSON
+        """
+        for attempt in range(self._max_retries + 1):
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            if self._concurrency_limiter is not None:
+                self._concurrency_limiter.acquire()
+            healthy = False
+            try:
+                response = self._session.get(url, params=params, timeout=self._timeout)
+                healthy = not self.is_retry_status(response.status_code)
+            finally:
+                if self._concurrency_limiter is not None:
+                    self._concurrency_limiter.release(healthy)
+            
+            if healthy or attempt == self._max_retries:
+                break
+            delay = self.retry_delay(attempt, response.headers.get('Retry-After'))
+            logging.warning(f'{url} responded {response.status_code}, retrying in {delay:.2f}s...')
+            time.sleep(delay)
+            
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        """
+        Đóng client và tất cả các kết nối đang được giữ lại.
+        """
+        self._session.close()
+
+    def __enter__(self) -> 'HTTPClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+def pool_size_for(concurrency: int, http_config: dict|None = None) -> int:
+    """
+    Tính số kết nối cần giữ lại cho mỗi host khi có tối đa `concurrency` request đồng thời.
+    Nếu pool nhỏ hơn số request đồng thời, urllib3 sẽ bỏ đi các kết nối keep-alive dư khi
+    pool đầy. Kết quả không nhỏ hơn `pool_size` và không vượt quá `max_concurrency` (nếu có,
+    vì các request vượt quá phải chờ) trong cấu hình.
+
+    Args:
+        concurrency (int): Số request đồng thời tối đa
+        http_config (dict | None, optional): Cấu hình của HTTP client, None để lấy từ
+            cấu hình của ứng dụng. Defaults to None.
+
+    Returns:
+        int: Số kết nối của pool
+    """
+    if http_config is None:
+        http_config = get_http_config()
+    if http_config['max_concurrency']:
+        concurrency = min(concurrency, http_config['max_concurrency'])
+    return max(concurrency, http_config['pool_size'])
+
+_client: HTTPClient|None = None
+_client_lock = threading.Lock()
+
+def get_client() -> HTTPClient:
+    """
+    Lấy HTTP client dùng chung của tiến trình, nếu chưa có thì tạo mới
+    theo mục `HTTP` trong cấu hình của ứng dụng.
+
+    Returns:
+        HTTPClient: HTTP client dùng chung
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient(**get_http_config())
+        return _client
+
+def set_client(client: HTTPClient|None) -> HTTPClient|None:
+    """
+    Thay thế HTTP client dùng chung của tiến trình. Client cũ không bị đóng.
+
+    Args:
+        client (HTTPClient | None): Client mới, nếu là None thì client mặc định
+            sẽ được tạo lại ở lần gọi `get_client` tiếp theo.
+
+    Returns:
+        HTTPClient | None: Client dùng chung trước đó
+    """
+    global _client
+    with _client_lock:
+        old_client = _client
+        _client = client
+        return old_client
+
+def close_client() -> None:
+    """
+    Đóng và gỡ bỏ HTTP client dùng chung của tiến trình (nếu có).
+    """
+    old_client = set_client(None)
+    if old_client is not None:
+        old_client.close()
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""
+Module `interning` cung cấp lớp cơ sở cho các model có các đối tượng dùng chung
+(flyweight): mỗi giá trị chỉ có một đối tượng bất biến trong tiến trình, được lấy
+lại theo khóa thay vì tạo mới.
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import threading
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar('T', bound='Interned')
+
+class Interned:
+    """
+    Lớp cơ sở của các model có đối tượng dùng chung. Mỗi lớp con có bảng các đối tượng
+    dùng chung riêng, các đối tượng được tạo qua `_intern` và bị khóa (frozen), các setter
+    của lớp con phải gọi `_check_mutable` trước khi thay đổi dữ liệu.
+    Có thể dùng chung giữa nhiều thread.
+    """
+
+    __slots__ = ('_frozen', )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._interned = {}
+        cls._intern_lock = threading.Lock()
+
+    @classmethod
+    def _intern(cls: type[T], key: Hashable, factory: Callable[[], T]) -> T:
+        """
+        Lấy đối tượng dùng chung theo khóa, tạo mới bằng `factory` (rồi khóa lại) nếu chưa có.
+
+        Args:
+            key (Hashable): Khóa của đối tượng
+            factory (Callable[[], T]): Hàm tạo đối tượng
+
+        Returns:
+            T: Đối tượng dùng chung
+        """
+        obj = cls._interned.get(key)
+        if obj is None:
+            with cls._intern_lock:
+                obj = cls._interned.get(key)
+                if obj is None:
+                    obj = factory()
+                    obj._frozen = True
+                    cls._interned[key] = obj
+        return obj
+
+    @property
+    def frozen(self) -> bool:
+        """
+        Đối tượng có phải là đối tượng dùng chung (không thể thay đổi) hay không.
+        """
+        return self._frozen
+
+    def _check_mutable(self) -> None:
+        """
+        Kiểm tra đối tượng có thể thay đổi được hay không.
+
+        Raises:
+            AttributeError: Nếu là đối tượng dùng chung.
+        """
+        if self._frozen:
+            raise AttributeError(f"Interned {type(self).__name__} is immutable!")
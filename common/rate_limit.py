@@ -0,0 +1,224 @@
+"""
+Module `rate_limit` cung cấp các bộ giới hạn request phía client:
+`TokenBucket` giới hạn số request theo hạn mức (quota) mỗi phút và
+`AdaptiveConcurrencyLimiter` tự điều chỉnh số request đồng thời theo
+tình trạng của server (giảm khi gặp 429/5xx, tăng dần khi ổn định).
+
+Cả hai đều có thể dùng chung giữa nhiều thread, và có thêm các phương thức
+`async_acquire` để dùng trong event loop của asyncio.
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import time
+import asyncio
+import threading
+from collections import deque
+
+class TokenBucket:
+    """
+    Bộ giới hạn theo thuật toán token bucket. Token được nạp lại đều đặn với
+    tốc độ `rate_per_minute` token mỗi phút, tối đa `capacity` token. Mỗi
+    request cần 1 token.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int|None = None):
+        """
+        Khởi tạo một token bucket, ban đầu bucket đầy token.
+
+        Args:
+            rate_per_minute (float): Số request tối đa mỗi phút (quota).
+            capacity (int | None, optional): Số token tối đa có thể tích lũy, tức
+                số request có thể gửi dồn một lúc. Nếu là None thì bằng lượng token
+                nạp trong 10 giây. Defaults to None.
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("Rate is positive!")
+        self._rate = rate_per_minute / 60.0
+        self._capacity = capacity if capacity is not None else max(1, int(rate_per_minute / 6))
+        self._tokens = float(self._capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate_per_minute(self) -> float:
+        return self._rate * 60.0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def reserve(self) -> float:
+        """
+        Đặt trước 1 token. Nếu bucket còn token thì dùng ngay, ngược lại số token
+        sẽ bị âm và người gọi phải chờ tới khi token đó được nạp lại.
+
+        Returns:
+            float: Thời gian (giây) cần chờ trước khi được gửi request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+            self._last_refill = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self) -> None:
+        """
+        Chờ (chặn thread hiện tại) tới khi lấy được 1 token.
+        """
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def async_acquire(self) -> None:
+        """
+        Chờ (không chặn event loop) tới khi lấy được 1 token.
+        """
+        wait_time = self.reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Giới hạn số request đồng thời theo cơ chế AIMD (additive increase,
+    multiplicative decrease): mỗi khi có đủ `limit` response tốt liên tiếp
+    thì giới hạn tăng thêm 1, còn khi gặp response xấu (429/5xx, lỗi mạng)
+    thì giới hạn giảm một nửa.
+
+    Các thread chờ trên một `threading.Condition`, còn các coroutine chờ trên một
+    future của event loop của chúng và được đánh thức (qua `call_soon_threadsafe`)
+    mỗi khi có chỗ được trả lại, nên một bộ giới hạn có thể dùng chung giữa các
+    thread và các event loop khác nhau.
+    """
+
+    def __init__(self, initial_limit: int|None = None, min_limit: int = 1, max_limit: int = 32,
+                 decrease_cooldown: float = 1.0):
+        """
+        Khởi tạo bộ giới hạn.
+
+        Args:
+            initial_limit (int | None, optional): Giới hạn ban đầu. Nếu là None thì bắt đầu
+                từ `max_limit`, tức là chỉ giảm khi gặp response xấu. Defaults to None.
+            min_limit (int, optional): Giới hạn nhỏ nhất. Defaults to 1.
+            max_limit (int, optional): Giới hạn lớn nhất. Defaults to 32.
+            decrease_cooldown (float, optional): Khoảng thời gian (giây) tối thiểu giữa
+                2 lần giảm giới hạn, để một loạt response xấu cùng lúc chỉ làm giảm
+                giới hạn một lần. Defaults to 1.0.
+        """
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError("Required 1 <= min_limit <= max_limit!")
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        if initial_limit is None:
+            initial_limit = max_limit
+        self._limit = min(max(initial_limit, min_limit), max_limit)
+        self._decrease_cooldown = decrease_cooldown
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+        # Các coroutine đang chờ: (event loop, future được đánh thức khi có chỗ)
+        self._async_waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """
+        Thử lấy 1 chỗ để gửi request mà không chờ.
+
+        Returns:
+            bool: True nếu lấy được, False nếu đã đạt giới hạn
+        """
+        with self._condition:
+            if self._in_flight < self._limit:
+                self._in_flight += 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        """
+        Chờ (chặn thread hiện tại) tới khi lấy được 1 chỗ để gửi request.
+        """
+        with self._condition:
+            while self._in_flight >= self._limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    async def async_acquire(self) -> None:
+        """
+        Chờ (không chặn event loop) tới khi lấy được 1 chỗ để gửi request.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._in_flight < self._limit:
+                    self._in_flight += 1
+                    return
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1]
+            except BaseException:
+                with self._condition:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+                    else:
+                        # Đã được đánh thức nhưng không dùng chỗ, nhường cho coroutine khác
+                        self._notify_async_waiters()
+                raise
+
+    @staticmethod
+    def _wake(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    def _notify_async_waiters(self) -> None:
+        """
+        Đánh thức các coroutine đang chờ, tối đa bằng số chỗ còn trống. Chỉ được gọi
+        khi đang giữ `self._condition`.
+        """
+        free = self._limit - self._in_flight
+        while free > 0 and self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(self._wake, future)
+            except RuntimeError:
+                # Event loop của coroutine đã bị đóng
+                continue
+            free -= 1
+
+    def release(self, healthy: bool = True) -> None:
+        """
+        Trả lại chỗ sau khi request hoàn thành và điều chỉnh giới hạn.
+
+        Args:
+            healthy (bool, optional): Response có tốt hay không (False với 429/5xx
+                hoặc lỗi mạng). Defaults to True.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if healthy:
+                self._successes += 1
+                if self._successes >= self._limit and self._limit < self._max_limit:
+                    self._limit += 1
+                    self._successes = 0
+            else:
+                self._successes = 0
+                now = time.monotonic()
+                if now - self._last_decrease >= self._decrease_cooldown:
+                    self._limit = max(self._min_limit, self._limit // 2)
+                    self._last_decrease = now
+            self._condition.notify_all()
+            self._notify_async_waiters()
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Module `response_cache` cung cấp các bộ nhớ đệm (cache) cho response của
+các API Open Weather Map. Mỗi response được lưu theo khóa (endpoint, lat, lon),
+có thời gian sống (TTL) và bị loại bỏ theo cơ chế LRU khi cache đầy.
+
+Có 2 loại cache: `MemoryResponseCache` lưu trong bộ nhớ của tiến trình và
+`DiskResponseCache` lưu trong một file SQLite (dùng lại được giữa các lần chạy).
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+class BasicResponseCache(ABC):
+    """
+    Cung cấp các phương thức chung của một response cache, bao gồm cả việc
+    đếm số lần hit/miss. Các class phải thực thi các phương thức trừu tượng.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024):
+        """
+        Khởi tạo một response cache.
+
+        Args:
+            ttl (float, optional): Thời gian sống (giây) của mỗi response. Mặc định là
+                10 phút, bằng chu kỳ cập nhật dữ liệu của Open Weather Map. Defaults to 600.0.
+            max_entries (int, optional): Số response tối đa được lưu. Defaults to 1024.
+        """
+        if ttl <= 0 or max_entries < 1:
+            raise ValueError("TTL and max entries are positive!")
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+
+    @staticmethod
+    def make_key(endpoint: str, lat: float, lon: float) -> str:
+        """
+        Tạo khóa của một response, tọa độ được làm tròn tới 4 chữ số thập phân.
+
+        Args:
+            endpoint (str): Tên của endpoint (ví dụ `'weather'`, `'air_pollution'`)
+            lat (float): Vĩ độ
+            lon (float): Kinh độ
+
+        Returns:
+            str: Khóa của response
+        """
+        return f'{endpoint}:{float(lat):.4f}:{float(lon):.4f}'
+
+    def get(self, endpoint: str, lat: float, lon: float) -> dict|list|None:
+        """
+        Lấy response đã được lưu (nếu còn hạn) và cập nhật bộ đếm hit/miss.
+
+        Args:
+            endpoint (str): Tên của endpoint
+            lat (float): Vĩ độ
+            lon (float): Kinh độ
+
+        Returns:
+            dict | list | None: Response đã lưu, None nếu không có hoặc đã hết hạn
+        """
+        value = self._get(self.make_key(endpoint, lat, lon), time.time())
+        with self._stats_lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def set(self, endpoint: str, lat: float, lon: float, value: dict|list) -> None:
+        """
+        Lưu một response vào cache.
+
+        Args:
+            endpoint (str): Tên của endpoint
+            lat (float): Vĩ độ
+            lon (float): Kinh độ
+            value (dict | list): Response cần lưu
+        """
+        self._set(self.make_key(endpoint, lat, lon), value, time.time() + self._ttl)
+
+    def stats(self) -> tuple[int, int]:
+        """
+        Lấy số lần hit và miss kể từ khi khởi tạo (hoặc lần reset gần nhất).
+
+        Returns:
+            tuple[int, int]: (hits, misses)
+        """
+        with self._stats_lock:
+            return self._hits, self._misses
+
+    def reset_stats(self) -> None:
+        """
+        Đặt lại bộ đếm hit/miss.
+        """
+        with self._stats_lock:
+            self._hits = 0
+            self._misses = 0
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> dict|list|None:
+        """
+        Lấy response theo khóa, trả về None nếu không có hoặc đã hết hạn.
+
+        Args:
+            key (str): Khóa của response
+            now (float): Thời điểm hiện tại (epoch)
+
+        Returns:
+            dict | list | None: Response đã lưu
+        """
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, value: dict|list, expire_at: float) -> None:
+        """
+        Lưu response theo khóa, loại bỏ các response ít được dùng nhất nếu cache đầy.
+
+        Args:
+            key (str): Khóa của response
+            value (dict | list): Response cần lưu
+            expire_at (float): Thời điểm hết hạn (epoch)
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Xóa tất cả các response đã lưu.
+        """
+        pass
+
+class MemoryResponseCache(BasicResponseCache):
+    """
+    Response cache lưu trong bộ nhớ của tiến trình.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024):
+        """
+        Khởi tạo một response cache trong bộ nhớ.
+
+        Args:
+            ttl (float, optional): Thời gian sống (giây) của mỗi response. Defaults to 600.0.
+            max_entries (int, optional): Số response tối đa được lưu. Defaults to 1024.
+        """
+        super().__init__(ttl, max_entries)
+        self._entries: OrderedDict[str, tuple[float, dict|list]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str, now: float) -> dict|list|None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _set(self, key: str, value: dict|list, expire_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expire_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class DiskResponseCache(BasicResponseCache):
+    """
+    Response cache lưu trên đĩa trong một file SQLite, có thể dùng lại giữa
+    các lần chạy của tiến trình.
+    """
+
+    def __init__(self, path: str, ttl: float = 600.0, max_entries: int = 1024):
+        """
+        Khởi tạo một response cache trên đĩa.
+
+        Args:
+            path (str): Đường dẫn tới file SQLite (sẽ được tạo nếu chưa có)
+            ttl (float, optional): Thời gian sống (giây) của mỗi response. Defaults to 600.0.
+            max_entries (int, optional): Số response tối đa được lưu. Defaults to 1024.
+        """
+        super().__init__(ttl, max_entries)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS response_cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'expire_at REAL NOT NULL, last_access REAL NOT NULL)'
+            )
+
+    def _get(self, key: str, now: float) -> dict|list|None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                'SELECT value, expire_at FROM response_cache WHERE key = ?', (key, )
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._connection.execute('DELETE FROM response_cache WHERE key = ?', (key, ))
+                return None
+            self._connection.execute(
+                'UPDATE response_cache SET last_access = ? WHERE key = ?', (now, key)
+            )
+            return json.loads(row[0])
+
+    def _set(self, key: str, value: dict|list, expire_at: float) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO response_cache(key, value, expire_at, last_access) '
+                'VALUES (?, ?, ?, ?)', (key, json.dumps(value), expire_at, time.time())
+            )
+            self._connection.execute(
+                'DELETE FROM response_cache WHERE key IN ('
+                'SELECT key FROM response_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+                (self._max_entries, )
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM response_cache')
+
+    def close(self) -> None:
+        """
+        Đóng file SQLite của cache.
+        """
+        self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM response_cache').fetchone()[0]
\ No newline at end of file
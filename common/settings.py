@@ -0,0 +1,232 @@
+"""
+Module `settings` cung cấp cấu hình của ứng dụng được đọc từ file `config.json`
+(được ẩn đi để bảo mật). Cấu hình chỉ được đọc và parse một lần rồi lưu lại
+trong bộ nhớ, và chỉ được đọc lại khi file bị thay đổi (dựa vào mtime của file).
+
+File `config.json` có dạng sau (các trường không có sẽ lấy giá trị mặc định):
+```json
+{
+    "OPEN_WEATHER_MAP_API_KEY": "...",
+    "MYSQL": {"host": "localhost", "db": "weather_vietnam", "user": "root", "password": "..."},
+    "MYSQL_POOL": {"size": 5, "checkout_timeout": 10.0, "validate_idle": 30.0},
+    "MONGODB": {"host": "localhost", "port": 27017, "db": "weather_vietnam", "user": null, "password": null},
+    "MONGODB_POOL": {"max_pool_size": 100, "min_pool_size": 0, "max_idle_time_ms": null,
+                     "wait_queue_timeout_ms": null},
+    "HTTP": {"pool_size": 24, "connect_timeout": 3.05, "read_timeout": 10.0, "max_retries": 3,
+             "calls_per_minute": null, "max_concurrency": null}
+}
+```
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import os
+init_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+import copy
+import json
+import threading
+
+CONFIG_FILE = os.path.join(init_dir, 'config.json')
+
+DEFAULT_SETTINGS = {
+    'OPEN_WEATHER_MAP_API_KEY': None,
+    'MYSQL': {
+        'host': 'localhost',
+        'db': 'weather_vietnam',
+        'user': 'root',
+        'password': ''
+    },
+    'MYSQL_POOL': {
+        'size': 5,
+        'checkout_timeout': 10.0,
+        'validate_idle': 30.0
+    },
+    'MONGODB': {
+        'host': 'localhost',
+        'port': 27017,
+        'db': 'weather_vietnam',
+        'user': None,
+        'password': None
+    },
+    'MONGODB_POOL': {
+        'max_pool_size': 100,
+        'min_pool_size': 0,
+        'max_idle_time_ms': None,
+        'wait_queue_timeout_ms': None
+    },
+    'HTTP': {
+        'pool_size': 24,
+        'connect_timeout': 3.05,
+        'read_timeout': 10.0,
+        'max_retries': 3,
+        'calls_per_minute': None,
+        'max_concurrency': None
+    }
+}
+
+class SettingsManager:
+    """
+    Quản lý việc đọc và lưu lại cấu hình từ một file JSON. Cấu hình được
+    đọc lại chỉ khi mtime của file thay đổi. Có thể dùng chung giữa nhiều thread.
+    """
+
+    def __init__(self, config_file: str = CONFIG_FILE):
+        """
+        Khởi tạo một SettingsManager.
+
+        Args:
+            config_file (str, optional): Đường dẫn tới file cấu hình. Defaults to CONFIG_FILE.
+        """
+        self._config_file = config_file
+        self._lock = threading.Lock()
+        self._mtime: float|None = None
+        self._settings: dict = copy.deepcopy(DEFAULT_SETTINGS)
+
+    @property
+    def config_file(self) -> str:
+        return self._config_file
+
+    def get(self) -> dict:
+        """
+        Lấy cấu hình hiện tại, sẽ đọc lại file nếu file đã bị thay đổi
+        kể từ lần đọc trước. Dict trả về không được sửa đổi.
+
+        Returns:
+            dict: Cấu hình đã được gộp với các giá trị mặc định
+        """
+        try:
+            mtime = os.stat(self._config_file).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return self._settings
+
+        with self._lock:
+            if mtime != self._mtime:
+                self._settings = self._load(mtime)
+                self._mtime = mtime
+            return self._settings
+
+    def reload(self) -> dict:
+        """
+        Buộc đọc lại file cấu hình.
+
+        Returns:
+            dict: Cấu hình mới
+        """
+        with self._lock:
+            self._mtime = None
+        return self.get()
+
+    def _load(self, mtime: float|None) -> dict:
+        """
+        Đọc file cấu hình và gộp với các giá trị mặc định.
+
+        Args:
+            mtime (float | None): mtime của file, None nếu file không tồn tại
+
+        Returns:
+            dict: Cấu hình thu được
+        """
+        settings = copy.deepcopy(DEFAULT_SETTINGS)
+        if mtime is None:
+            return settings
+        with open(self._config_file, 'r') as config_file:
+            file_settings = json.load(config_file)
+        for key, value in file_settings.items():
+            if isinstance(value, dict) and isinstance(settings.get(key), dict):
+                settings[key].update(value)
+            else:
+                settings[key] = value
+        return settings
+
+_manager = SettingsManager()
+
+def set_config_file(config_file: str) -> None:
+    """
+    Đổi file cấu hình của tiến trình, cấu hình sẽ được đọc lại ở lần lấy tiếp theo.
+
+    Args:
+        config_file (str): Đường dẫn tới file cấu hình mới
+    """
+    global _manager
+    _manager = SettingsManager(config_file)
+
+def get_settings() -> dict:
+    """
+    Lấy toàn bộ cấu hình hiện tại của tiến trình.
+
+    Returns:
+        dict: Cấu hình hiện tại
+    """
+    return _manager.get()
+
+def get_api_key() -> str:
+    """
+    Lấy API Key của Open Weather Map.
+
+    Raises:
+        KeyError: Nếu cấu hình không có API Key.
+
+    Returns:
+        str: API Key
+    """
+    api_key = get_settings()['OPEN_WEATHER_MAP_API_KEY']
+    if api_key is None:
+        raise KeyError(f"OPEN_WEATHER_MAP_API_KEY is missing in {_manager.config_file}!")
+    return api_key
+
+def get_mysql_config() -> dict:
+    """
+    Lấy các tham số kết nối tới MySQL, có thể truyền trực tiếp vào các MySQL DAO.
+
+    Returns:
+        dict: Một dict có các key `host`, `db`, `user`, `password`
+    """
+    return dict(get_settings()['MYSQL'])
+
+def get_mysql_pool_config() -> dict:
+    """
+    Lấy các tham số của các pool kết nối MySQL dùng chung.
+
+    Returns:
+        dict: Một dict có các key `size` (số kết nối tối đa), `checkout_timeout`
+            (số giây tối đa chờ mượn kết nối), `validate_idle` (kết nối rảnh lâu hơn
+            số giây này sẽ được kiểm tra trước khi cho mượn)
+    """
+    return dict(get_settings()['MYSQL_POOL'])
+
+def get_mongodb_config() -> dict:
+    """
+    Lấy các tham số kết nối tới MongoDB, có thể truyền trực tiếp vào các MongoDB DAO.
+
+    Returns:
+        dict: Một dict có các key `host`, `port`, `db`, `user`, `password`
+    """
+    return dict(get_settings()['MONGODB'])
+
+def get_mongodb_pool_config() -> dict:
+    """
+    Lấy các tham số pool kết nối của các MongoClient dùng chung.
+
+    Returns:
+        dict: Một dict có các key `max_pool_size`, `min_pool_size`, `max_idle_time_ms`,
+            `wait_queue_timeout_ms` (None là dùng giá trị mặc định của pymongo)
+    """
+    return dict(get_settings()['MONGODB_POOL'])
+
+def get_http_config() -> dict:
+    """
+    Lấy các tham số của HTTP client dùng chung.
+
+    Returns:
+        dict: Một dict có các key `pool_size` (số kết nối tối thiểu, mặc định đủ cho 8 thread extract
+            cùng 16 thread của `weather.business`), `connect_timeout`, `read_timeout`, `max_retries`,
+            `calls_per_minute` (quota của Open Weather Map, None là không giới hạn), `max_concurrency`
+            (số request đồng thời tối đa của bộ giới hạn tự điều chỉnh, None là không dùng bộ giới hạn)
+    """
+    return dict(get_settings()['HTTP'])
\ No newline at end of file
@@ -1,31 +1,32 @@
 --GET BY ID
-SELECT * 
+SELECT city_id, name, lon, lat, time_zone, owm_id, country_code
 FROM city
 WHERE city_id = %s;
 
 --GET BY NAME
-SELECT * 
+SELECT city_id, name, lon, lat, time_zone, owm_id, country_code
 FROM city
 WHERE name = %s;
 
 --GET ALL BY COUNTRY
-SELECT *
+SELECT city_id, name, lon, lat, time_zone, owm_id, country_code
 FROM city
 WHERE country_code = %s;
 
 --INSERT WITH UPDATE
-INSERT INTO city(city_id, name, lon, lat, time_zone, country_code)
-VALUES (%s, %s, %s, %s, %s, %s)
+INSERT INTO city(city_id, name, lon, lat, time_zone, owm_id, country_code)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
 ON DUPLICATE KEY UPDATE
 name = VALUES(name),
 lon = VALUES(lon),
 lat = VALUES(lat),
 time_zone = VALUES(time_zone),
+owm_id = VALUES(owm_id),
 country_code = VALUES(country_code);
 
 --UPDATE
 UPDATE city SET name = %s, lon = %s, lat = %s,
-time_zone = %s, country_code = %s
+time_zone = %s, owm_id = %s, country_code = %s
 WHERE city_id = %s;
 
 --DELETE
@@ -39,11 +39,18 @@ class GeneralWeatherEnableQueries(Enum):
 class WeatherStatusEnableQueries(Enum):
     GET_BY_CITY_AND_TIME = 'GET BY CITY AND TIME'
     GET_ALL_BY_CITY = 'GET ALL BY CITY'
+    GET_BY_CITY_AND_TIME_WITH_CONDITIONS = 'GET BY CITY AND TIME WITH CONDITIONS'
+    GET_ALL_BY_CITY_WITH_CONDITIONS = 'GET ALL BY CITY WITH CONDITIONS'
+    GET_LATEST_COLLECT_TIMES = 'GET LATEST COLLECT TIMES'
     INSERT = 'INSERT'
     DELETE = 'DELETE'
     DELETE_ALL_BY_CITY = 'DELETE ALL BY CITY'
     
 class WeatherConditionEnableQueries(Enum):
     GET_ALL_BY_CITY_AND_TIME = 'GET ALL BY CITY AND TIME'
+    COUNT_BY_CITY_AND_TIME = 'COUNT BY CITY AND TIME'
     INSERT = 'INSERT'
-    DELETE = 'DELETE'
\ No newline at end of file
+    INSERT_BY_STATUSES = 'INSERT BY STATUSES'
+    DELETE = 'DELETE'
+    DELETE_ALL_BY_KEYS = 'DELETE ALL BY KEYS'
+    DELETE_STALE = 'DELETE STALE'
\ No newline at end of file
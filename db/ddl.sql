@@ -18,6 +18,7 @@ CREATE TABLE `city` (
   `lon` decimal(10, 7) DEFAULT NULL,
   `lat` decimal(10, 7) DEFAULT NULL,
   `time_zone` int DEFAULT NULL,
+  `owm_id` int DEFAULT NULL,
   `country_code` varchar(10) NOT NULL,
   PRIMARY KEY (`city_id`),
   KEY `country_of_city_idx` (`country_code`),
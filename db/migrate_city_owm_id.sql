@@ -0,0 +1,8 @@
+--Migration for databases created before the owm_id column was added to city.
+--Run once: new databases created from ddl.sql already have this column.
+
+--Use this schema
+USE whether_vietnam;
+
+--Add Open Weather Map city id (used by the group API), filled in by the ETL
+ALTER TABLE `city` ADD COLUMN `owm_id` int DEFAULT NULL AFTER `time_zone`;
@@ -3,13 +3,19 @@ Module `sql_reader` cung cấp đối tượng để có thể đọc và xử l
 để lấy được các câu lệnh có thể thực hiện.
 
 Module giúp kiểm soát các thao tác có thể gây ảnh hưởng tới CSDL một cách rõ ràng.
+Các file chỉ được đọc và parse một lần mỗi tiến trình qua `QueryRegistry`
+(đọc lại khi file thay đổi).
 
 Author: 
     Lê Minh Triết
 Last Modified Date: 
-    23/01/2025
+    18/10/2026
 """
 
+import os
+import threading
+from enum import Enum
+
 class NotSupportedQueryException(Exception):
     """
     Ngoại lệ được ném ra khi truy vấn không được hỗ trợ.
@@ -90,12 +96,12 @@ class SQLFileReader:
         """
         return list(self._stmts.keys())
 
-    def get_query_of(self, query_type: str) -> str:
+    def get_query_of(self, query_type: str|Enum) -> str:
         """
         Lấy câu lệnh SQL của loại truy vấn cụ thể.
 
         Args:
-            query_type (str): Loại truy vấn.
+            query_type (str | Enum): Loại truy vấn, hoặc một hằng trong `db.config`.
 
         Returns:
             str: Câu lệnh SQL tương ứng với loại truy vấn.
@@ -103,12 +109,137 @@ class SQLFileReader:
         Raises:
             NotSupportedQueryException: Nếu loại truy vấn không được hỗ trợ.
         """
-        if query_type not in self.get_enable_queries():
+        if isinstance(query_type, Enum):
+            query_type = query_type.value
+        stmt = self._stmts.get(query_type)
+        if stmt is None:
             raise NotSupportedQueryException()
-        return self._stmts[query_type]
+        return stmt
 
     def clear(self) -> None:
         """
         Xóa tất cả các câu lệnh SQL đã lưu trữ.
         """
-        self._stmts.clear()
\ No newline at end of file
+        self._stmts.clear()
+
+class QueryRegistry:
+    """
+    Lưu các file SQL đã được đọc và parse theo đường dẫn và mtime của file, để mỗi file
+    chỉ được đọc một lần mỗi tiến trình. Registry cũng đếm số lần prepare và execute
+    các prepared statement (xem `common.dao.BasicMySQLDAO.checkout_`).
+    Có thể dùng chung giữa nhiều thread.
+    """
+
+    def __init__(self):
+        """
+        Khởi tạo một registry rỗng.
+        """
+        self._readers: dict[str, tuple[float, SQLFileReader]] = {}
+        self._lock = threading.Lock()
+        self._prepares = 0
+        self._executes = 0
+
+    @staticmethod
+    def normalize_path(sql_file_path: str) -> str:
+        """
+        Chuẩn hóa đường dẫn tới file SQL (chấp nhận cả dấu phân cách `\\` như trong `db.config`).
+
+        Args:
+            sql_file_path (str): Đường dẫn tới file SQL
+
+        Returns:
+            str: Đường dẫn tuyệt đối đã chuẩn hóa
+        """
+        return os.path.abspath(os.path.normpath(sql_file_path.replace('\\', '/')))
+
+    def get_reader(self, sql_file_path: str) -> SQLFileReader:
+        """
+        Lấy SQLFileReader của một file, chỉ đọc lại file khi mtime của file thay đổi.
+        Reader trả về được dùng chung nên không được sửa đổi.
+
+        Args:
+            sql_file_path (str): Đường dẫn tới file SQL
+
+        Raises:
+            Exception: Nếu xảy ra lỗi khi đọc file.
+
+        Returns:
+            SQLFileReader: Reader chứa các câu lệnh của file
+        """
+        path = self.normalize_path(sql_file_path)
+        mtime = os.stat(path).st_mtime
+        entry = self._readers.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        with self._lock:
+            entry = self._readers.get(path)
+            if entry is None or entry[0] != mtime:
+                reader = SQLFileReader()
+                reader.read(sql_file_path=path)
+                entry = (mtime, reader)
+                self._readers[path] = entry
+            return entry[1]
+
+    def get_query(self, sql_file_path: str, query_type: str|Enum) -> str:
+        """
+        Lấy câu lệnh SQL của một loại truy vấn trong một file.
+
+        Args:
+            sql_file_path (str): Đường dẫn tới file SQL
+            query_type (str | Enum): Loại truy vấn, hoặc một hằng trong `db.config`
+
+        Returns:
+            str: Câu lệnh SQL tương ứng
+        """
+        return self.get_reader(sql_file_path).get_query_of(query_type)
+
+    def count_prepare(self) -> None:
+        """
+        Tăng bộ đếm số lần prepare một statement trên server.
+        """
+        with self._lock:
+            self._prepares += 1
+
+    def count_execute(self) -> None:
+        """
+        Tăng bộ đếm số lần execute một prepared statement.
+        """
+        with self._lock:
+            self._executes += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Lấy các bộ đếm của registry.
+
+        Returns:
+            dict[str, int]: Một dict có các key `files` (số file đã parse),
+                `prepares`, `executes`
+        """
+        with self._lock:
+            return {'files': len(self._readers), 'prepares': self._prepares, 'executes': self._executes}
+
+    def reset_stats(self) -> None:
+        """
+        Đặt lại các bộ đếm prepare/execute.
+        """
+        with self._lock:
+            self._prepares = 0
+            self._executes = 0
+
+    def clear(self) -> None:
+        """
+        Xóa các file đã lưu, các file sẽ được đọc lại ở lần lấy tiếp theo.
+        """
+        with self._lock:
+            self._readers.clear()
+
+_registry = QueryRegistry()
+
+def get_query_registry() -> QueryRegistry:
+    """
+    Lấy query registry dùng chung của tiến trình.
+
+    Returns:
+        QueryRegistry: Registry dùng chung
+    """
+    return _registry
@@ -3,10 +3,31 @@ SELECT *
 FROM weather_condition
 WHERE city_id = %s AND collect_time = %s;
 
+--COUNT BY CITY AND TIME
+SELECT COUNT(*)
+FROM weather_condition
+WHERE city_id = %s AND collect_time = %s;
+
 --INSERT 
 INSERT INTO weather_condition(city_id, collect_time, general_weather_status)
 VALUES(%s, %s, %s);
 
 --DELETE
 DELETE FROM weather_condition
-WHERE city_id = %s AND collect_time = %s;
\ No newline at end of file
+WHERE city_id = %s AND collect_time = %s;
+
+--DELETE ALL BY KEYS
+DELETE FROM weather_condition
+WHERE (city_id, collect_time) IN ({keys});
+
+--INSERT BY STATUSES
+INSERT INTO weather_condition(city_id, collect_time, general_weather_status)
+SELECT %s, %s, status_id
+FROM general_weather
+WHERE FIND_IN_SET(status_id, %s)
+ON DUPLICATE KEY UPDATE
+general_weather_status = general_weather.status_id;
+
+--DELETE STALE
+DELETE FROM weather_condition
+WHERE city_id = %s AND collect_time = %s AND NOT FIND_IN_SET(general_weather_status, %s);
\ No newline at end of file
@@ -8,6 +8,31 @@ SELECT *
 FROM weather_status
 WHERE city_id = %s;
 
+--GET BY CITY AND TIME WITH CONDITIONS
+SELECT ws.city_id, ws.collect_time, ws.temp, ws.feels_temp, ws.pressure, ws.humidity,
+ws.sea_level, ws.grnd_level, ws.visibility, ws.wind_speed, ws.wind_deg, ws.wind_gust, ws.clouds_all,
+ws.rain, ws.sunrise, ws.sunset, ws.aqi, ws.pm2_5, gw.status_id, gw.description
+FROM weather_status ws
+LEFT JOIN weather_condition wc ON wc.city_id = ws.city_id AND wc.collect_time = ws.collect_time
+LEFT JOIN general_weather gw ON gw.status_id = wc.general_weather_status
+WHERE ws.city_id = %s AND ws.collect_time = %s
+ORDER BY wc.general_weather_status;
+
+--GET ALL BY CITY WITH CONDITIONS
+SELECT ws.city_id, ws.collect_time, ws.temp, ws.feels_temp, ws.pressure, ws.humidity,
+ws.sea_level, ws.grnd_level, ws.visibility, ws.wind_speed, ws.wind_deg, ws.wind_gust, ws.clouds_all,
+ws.rain, ws.sunrise, ws.sunset, ws.aqi, ws.pm2_5, gw.status_id, gw.description
+FROM weather_status ws
+LEFT JOIN weather_condition wc ON wc.city_id = ws.city_id AND wc.collect_time = ws.collect_time
+LEFT JOIN general_weather gw ON gw.status_id = wc.general_weather_status
+WHERE ws.city_id = %s
+ORDER BY ws.collect_time, wc.general_weather_status;
+
+--GET LATEST COLLECT TIMES
+SELECT city_id, MAX(collect_time)
+FROM weather_status
+GROUP BY city_id;
+
 --INSERT
 INSERT INTO weather_status (city_id, collect_time, temp, feels_temp, pressure, humidity, 
 sea_level, grnd_level, visibility, wind_speed, wind_deg, wind_gust, clouds_all,
@@ -14,16 +14,24 @@ init_dir = os.path.abspath(os.path.join(os.path.dirname(__file__)))
 import sys
 sys.path.append(init_dir)
 
-from typing import List, Literal
+from typing import Callable, Iterable, Iterator, List, Literal
 
 #Place
-from place.dao import MySQLCityDAO, MongoDBCityDAO
+from place.model import City
+from place.dao import BasicCityDAO, MySQLCityDAO, MongoDBCityDAO
 from place.business import get_city
 
 #Weather
 from weather.model import WeatherStatus
-from weather.dao import MySQLWeatherStatusDAO, MongoDBWeatherStatusDAO
-from weather.business import extract_from_open_weather, transform, load
+from weather.dao import BasicWeatherStatusDAO, MySQLWeatherStatusDAO, MongoDBWeatherStatusDAO
+from weather.business import extract_from_open_weather, extract_weather, async_extract_from_open_weather, \
+    iter_extract_group_from_open_weather, transform, load, load_many, get_response_cache, set_response_cache, \
+    LatestCollectTimeIndex, OWM_EXECUTOR_WORKERS
+
+#HTTP & Settings
+from common.http_client import HTTPClient, get_client, set_client, pool_size_for
+from common.response_cache import BasicResponseCache
+from common.settings import get_mysql_config, get_mongodb_config, get_http_config
 
 import datetime
 
@@ -35,30 +43,306 @@ logging.basicConfig(filename='etl_log.log', level=logging.INFO,
                     datefmt='%Y-%m-%d %H:%M:%S')
 
 import schedule
+import queue
+import threading
+from itertools import chain, islice
 from functools import partial
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import asyncio
+import aiohttp
 
-def weather_vietnam_etl(dbms: Literal['MySQL', 'MongoDB'] = 'MySQL'):
+def _extract_city(city: City) -> dict:
     """
-    Quy trình ETL thủ công để làm việc với dữ liệu thời tiết các thành phố Việt Nam
+    Extract dữ liệu thời tiết của một thành phố, kèm theo chính thành phố đó.
+
+    Args:
+        city (City): Thành phố cần lấy dữ liệu
+
+    Returns:
+        dict: Một dict có 2 key là `data` (response từ API) và `city`
+    """
+    return {
+        'data': extract_from_open_weather(city.lon, city.lat),
+        'city': city
+    }
+
+def _extract_city_weather(city: City, air_response: dict|None) -> dict:
+    """
+    Extract riêng dữ liệu Current Weather của một thành phố đã có dữ liệu Air Pollution
+    (ví dụ thành phố thuộc nhóm bị lỗi khi extract theo chế độ group).
+
+    Args:
+        city (City): Thành phố cần lấy dữ liệu
+        air_response (dict | None): Response Air Pollution đã lấy của thành phố
+
+    Returns:
+        dict: Một dict có 2 key là `data` (giống kết quả của `extract_from_open_weather`) và `city`
+    """
+    return {
+        'data': {
+            'weather': extract_weather(city.lon, city.lat),
+            'air': air_response
+        },
+        'city': city
+    }
+
+def _extract_all(cities: List[City], max_workers: int = 1) -> List[dict]:
+    """
+    Extract dữ liệu thời tiết của nhiều thành phố. Nếu `max_workers > 1` thì
+    các request sẽ được thực hiện đồng thời bởi một thread pool có giới hạn
+    số worker, ngược lại sẽ thực hiện tuần tự từng thành phố.
+    
+    Nếu có một thành phố bị lỗi thì vẫn extract tiếp và chỉ thông báo ERROR ra log.
+
+    Args:
+        cities (List[City]): Danh sách các thành phố cần lấy dữ liệu
+        max_workers (int, optional): Số lượng worker tối đa của thread pool. Defaults to 1.
+
+    Returns:
+        List[dict]: Danh sách các dữ liệu extract thành công, theo thứ tự của `cities`
+    """
+    json_datas: List[dict] = []
+    if max_workers <= 1:
+        for city in cities:
+            try:
+                json_datas.append(_extract_city(city))
+            except Exception as e:
+                logging.error(f'Failed to extracting data of {city.name}!!!')
+                print(e)
+        return json_datas
+    
+    # Gửi tất cả các request vào pool, sau đó lấy kết quả theo đúng thứ tự các thành phố
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='etl-extract') as executor:
+        futures = [(city, executor.submit(_extract_city, city)) for city in cities]
+        for city, future in futures:
+            try:
+                json_datas.append(future.result())
+            except Exception as e:
+                logging.error(f'Failed to extracting data of {city.name}!!!')
+                print(e)
+    return json_datas
+
+def _iter_extract(cities: List[City], max_workers: int = 1,
+                  max_pending: int|None = None,
+                  extract: Callable[[City], dict] = _extract_city) -> Iterator[dict]:
+    """
+    Extract dữ liệu thời tiết của nhiều thành phố và trả về dần từng kết quả ngay khi
+    thành phố đó được extract xong (không theo thứ tự của `cities`). Số request đang
+    chờ được giới hạn bởi `max_pending` để bộ nhớ không tăng theo số thành phố.
+    
+    Nếu có một thành phố bị lỗi thì vẫn extract tiếp và chỉ thông báo ERROR ra log.
+
+    Args:
+        cities (List[City]): Danh sách các thành phố cần lấy dữ liệu
+        max_workers (int, optional): Số lượng worker tối đa của thread pool, nếu
+            `max_workers <= 1` thì extract tuần tự. Defaults to 1.
+        max_pending (int | None, optional): Số thành phố tối đa đang được extract hoặc
+            chờ lấy kết quả. Nếu là None thì bằng `2 * max_workers`. Defaults to None.
+        extract (Callable[[City], dict], optional): Hàm extract một thành phố. Defaults to _extract_city.
+
+    Yields:
+        Iterator[dict]: Các dữ liệu extract thành công, có 2 key là `data` và `city`
+    """
+    if max_workers <= 1:
+        for city in cities:
+            try:
+                json_data = extract(city)
+            except Exception as e:
+                logging.error(f'Failed to extracting data of {city.name}!!!')
+                print(e)
+                continue
+            yield json_data
+        return
+    
+    if max_pending is None:
+        max_pending = 2 * max_workers
+    city_iter = iter(cities)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='etl-extract') as executor:
+        pending = {executor.submit(extract, city): city for city in islice(city_iter, max_pending)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                city = pending.pop(future)
+                # Mỗi thành phố xong thì gửi tiếp một thành phố mới vào pool
+                next_city = next(city_iter, None)
+                if next_city is not None:
+                    pending[executor.submit(extract, next_city)] = next_city
+                try:
+                    json_data = future.result()
+                except Exception as e:
+                    logging.error(f'Failed to extracting data of {city.name}!!!')
+                    print(e)
+                    continue
+                yield json_data
+
+def _save_owm_id(json_data: dict, city_dao: BasicCityDAO) -> None:
+    """
+    Lưu lại `owm_id` (trường id của response Current Weather) của một thành phố nếu có thay đổi.
+
+    Args:
+        json_data (dict): Dữ liệu đã extract, có 2 key là `data` và `city`
+        city_dao (BasicCityDAO): DAO của các city
+    """
+    city: City = json_data['city']
+    owm_id = json_data['data']['weather'].get('id')
+    if owm_id and owm_id != city.owm_id:
+        city.owm_id = owm_id
+        try:
+            city_dao.insert(city)
+        except Exception as e:
+            logging.error(f'Failed to saving OpenWeatherMap id of {city.name}!!!')
+            print(e)
+
+def _iter_extract_group(cities: List[City], city_dao: BasicCityDAO,
+                        max_workers: int = 1) -> Iterator[dict]:
+    """
+    Extract dữ liệu thời tiết của nhiều thành phố theo chế độ group và trả về dần từng
+    kết quả: các thành phố đã có `owm_id` được lấy dữ liệu Current Weather theo nhóm
+    (tối đa 20 thành phố mỗi request) và được trả về ngay khi nhóm của nó xong, các thành
+    phố còn lại được extract riêng như `_iter_extract`. Các thành phố thuộc nhóm bị lỗi chỉ
+    được extract lại riêng dữ liệu Current Weather, dữ liệu Air Pollution đã lấy được dùng
+    lại. Mã `owm_id` mới của các thành phố sẽ được lưu lại vào CSDL để các lần sau có thể
+    lấy theo nhóm.
+
+    Args:
+        cities (List[City]): Danh sách các thành phố cần lấy dữ liệu
+        city_dao (BasicCityDAO): DAO của các city, dùng để lưu lại `owm_id`
+        max_workers (int, optional): Số lượng worker tối đa khi extract riêng. Defaults to 1.
+
+    Yields:
+        Iterator[dict]: Các dữ liệu extract thành công, có 2 key là `data` và `city`
+    """
+    group_cities = [city for city in cities if city.owm_id is not None]
+    single_cities = [city for city in cities if city.owm_id is None]
+    
+    # Chỉ giữ lại dữ liệu Air Pollution của các thành phố thuộc nhóm bị lỗi
+    failed_airs: dict[int, dict|None] = {}
+    failed_cities: List[City] = []
+    for city, data in iter_extract_group_from_open_weather(group_cities):
+        if data['weather'] is None:
+            failed_airs[city.city_id] = data['air']
+            failed_cities.append(city)
+            continue
+        json_data = {
+            'data': data,
+            'city': city
+        }
+        _save_owm_id(json_data, city_dao)
+        yield json_data
+    
+    fallback_datas = _iter_extract(
+        failed_cities, max_workers,
+        extract=lambda city: _extract_city_weather(city, failed_airs[city.city_id])
+    )
+    for json_data in chain(fallback_datas, _iter_extract(single_cities, max_workers)):
+        _save_owm_id(json_data, city_dao)
+        yield json_data
+
+def _extract_all_group(cities: List[City], city_dao: BasicCityDAO,
+                       max_workers: int = 1) -> List[dict]:
+    """
+    Extract dữ liệu thời tiết của nhiều thành phố theo chế độ group như `_iter_extract_group`.
+
+    Args:
+        cities (List[City]): Danh sách các thành phố cần lấy dữ liệu
+        city_dao (BasicCityDAO): DAO của các city, dùng để lưu lại `owm_id`
+        max_workers (int, optional): Số lượng worker tối đa khi extract riêng. Defaults to 1.
+
+    Returns:
+        List[dict]: Danh sách các dữ liệu extract thành công
+    """
+    return list(_iter_extract_group(cities, city_dao, max_workers))
+
+def _log_response_cache_stats(cache: BasicResponseCache|None,
+                              start_stats: tuple[int, int]|None) -> None:
+    """
+    Ghi log số lần hit/miss của response cache trong một lần chạy.
+
+    Args:
+        cache (BasicResponseCache | None): Response cache được dùng, None nếu không dùng cache
+        start_stats (tuple[int, int] | None): Số lần (hits, misses) của cache lúc bắt đầu
+    """
+    if cache is None or start_stats is None:
+        return
+    hits, misses = cache.stats()
+    logging.info(f'Response cache: {hits - start_stats[0]} hits, {misses - start_stats[1]} misses...')
+
+def _http_pool_size(max_workers: int, http_config: dict) -> int:
+    """
+    Tính số kết nối HTTP cần giữ lại khi extract với `max_workers` thread: mỗi thread gửi
+    request Current Weather trong khi thread pool dùng chung của `weather.business` gửi các
+    request Air Pollution/group song song.
+
+    Args:
+        max_workers (int): Số lượng thread extract
+        http_config (dict): Cấu hình của HTTP client
+
+    Returns:
+        int: Số kết nối của pool
+    """
+    return pool_size_for(max(max_workers, 1) + OWM_EXECUTOR_WORKERS, http_config)
+
+@contextmanager
+def _http_client_for(max_workers: int) -> Iterator[HTTPClient]:
+    """
+    Dùng một HTTP client có pool đủ cho số request đồng thời khi extract với `max_workers`
+    thread. Nếu pool của client dùng chung hiện tại đã đủ thì dùng lại client đó, nếu không
+    thì tạo client mới cho lần extract này và đóng lại khi xong.
+
+    Args:
+        max_workers (int): Số lượng thread extract
+
+    Yields:
+        HTTPClient: HTTP client được dùng
+    """
+    http_config = get_http_config()
+    pool_size = _http_pool_size(max_workers, http_config)
+    http_client = get_client()
+    if http_client.pool_size >= pool_size:
+        yield http_client
+        return
+    http_config['pool_size'] = pool_size
+    http_client = HTTPClient(**http_config)
+    old_client = set_client(http_client)
+    try:
+        yield http_client
+    finally:
+        set_client(old_client)
+        http_client.close()
+
+def _get_daos(dbms: Literal['MySQL', 'MongoDB'] = 'MySQL') -> tuple[BasicCityDAO, BasicWeatherStatusDAO]:
+    """
+    Cấu hình các DAO cần thiết cho quy trình ETL.
 
     Args:
         dbms (Literal[&#39;MySQL&#39;, &#39;MongoDB&#39;], optional): Hệ quản trị CSDL
             được sử dụng để lưu trữ CSDL. Defaults to 'MySQL'.
+
+    Returns:
+        tuple[BasicCityDAO, BasicWeatherStatusDAO]: DAO của các city và DAO của các weather status
     """
-    # Bắt đầu
-    logging.info('<<ETL Process>>')
-    total_start_time = time.time()
-    
-    # Cấu hình các DAO
-    logging.info('Config data access object...')
+    # Thông tin kết nối được lấy từ cấu hình của ứng dụng
     if dbms == 'MySQL':
-        city_dao = MySQLCityDAO('localhost', 'weather_vietnam', 'root', 'Asensio1234@')
-        weather_dao = MySQLWeatherStatusDAO('localhost', 'weather_vietnam', 'root', 'Asensio1234@')
+        mysql_config = get_mysql_config()
+        city_dao = MySQLCityDAO(**mysql_config)
+        weather_dao = MySQLWeatherStatusDAO(**mysql_config)
     else:
-        city_dao = MongoDBCityDAO('localhost', 27017, 'weather_vietnam')
-        weather_dao = MongoDBWeatherStatusDAO('localhost', 27017, 'weather_vietnam')
-    
-    # Lấy dữ liệu tất cả các thành phố
+        mongodb_config = get_mongodb_config()
+        city_dao = MongoDBCityDAO(**mongodb_config)
+        weather_dao = MongoDBWeatherStatusDAO(**mongodb_config)
+    return city_dao, weather_dao
+
+def _get_cities(city_dao: BasicCityDAO) -> List[City]:
+    """
+    Lấy dữ liệu tất cả các thành phố của Việt Nam và ghi log.
+
+    Args:
+        city_dao (BasicCityDAO): DAO của các city
+
+    Returns:
+        List[City]: Danh sách các thành phố
+    """
     logging.info('Getting data of all cities of Viet Nam...')
     start_time = time.time()
     try:
@@ -70,35 +354,24 @@ def weather_vietnam_etl(dbms: Literal['MySQL', 'MongoDB'] = 'MySQL'):
     end_time = time.time()
     msg = f'Successfully. Elapsed Time: {end_time-start_time:.4f}s...'
     logging.info(msg)
-    
-    # Extract dữ liệu weather
-    logging.info(f'Extracting weather data for {len(cities)} cities of Viet Nam...')
-    start_time = time.time()
-    success = 0
-    json_datas: List[dict] = []
-    # Với mỗi thành phố, thực hiện extract và thêm vào list các JSON
-    # Nếu có một thành phố bị lỗi thì vẫn extract tiếp và chỉ thông báo ERROR ra log
-    for city in cities:
-        try:
-            json_datas.append({
-                'data': extract_from_open_weather(city.lon, city.lat),
-                'city': city
-            })
-            success += 1
-        except Exception as e:
-            logging.error(f'Failed to extracting data of {city.name}!!!')
-            print(e)
-    end_time = time.time()
-    msg = f'Successfully extract {success}/{len(cities)}. Elapsed Time: {end_time-start_time:.4f}s...'
-    logging.info(msg) 
-    
-    # Transform dữ liệu
+    return cities
+
+def _transform_all(json_datas: List[dict]) -> List[WeatherStatus]:
+    """
+    Transform dữ liệu của các thành phố đã được extract thành công và ghi log.
+    Nếu có thành phố nào bị chuyển đối lỗi thì vẫn tiếp tục và chỉ ghi log ERROR.
+
+    Args:
+        json_datas (List[dict]): Danh sách các dữ liệu đã extract, mỗi phần tử
+            có 2 key là `data` và `city`
+
+    Returns:
+        List[WeatherStatus]: Danh sách các trạng thái thời tiết đã được chuyển đổi
+    """
     logging.info(f'Transforming weather data for {len(json_datas)} cities of Viet Nam...')
     start_time = time.time()
     success = 0
     new_weather_status_lst: List[WeatherStatus] = []
-    # Chỉ transform dữ liệu những thành phố được extract thành công
-    # Nếu có thành phố nào bị chuyển đối lỗi thì vẫn tiếp tục và chỉ ghi log ERROR
     for json_data in json_datas:
         try:
             new_weather_status_lst.append(transform(json_data['data'], json_data['city'].city_id))
@@ -109,22 +382,396 @@ def weather_vietnam_etl(dbms: Literal['MySQL', 'MongoDB'] = 'MySQL'):
     end_time = time.time()
     msg = f'Successfully transform {success}/{len(json_datas)}. Elapsed Time: {end_time-start_time:.4f}s...'
     logging.info(msg)
-    
-    # Load into database
+    return new_weather_status_lst
+
+def _warm_collect_time_index(collect_time_index: LatestCollectTimeIndex|None,
+                             weather_dao: BasicWeatherStatusDAO) -> None:
+    """
+    Lấy dữ liệu cho chỉ mục thời điểm thu thập mới nhất (nếu chưa có) và ghi log.
+    Nếu bị lỗi thì chỉ mục vẫn rỗng, khi đó không có trạng thái nào bị bỏ qua.
+
+    Args:
+        collect_time_index (LatestCollectTimeIndex | None): Chỉ mục cần lấy dữ liệu
+        weather_dao (BasicWeatherStatusDAO): DAO của các weather status
+    """
+    if collect_time_index is None or collect_time_index.warmed:
+        return
+    try:
+        size = collect_time_index.warm(weather_dao)
+        logging.info(f'Warmed latest collect time index for {size} cities...')
+    except Exception as e:
+        logging.error('Failed to warming latest collect time index!!!')
+        print(e)
+
+def _skip_unchanged(collect_time_index: LatestCollectTimeIndex|None,
+                    new_weather_status_lst: List[WeatherStatus]) -> List[WeatherStatus]:
+    """
+    Bỏ qua các trạng thái thời tiết có `collect_time` chưa mới hơn dữ liệu đã lưu và ghi log.
+
+    Args:
+        collect_time_index (LatestCollectTimeIndex | None): Chỉ mục thời điểm thu thập mới nhất,
+            None nếu không bỏ qua trạng thái nào
+        new_weather_status_lst (List[WeatherStatus]): Các trạng thái thời tiết đã transform
+
+    Returns:
+        List[WeatherStatus]: Các trạng thái thời tiết cần load
+    """
+    if collect_time_index is None:
+        return new_weather_status_lst
+    changed_lst = [new_weather_status for new_weather_status in new_weather_status_lst
+                   if collect_time_index.is_changed(new_weather_status)]
+    logging.info(f'Skipped {len(new_weather_status_lst) - len(changed_lst)}/{len(new_weather_status_lst)} '
+                 'unchanged weather data...')
+    return changed_lst
+
+def _load_batch(weather_dao: BasicWeatherStatusDAO,
+                new_weather_status_lst: List[WeatherStatus],
+                collect_time_index: LatestCollectTimeIndex|None = None) -> int:
+    """
+    Load một lô trạng thái thời tiết vào CSDL trong một lần ghi. Nếu lần ghi bị lỗi
+    thì load lại từng trạng thái để các trạng thái hợp lệ vẫn được lưu.
+
+    Args:
+        weather_dao (BasicWeatherStatusDAO): DAO của các weather status
+        new_weather_status_lst (List[WeatherStatus]): Các trạng thái thời tiết cần load
+        collect_time_index (LatestCollectTimeIndex | None, optional): Chỉ mục thời điểm thu thập
+            mới nhất, được cập nhật sau mỗi lần load thành công. Defaults to None.
+
+    Returns:
+        int: Số trạng thái được load thành công
+    """
+    if not new_weather_status_lst:
+        return 0
+    try:
+        load_many(weather_dao, new_weather_status_lst)
+        loaded_lst = new_weather_status_lst
+    except Exception as e:
+        logging.warning(f'Failed to loading {len(new_weather_status_lst)} weather data at once, '
+                        f'loading one by one: {e}')
+        loaded_lst: List[WeatherStatus] = []
+        for new_weather_status in new_weather_status_lst:
+            try:
+                load(weather_dao, new_weather_status)
+                loaded_lst.append(new_weather_status)
+            except Exception as e:
+                logging.error(f'Failed to loading data of city with id {new_weather_status.city_id}!!!')
+                print(e)
+    if collect_time_index is not None:
+        for new_weather_status in loaded_lst:
+            collect_time_index.update(new_weather_status)
+    return len(loaded_lst)
+
+def _load_all(weather_dao: BasicWeatherStatusDAO,
+              new_weather_status_lst: List[WeatherStatus],
+              collect_time_index: LatestCollectTimeIndex|None = None) -> None:
+    """
+    Load các trạng thái thời tiết đã được transform thành công vào CSDL và ghi log.
+
+    Args:
+        weather_dao (BasicWeatherStatusDAO): DAO của các weather status
+        new_weather_status_lst (List[WeatherStatus]): Các trạng thái thời tiết cần load
+        collect_time_index (LatestCollectTimeIndex | None, optional): Chỉ mục thời điểm thu thập
+            mới nhất, được cập nhật sau mỗi lần load thành công. Defaults to None.
+    """
     logging.info(f'Loading weather data for {len(new_weather_status_lst)} cities of Viet Nam...')
     start_time = time.time()
-    success = 0
-    # Chỉ thực hiện load những dữ liệu đã được transform thành công
-    for new_weather_status in new_weather_status_lst:
-        try:
-            load(weather_dao, new_weather_status)
-            success += 1
-        except Exception as e:
-            logging.error(f'Failed to loading data of city with id {new_weather_status.city_id}!!!')
-            print(e)
+    success = _load_batch(weather_dao, new_weather_status_lst, collect_time_index)
     end_time = time.time()
     msg = f'Successfully load {success}/{len(new_weather_status_lst)}. Elapsed Time: {end_time-start_time:.4f}s...'
     logging.info(msg)
+
+# Đánh dấu kết thúc dữ liệu trong hàng đợi của quy trình streaming
+_STREAM_END = object()
+
+def _stream_transform_load(json_datas: Iterable[dict],
+                           weather_dao: BasicWeatherStatusDAO,
+                           queue_size: int = 16,
+                           collect_time_index: LatestCollectTimeIndex|None = None) -> tuple[int, int, int, int]:
+    """
+    Transform và load dần từng dữ liệu ngay khi được extract xong. Bước load chạy
+    trong một thread riêng, nhận dữ liệu qua một hàng đợi có giới hạn, nên việc ghi
+    vào CSDL diễn ra song song với việc extract và transform các thành phố tiếp theo.
+    Các trạng thái đang chờ trong hàng đợi được gộp lại và load trong một lần ghi.
+    
+    Nếu có một dữ liệu bị lỗi ở bước nào thì vẫn tiếp tục và chỉ ghi log ERROR.
+
+    Args:
+        json_datas (Iterable[dict]): Các dữ liệu đã extract, mỗi phần tử có 2 key
+            là `data` và `city`
+        weather_dao (BasicWeatherStatusDAO): DAO của các weather status
+        queue_size (int, optional): Số trạng thái thời tiết tối đa chờ được load. Defaults to 16.
+        collect_time_index (LatestCollectTimeIndex | None, optional): Chỉ mục thời điểm thu thập
+            mới nhất, các trạng thái chưa thay đổi sẽ bị bỏ qua. Defaults to None.
+
+    Returns:
+        tuple[int, int, int, int]: Số dữ liệu extract, transform thành công, bị bỏ qua
+            do chưa thay đổi và load thành công
+    """
+    load_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    loaded = 0
+    
+    def load_worker():
+        nonlocal loaded
+        finished = False
+        while not finished:
+            # Chờ trạng thái đầu tiên, sau đó gộp các trạng thái đang có trong hàng đợi thành 1 lô
+            batch = [load_queue.get()]
+            while len(batch) < queue_size:
+                try:
+                    batch.append(load_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _STREAM_END:
+                batch.pop()
+                finished = True
+            loaded += _load_batch(weather_dao, batch, collect_time_index)
+    
+    load_thread = threading.Thread(target=load_worker, name='etl-load', daemon=True)
+    load_thread.start()
+    extracted = 0
+    transformed = 0
+    skipped = 0
+    try:
+        for json_data in json_datas:
+            extracted += 1
+            try:
+                new_weather_status = transform(json_data['data'], json_data['city'].city_id)
+            except Exception as e:
+                logging.error(f"Failed to transforming data of {json_data['city'].name}!!!")
+                print(e)
+                continue
+            transformed += 1
+            if collect_time_index is not None and not collect_time_index.is_changed(new_weather_status):
+                skipped += 1
+                continue
+            load_queue.put(new_weather_status)
+    finally:
+        load_queue.put(_STREAM_END)
+        load_thread.join()
+    return extracted, transformed, skipped, loaded
+
+def weather_vietnam_etl(dbms: Literal['MySQL', 'MongoDB'] = 'MySQL',
+                        max_workers: int = 8,
+                        extract_mode: Literal['city', 'group'] = 'city',
+                        response_cache: BasicResponseCache|None = None,
+                        pipeline: Literal['batch', 'stream'] = 'batch',
+                        skip_unchanged: bool = False,
+                        collect_time_index: LatestCollectTimeIndex|None = None):
+    """
+    Quy trình ETL thủ công để làm việc với dữ liệu thời tiết các thành phố Việt Nam
+
+    Args:
+        dbms (Literal[&#39;MySQL&#39;, &#39;MongoDB&#39;], optional): Hệ quản trị CSDL
+            được sử dụng để lưu trữ CSDL. Defaults to 'MySQL'.
+        max_workers (int, optional): Số lượng thread tối đa dùng để extract dữ liệu
+            đồng thời. Nếu `max_workers <= 1` thì sẽ extract tuần tự từng thành phố.
+            Defaults to 8.
+        extract_mode (Literal[&#39;city&#39;, &#39;group&#39;], optional): Chế độ extract.
+            `'city'`
+                Mỗi thành phố gọi riêng API Current Weather.
+            `'group'`
+                Các thành phố đã biết `owm_id` được gọi API group theo nhóm 20 thành phố.
+            Defaults to 'city'.
+        response_cache (BasicResponseCache | None, optional): Response cache dùng cho lần
+            chạy này, các response còn hạn sẽ không được request lại. Nếu là None thì dùng
+            cache của tiến trình (nếu có, xem `weather.business.set_response_cache`).
+            Defaults to None.
+        pipeline (Literal[&#39;batch&#39;, &#39;stream&#39;], optional): Cách kết nối các bước.
+            `'batch'`
+                Extract xong tất cả các thành phố rồi mới transform, transform xong mới load.
+            `'stream'`
+                Mỗi dữ liệu được transform và load ngay khi extract xong, các bước được nối
+                với nhau bởi các hàng đợi có giới hạn nên bộ nhớ không tăng theo số thành phố.
+            Defaults to 'batch'.
+        skip_unchanged (bool, optional): Bỏ qua các trạng thái thời tiết có `collect_time` chưa
+            mới hơn dữ liệu đã lưu của thành phố (Open Weather Map chưa cập nhật). Khi bật, chỉ mục
+            thời điểm thu thập mới nhất được lấy từ CSDL bằng một truy vấn GROUP BY. Defaults to False.
+        collect_time_index (LatestCollectTimeIndex | None, optional): Chỉ mục thời điểm thu thập
+            mới nhất dùng chung giữa các lần chạy, chỉ lấy dữ liệu từ CSDL ở lần đầu. Nếu là None
+            thì tạo mới ở mỗi lần chạy (khi `skip_unchanged=True`). Defaults to None.
+    """
+    # Bắt đầu
+    logging.info('<<ETL Process>>')
+    total_start_time = time.time()
+    
+    # Cấu hình các DAO
+    logging.info('Config data access object...')
+    city_dao, weather_dao = _get_daos(dbms)
+    
+    # Lấy dữ liệu tất cả các thành phố
+    cities = _get_cities(city_dao)
+
+    # Chỉ mục để bỏ qua các trạng thái chưa thay đổi
+    if not skip_unchanged:
+        collect_time_index = None
+    elif collect_time_index is None:
+        collect_time_index = LatestCollectTimeIndex()
+    _warm_collect_time_index(collect_time_index, weather_dao)
+
+    cache = response_cache if response_cache is not None else get_response_cache()
+    cache_stats = cache.stats() if cache is not None else None
+
+    if pipeline == 'stream':
+        # Extract, transform và load đồng thời, các thành phố đi qua từng bước ngay khi có dữ liệu
+        logging.info(f'Streaming weather data for {len(cities)} cities of Viet Nam...')
+        start_time = time.time()
+        old_cache = set_response_cache(cache)
+        try:
+            with _http_client_for(max_workers):
+                if extract_mode == 'group':
+                    json_datas = _iter_extract_group(cities, city_dao, max_workers)
+                else:
+                    json_datas = _iter_extract(cities, max_workers)
+                extracted, transformed, skipped, loaded = _stream_transform_load(
+                    json_datas, weather_dao, collect_time_index=collect_time_index
+                )
+        finally:
+            set_response_cache(old_cache)
+        end_time = time.time()
+        logging.info(f'Successfully extract {extracted}/{len(cities)}, transform {transformed}/{extracted}, '
+                     f'skip {skipped} unchanged, load {loaded}/{transformed - skipped}. '
+                     f'Elapsed Time: {end_time-start_time:.4f}s...')
+        _log_response_cache_stats(cache, cache_stats)
+
+        total_end_time = time.time()
+        logging.info(f'<<End>>. Total Elapsed Time: {total_end_time-total_start_time:.4f}s...')
+        return
+
+    # Extract dữ liệu weather
+    logging.info(f'Extracting weather data for {len(cities)} cities of Viet Nam...')
+    start_time = time.time()
+    old_cache = set_response_cache(cache)
+    # Với mỗi thành phố, thực hiện extract và thêm vào list các JSON
+    try:
+        with _http_client_for(max_workers):
+            if extract_mode == 'group':
+                json_datas = _extract_all_group(cities, city_dao, max_workers)
+            else:
+                json_datas = _extract_all(cities, max_workers)
+    finally:
+        set_response_cache(old_cache)
+    success = len(json_datas)
+    end_time = time.time()
+    msg = f'Successfully extract {success}/{len(cities)}. Elapsed Time: {end_time-start_time:.4f}s...'
+    logging.info(msg) 
+    _log_response_cache_stats(cache, cache_stats)
+    
+    # Transform dữ liệu, chỉ transform dữ liệu những thành phố được extract thành công
+    new_weather_status_lst = _transform_all(json_datas)
+    
+    # Bỏ qua các trạng thái chưa thay đổi so với dữ liệu đã lưu
+    new_weather_status_lst = _skip_unchanged(collect_time_index, new_weather_status_lst)
+    
+    # Load into database, chỉ thực hiện load những dữ liệu đã được transform thành công
+    _load_all(weather_dao, new_weather_status_lst, collect_time_index)
+    
+    # Tổng kết job
+    total_end_time = time.time()
+    msg = f'<<End>>. Total Elapsed Time: {total_end_time-total_start_time:.4f}s...'
+    logging.info(msg)
+
+async def _async_extract_all(cities: List[City],
+                             session: aiohttp.ClientSession,
+                             semaphore: asyncio.Semaphore) -> List[dict]:
+    """
+    Extract dữ liệu thời tiết của nhiều thành phố trên cùng một event loop.
+    Nếu có một thành phố bị lỗi thì vẫn extract tiếp và chỉ thông báo ERROR ra log.
+
+    Args:
+        cities (List[City]): Danh sách các thành phố cần lấy dữ liệu
+        session (aiohttp.ClientSession): Session dùng để gửi request
+        semaphore (asyncio.Semaphore): Semaphore giới hạn số request đồng thời
+
+    Returns:
+        List[dict]: Danh sách các dữ liệu extract thành công, theo thứ tự của `cities`
+    """
+    results = await asyncio.gather(
+        *[async_extract_from_open_weather(session, city.lon, city.lat, semaphore) for city in cities],
+        return_exceptions=True
+    )
+    json_datas: List[dict] = []
+    for city, result in zip(cities, results):
+        if isinstance(result, Exception):
+            logging.error(f'Failed to extracting data of {city.name}!!!')
+            print(result)
+            continue
+        json_datas.append({
+            'data': result,
+            'city': city
+        })
+    return json_datas
+
+async def async_weather_vietnam_etl(dbms: Literal['MySQL', 'MongoDB'] = 'MySQL',
+                                    max_concurrency: int = 20,
+                                    session: aiohttp.ClientSession|None = None,
+                                    semaphore: asyncio.Semaphore|None = None,
+                                    skip_unchanged: bool = False,
+                                    collect_time_index: LatestCollectTimeIndex|None = None):
+    """
+    Quy trình ETL bất đồng bộ để làm việc với dữ liệu thời tiết các thành phố Việt Nam.
+    Các request tới Open Weather Map được gửi trên cùng một event loop, số request
+    đồng thời được giới hạn bởi một semaphore. Các bước transform và load dùng lại
+    các hàm của quy trình thủ công, các thao tác với CSDL được chạy trong thread riêng
+    để không chặn event loop.
+    
+    Có thể chạy nhiều quy trình trên cùng một event loop bằng cách truyền vào chung
+    `session` và `semaphore`.
+
+    Args:
+        dbms (Literal[&#39;MySQL&#39;, &#39;MongoDB&#39;], optional): Hệ quản trị CSDL
+            được sử dụng để lưu trữ CSDL. Defaults to 'MySQL'.
+        max_concurrency (int, optional): Số request tối đa được gửi đồng thời, chỉ
+            được sử dụng khi `semaphore=None`. Defaults to 20.
+        session (aiohttp.ClientSession | None, optional): Session dùng để gửi request, nếu
+            là None thì sẽ tạo mới và đóng lại khi kết thúc. Defaults to None.
+        semaphore (asyncio.Semaphore | None, optional): Semaphore dùng chung để giới hạn
+            số request đồng thời. Defaults to None.
+        skip_unchanged (bool, optional): Bỏ qua các trạng thái thời tiết chưa thay đổi, xem
+            `weather_vietnam_etl`. Defaults to False.
+        collect_time_index (LatestCollectTimeIndex | None, optional): Chỉ mục thời điểm thu thập
+            mới nhất, xem `weather_vietnam_etl`. Nếu là None thì tạo mới (khi `skip_unchanged=True`).
+            Defaults to None.
+    """
+    # Bắt đầu
+    logging.info('<<Async ETL Process>>')
+    total_start_time = time.time()
+    
+    # Cấu hình các DAO
+    logging.info('Config data access object...')
+    city_dao, weather_dao = await asyncio.to_thread(_get_daos, dbms)
+    
+    # Lấy dữ liệu tất cả các thành phố
+    cities = await asyncio.to_thread(_get_cities, city_dao)
+    if not skip_unchanged:
+        collect_time_index = None
+    elif collect_time_index is None:
+        collect_time_index = LatestCollectTimeIndex()
+    await asyncio.to_thread(_warm_collect_time_index, collect_time_index, weather_dao)
+    
+    # Extract dữ liệu weather
+    logging.info(f'Extracting weather data for {len(cities)} cities of Viet Nam...')
+    start_time = time.time()
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+    cache = get_response_cache()
+    cache_stats = cache.stats() if cache is not None else None
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession()
+    try:
+        json_datas = await _async_extract_all(cities, session, semaphore)
+    finally:
+        if own_session:
+            await session.close()
+    end_time = time.time()
+    msg = f'Successfully extract {len(json_datas)}/{len(cities)}. Elapsed Time: {end_time-start_time:.4f}s...'
+    logging.info(msg)
+    _log_response_cache_stats(cache, cache_stats)
+    
+    # Transform và load
+    new_weather_status_lst = _transform_all(json_datas)
+    new_weather_status_lst = _skip_unchanged(collect_time_index, new_weather_status_lst)
+    await asyncio.to_thread(_load_all, weather_dao, new_weather_status_lst, collect_time_index)
     
     # Tổng kết job
     total_end_time = time.time()
@@ -133,22 +780,31 @@ def weather_vietnam_etl(dbms: Literal['MySQL', 'MongoDB'] = 'MySQL'):
 
 _job_cnt = 0
     
-def _weather_viet_nam_etl_limited(dbms: Literal['MySQL', 'MongoDB'] = 'MySQL'):
+def _weather_viet_nam_etl_limited(dbms: Literal['MySQL', 'MongoDB'] = 'MySQL',
+                                  max_workers: int = 8,
+                                  extract_mode: Literal['city', 'group'] = 'city',
+                                  **etl_options):
     """
     Quy trình được thực hiện cùng với việc tăng bộ đếm Job
     
     Args:
         dbms (Literal[&#39;MySQL&#39;, &#39;MongoDB&#39;], optional): Hệ quản trị CSDL
             được sử dụng để lưu trữ CSDL. Defaults to 'MySQL'.
+        max_workers (int, optional): Số lượng thread tối đa dùng để extract dữ liệu. Defaults to 8.
+        extract_mode (Literal[&#39;city&#39;, &#39;group&#39;], optional): Chế độ extract. Defaults to 'city'.
+        **etl_options: Các tham số khác của `weather_vietnam_etl` (`response_cache`, `pipeline`,...)
     """
     global _job_cnt
 
     _job_cnt += 1
     logging.info(f'---Job {_job_cnt}---')
-    weather_vietnam_etl(dbms)
+    weather_vietnam_etl(dbms, max_workers, extract_mode, **etl_options)
     
 def _supported_minutes_job(frequent: int = 1,
-                           dbms: Literal['MySQL', 'MongoDB'] = 'MySQL'):
+                           dbms: Literal['MySQL', 'MongoDB'] = 'MySQL',
+                           max_workers: int = 8,
+                           extract_mode: Literal['city', 'group'] = 'city',
+                           **etl_options):
     """
     Quy trình ETL hỗ trợ check tròn phút cộng với tăng bộ đếm
 
@@ -157,16 +813,25 @@ def _supported_minutes_job(frequent: int = 1,
             Job sẽ được thực hiện vào thời điểm mà phút chia hết
             cho frequent. Defaults to 1.
         dbms (Literal[&#39;MySQL&#39;, &#39;MongoDB&#39;], optional): _description_. Defaults to 'MySQL'.
+        max_workers (int, optional): Số lượng thread tối đa dùng để extract dữ liệu. Defaults to 8.
+        extract_mode (Literal[&#39;city&#39;, &#39;group&#39;], optional): Chế độ extract. Defaults to 'city'.
+        **etl_options: Các tham số khác của `weather_vietnam_etl` (`response_cache`, `pipeline`,...)
     """
     now = datetime.datetime.now()
     if now.minute % frequent == 0:
-        _weather_viet_nam_etl_limited(dbms)
+        _weather_viet_nam_etl_limited(dbms, max_workers, extract_mode, **etl_options)
         
 def auto_weather_vietnam_etl(type: Literal['daily', 'hourly', 'minutely'] = 'hourly',
                              job_limits: int|None = None,
                              daily_collect_time: datetime.time|list[datetime.time]|None = None,
                              minute_frequent: int|None = None,
-                             dbms: Literal['MySQL', 'MongoDB'] = 'MySQL'):
+                             dbms: Literal['MySQL', 'MongoDB'] = 'MySQL',
+                             max_workers: int = 8,
+                             http_client: HTTPClient|None = None,
+                             extract_mode: Literal['city', 'group'] = 'city',
+                             response_cache: BasicResponseCache|None = None,
+                             pipeline: Literal['batch', 'stream'] = 'batch',
+                             skip_unchanged: bool = False):
     """
     Quy trình ETL tự động để thao tác với dữ liệu thời tiết các thành phố ở Việt Nam
 
@@ -185,6 +850,23 @@ def auto_weather_vietnam_etl(type: Literal['daily', 'hourly', 'minutely'] = 'hou
         minute_frequent (int | None, optional): Số phút tròn để lấy dữ liệu. Defaults to None.
         dbms (Literal[&#39;MySQL&#39;, &#39;MongoDB&#39;], optional): Hệ quản trị CSDL
             được sử dụng để lưu trữ CSDL. Defaults to 'MySQL'.
+        max_workers (int, optional): Số lượng thread tối đa dùng để extract dữ liệu
+            đồng thời trong mỗi job. Defaults to 8.
+        http_client (HTTPClient | None, optional): HTTP client dùng chung cho tất cả các job,
+            được giữ lại trong suốt quy trình để các job sau dùng lại các kết nối đã mở.
+            Nếu là None thì sẽ tạo mới với pool đủ cho `max_workers` thread extract cùng với
+            thread pool dùng chung của `weather.business`. Defaults to None.
+        extract_mode (Literal[&#39;city&#39;, &#39;group&#39;], optional): Chế độ extract của mỗi job,
+            xem `weather_vietnam_etl`. Defaults to 'city'.
+        response_cache (BasicResponseCache | None, optional): Response cache dùng chung cho tất
+            cả các job. Với `type='minutely'`, Open Weather Map chỉ cập nhật dữ liệu khoảng 10 phút
+            một lần nên có thể dùng cache với TTL tương ứng để không tải lại các dữ liệu giống nhau.
+            Defaults to None.
+        pipeline (Literal[&#39;batch&#39;, &#39;stream&#39;], optional): Cách kết nối các bước của mỗi job,
+            xem `weather_vietnam_etl`. Defaults to 'batch'.
+        skip_unchanged (bool, optional): Bỏ qua các trạng thái thời tiết chưa thay đổi. Chỉ mục
+            thời điểm thu thập mới nhất được lấy từ CSDL ở job đầu tiên và dùng chung cho các job
+            sau. Defaults to False.
 
     Raises:
         ValueError: Khi chọn `type='daily'` mà không có tham số `daily_collect_time`, hoặc khi chọn
@@ -193,6 +875,14 @@ def auto_weather_vietnam_etl(type: Literal['daily', 'hourly', 'minutely'] = 'hou
     global _job_cnt 
     _job_cnt = 0
     
+    # Các tham số khác của mỗi job
+    etl_options = {
+        'response_cache': response_cache,
+        'pipeline': pipeline,
+        'skip_unchanged': skip_unchanged,
+        'collect_time_index': LatestCollectTimeIndex() if skip_unchanged else None
+    }
+    
     # Tùy thuộc vào type mà lên lịch kế hoạch hoạt động bằng schedule
     # Sẽ gọi các hàm wrapper tương ứng của quy trình ETL thủ công
     if type == 'daily':
@@ -205,26 +895,40 @@ def auto_weather_vietnam_etl(type: Literal['daily', 'hourly', 'minutely'] = 'hou
             daily_collect_times = daily_collect_time
         for collect_time in daily_collect_times:
             collect_time_str = collect_time.strftime("%H:%M")
-            job = partial(_weather_viet_nam_etl_limited, dbms)
+            job = partial(_weather_viet_nam_etl_limited, dbms, max_workers, extract_mode,
+                          **etl_options)
             schedule.every().day.at(collect_time_str).do(job).tag(type)
     elif type == 'hourly':
-        job = partial(_weather_viet_nam_etl_limited, dbms)
+        job = partial(_weather_viet_nam_etl_limited, dbms, max_workers, extract_mode,
+                      **etl_options)
         schedule.every().hour.at(":00").do(job).tag(type)
     elif type == 'minutely':
         if minute_frequent is None:
             raise ValueError("Required minute frequent!")
-        job = partial(_supported_minutes_job, minute_frequent, dbms)
+        job = partial(_supported_minutes_job, minute_frequent, dbms, max_workers, extract_mode,
+                      **etl_options)
         schedule.every().minute.at(":00").do(job).tag(type)
     else:
         raise ValueError("Not supported type")
     
+    # HTTP client sống cùng quy trình, có pool đủ cho các thread extract và thread pool dùng chung
+    if http_client is None:
+        http_config = get_http_config()
+        http_config['pool_size'] = _http_pool_size(max_workers, http_config)
+        http_client = HTTPClient(**http_config)
+    old_client = set_client(http_client)
+    
     # Thực hiện các job theo kế hoạch định trước, chỉ dừng khi đạt giới hạn số lượng.
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
-        if job_limits is not None and _job_cnt >= job_limits:
-            logging.info(f"Execution job count has reached {job_limits}. Cancelling the job.")
-            schedule.clear(type)
-            break
+    try:
+        while True:
+            schedule.run_pending()
+            time.sleep(1)
+            if job_limits is not None and _job_cnt >= job_limits:
+                logging.info(f"Execution job count has reached {job_limits}. Cancelling the job.")
+                schedule.clear(type)
+                break
+    finally:
+        set_client(old_client)
+        http_client.close()
     
     logging.info('!!!Done!!!')
\ No newline at end of file
@@ -5,15 +5,14 @@ sys.path.append(init_dir)
 
 from typing import Literal
 
-from place.dao import BasicCityDAO, MySQLCityDAO, MongoDBCityDAO
+from place.dao import BasicCityDAO
 from common.dao import NotExistDataException, DAOException
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 
 def get_dao(type: Literal['MySQL', 'MongoDB'] = 'MongoDB') -> BasicCityDAO:
-    if type == 'MySQL':
-        return MySQLCityDAO('localhost', 'weather_vietnam', 'root', 'Asensio1234@')
-    return MongoDBCityDAO('localhost', 27017, 'weather_vietnam')
+    # DAO dùng chung được tạo một lần bởi DAOProvider của ứng dụng (xem app.py)
+    return current_app.extensions['dao_provider'].get('city', 'MySQL' if type == 'MySQL' else 'MongoDB')
 
 place_bp = Blueprint('place_bp', __name__)
 
@@ -13,13 +13,12 @@ init_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 import sys
 sys.path.append(init_dir)
 
-import json
-import requests
-
 from typing import Literal, Dict, List
 
 from place.model import City, Country
 from place.dao import BasicCityDAO, BasicCountryDAO
+from common.http_client import get_client
+from common.settings import get_api_key
 
 def extract_from_open_weather(city: City) -> tuple[float, float]:
     """
@@ -33,16 +32,17 @@ def extract_from_open_weather(city: City) -> tuple[float, float]:
     Returns:
         tuple[float, float]: Tọa độ (lon, lat) (kinh độ, vĩ độ) của thành phố
     """
-    # Mở file cấu hình và lấy API Key
-    config_dir = os.path.join(init_dir, 'config.json')
-    with open(config_dir, 'r') as config_file:
-        config = json.load(config_file)
-    api_key = config['OPEN_WEATHER_MAP_API_KEY']
+    # Lấy API Key từ cấu hình (đã được lưu lại trong bộ nhớ)
+    api_key = get_api_key()
     
     # Lấy dữ liệu từ API
     base_url = "http://api.openweathermap.org/geo/1.0/direct"
-    url = f"{base_url}?q={city.name},{city.country.code}&limit=1&appid={api_key}"
-    response = requests.get(url).json()[0]
+    params = {
+        'q': f'{city.name},{city.country.code}',
+        'limit': 1,
+        'appid': api_key
+    }
+    response = get_client().get_json(base_url, params=params)[0]
     return response['lon'], response['lat']
 
 def _get_city(city: int|str,
@@ -2,6 +2,9 @@
 Module `dao` cung cấp các DAO để thao tác CSDL
 của các country và city
 
+Các DAO đều có thể dùng chung giữa nhiều thread, xem `common.dao.BasicMySQLDAO`
+và `common.dao.BasicMongoDBDAO`.
+
 Author: 
     Lê Minh Triết
 Last Modified Date: 
@@ -21,7 +24,7 @@ from abc import ABC, abstractmethod
 import db.config as dbconfig
 from common.dao import BasicMySQLDAO, DAOException, NotExistDataException, BasicMongoDBDAO
 
-from place.model import Country, City
+from place.model import Country, City, normalize_country_code
 
 class BasicCountryDAO(ABC):
     """
@@ -84,19 +87,16 @@ class MySQLCountryDAO(BasicMySQLDAO, BasicCountryDAO):
         self._country_reader = self._sqlFileReaders[dbconfig.COUNTRY_SQL_FILE]
     
     def get(self, code: str) -> Country:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
         # Lấy các query tương ứng
         get_country_query = self._country_reader.get_query_of(
             dbconfig.CountryEnableQueries.GET_BY_CODE.value
         )
         
         # Thực hiển đổi code về dạng ISO 3166-1 Alpha-2
-        country = Country(code)
-        code = country.code
+        code = normalize_country_code(code)
+        
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
         
         # Execute truy vấn và lấy kết quả
         try:
@@ -107,57 +107,58 @@ class MySQLCountryDAO(BasicMySQLDAO, BasicCountryDAO):
                 raise NotExistDataException()
             return Country.from_tuple(source=get_country_result)
         except Error as e:
+            self.mark_failed_(connection)
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
         
     def insert(self, new_country: Country) -> None:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
         # Lấy query tương ứng
         insert_country_query = self._country_reader.get_query_of(
             dbconfig.CountryEnableQueries.INSERT.value
         )
         
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
         # Thực hiện lệnh, nếu có lỗi thì sẽ rollback lại
         try:
             cursor.execute(insert_country_query, (new_country.code, new_country.name))
-            self._connection.commit()
+            connection.commit()
         except Error as e:
-            if self._connection.is_connected():
-                self._connection.rollback()
+            self.mark_failed_(connection)
+            if connection.is_connected():
+                connection.rollback()
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
     
     def delete(self, code: str) -> None:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")       
-        cursor = self._connection.cursor(prepared=True)
-        
         # Lấy query
         delete_query = self._country_reader.get_query_of(
             dbconfig.CountryEnableQueries.DELETE.value
         )
         
         # Đổi code sang ISO 3166-1 Alpha-2
-        country = Country(code)
-        code = country.code
+        code = normalize_country_code(code)
+        
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
         
         # Thực hiện lệnh, nếu có lỗi thì rollback
         try:
             cursor.execute(delete_query, (code, ))
-            self._connection.commit()
+            connection.commit()
         except Error as e:
-            if self._connection.is_connected():
-                self._connection.rollback()
+            self.mark_failed_(connection)
+            if connection.is_connected():
+                connection.rollback()
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
 
 class BasicCityDAO(ABC):
     """
@@ -243,11 +244,6 @@ class MySQLCityDAO(BasicMySQLDAO, BasicCityDAO):
         if city_id is None and city_name is None:
             raise NotExistDataException()
         
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
         # Lấy các query tương ứng (có cả thao tác với country)
         get_country_query = self._country_reader.get_query_of(
             dbconfig.CountryEnableQueries.GET_BY_CODE.value
@@ -259,6 +255,9 @@ class MySQLCityDAO(BasicMySQLDAO, BasicCityDAO):
             dbconfig.CityEnableQueries.GET_BY_NAME.value
         )
 
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
         # Lấy dữ liệu, tùy thuộc vào có city_id hay không để quyết định chọn query nào
         try:
             if city_id is not None:
@@ -270,27 +269,25 @@ class MySQLCityDAO(BasicMySQLDAO, BasicCityDAO):
             if get_city_result is None:
                 raise NotExistDataException()
             
-            # Lấy dữ liệu quốc gia mà thành phố thuộc về
+            # Lấy dữ liệu quốc gia mà thành phố thuộc về (các cột: city_id, name, lon, lat,
+            # time_zone, owm_id, country_code)
             country_source = None
-            country_code = get_city_result[5]
+            country_code = get_city_result[6]
             if country_code is not None:
                 cursor.execute(get_country_query, (country_code, ))
                 get_country_result = cursor.fetchone()
                 country_source = get_country_result
                 
-            source = get_city_result[:-1] + (country_source, )
+            source = get_city_result[:6] + (country_source, )
             return City.from_tuple(source)
         except Error as e:
+            self.mark_failed_(connection)
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
             
     def insert(self, new_city: City) -> None:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
         # Lấy các query
         insert_country_query = self._country_reader.get_query_of(
             dbconfig.CountryEnableQueries.INSERT.value
@@ -299,48 +296,48 @@ class MySQLCityDAO(BasicMySQLDAO, BasicCityDAO):
             dbconfig.CityEnableQueries.INSERT.value
         )
         
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
         # Thêm vào CSDL, nếu lỗi thì rollback. Nếu quốc gia mà city thuộc về chưa có thì cũng thêm.
         try:
             new_country = new_city.country
             if new_country is not None:
                 cursor.execute(insert_country_query, (new_country.code, new_country.name))
             cursor.execute(insert_city_query, new_city.to_tuple()[:-1] + (new_country.code, ))
-            self._connection.commit()
+            connection.commit()
         except Error as e:
-            if self._connection.is_connected():
-                self._connection.rollback()
+            self.mark_failed_(connection)
+            if connection.is_connected():
+                connection.rollback()
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
     
     def delete(self, city_id: int) -> None:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
         # Lấy query
         delete_query = self._city_reader.get_query_of(
             dbconfig.CityEnableQueries.DELETE.value
         )
         
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
         # Thực hiện xóa, nếu lỗi thì rollback
         try:
             cursor.execute(delete_query, (city_id, ))
-            self._connection.commit()
+            connection.commit()
         except Error as e:
-            if self._connection.is_connected():
-                self._connection.rollback()
+            self.mark_failed_(connection)
+            if connection.is_connected():
+                connection.rollback()
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
         
     def get_all(self, country_code: str) -> list[City]:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
         # Lấy các query
         get_country_query = self._country_reader.get_query_of(
             dbconfig.CountryEnableQueries.GET_BY_CODE.value
@@ -349,6 +346,9 @@ class MySQLCityDAO(BasicMySQLDAO, BasicCityDAO):
             dbconfig.CityEnableQueries.GET_ALL_BY_COUNTRY.value
         )
 
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
         # Lấy dữ liệu từ bảng country và city
         try:
             cursor.execute(get_city_query, (country_code, ))
@@ -360,14 +360,16 @@ class MySQLCityDAO(BasicMySQLDAO, BasicCityDAO):
             
             citys: List[City] = []
             for city_result in get_city_results:        
-                source = city_result[:-1] + (country_source, )
+                source = city_result[:6] + (country_source, )
                 citys.append(City.from_tuple(source))
 
             return citys
         except Error as e:
+            self.mark_failed_(connection)
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
             
 class MongoDBCountryDAO(BasicMongoDBDAO, BasicCountryDAO):
     """
@@ -394,7 +396,7 @@ class MongoDBCountryDAO(BasicMongoDBDAO, BasicCountryDAO):
     
     def get(self, code: str) -> Country:
         query = {
-            'code': Country(code).code
+            'code': normalize_country_code(code)
         }
         
         result = self._country_collection.find_one(query)
@@ -3,20 +3,90 @@ Module `model` cung cấp class để đại diện
 cho các đối tượng dữ liệu liên quan tới vị trí,
 đó là Country và City.
 
+Các class dùng `__slots__` thay cho `__dict__` để giảm bộ nhớ của mỗi đối tượng.
+
 Author: 
     Lê Minh Triết
 Last Modified Date: 
-    03/02/2025
+    18/10/2026
 """
 
-import pycountry
+import threading
 from typing import Literal
 
-class Country:
+from common.interning import Interned
+
+# Bảng tra cứu ISO 3166-1, ánh xạ mã Alpha-2 và Alpha-3 (viết hoa) tới
+# (alpha_2, alpha_3, name, official_name). Bảng chỉ được tạo 1 lần khi
+# cần tới lần đầu tiên, nên chi phí import pycountry cũng được trì hoãn tới lúc đó.
+_iso_countries: dict[str, tuple[str, str, str, str]]|None = None
+_iso_countries_lock = threading.Lock()
+
+def _get_iso_countries() -> dict[str, tuple[str, str, str, str]]:
+    """
+    Lấy bảng tra cứu ISO 3166-1, tạo bảng từ pycountry nếu chưa có.
+
+    Returns:
+        dict[str, tuple[str, str, str, str]]: Bảng tra cứu theo mã Alpha-2/Alpha-3
+    """
+    global _iso_countries
+    if _iso_countries is None:
+        with _iso_countries_lock:
+            if _iso_countries is None:
+                import pycountry
+                iso_countries = {}
+                for country_iso in pycountry.countries:
+                    # Một số quốc gia không có tên chính thức, khi đó dùng tên ISO
+                    entry = (country_iso.alpha_2, country_iso.alpha_3, country_iso.name,
+                             getattr(country_iso, 'official_name', country_iso.name))
+                    iso_countries[country_iso.alpha_2] = entry
+                    iso_countries[country_iso.alpha_3] = entry
+                _iso_countries = iso_countries
+    return _iso_countries
+
+def lookup_iso_country(code: str) -> tuple[str, str, str, str]:
+    """
+    Tra cứu thông tin ISO 3166-1 của một quốc gia theo mã Alpha-2 hoặc Alpha-3.
+
+    Args:
+        code (str): Mã quốc gia (không phân biệt hoa thường)
+
+    Raises:
+        ValueError: Khi mã quốc gia không hợp lệ.
+
+    Returns:
+        tuple[str, str, str, str]: (alpha_2, alpha_3, name, official_name)
+    """
+    entry = None
+    if isinstance(code, str) and len(code) in (2, 3):
+        entry = _get_iso_countries().get(code.upper())
+    if entry is None:
+        raise ValueError("Invalid country code!")
+    return entry
+
+def normalize_country_code(code: str) -> str:
+    """
+    Chuẩn hóa mã quốc gia về dạng ISO 3166-1 Alpha-2.
+
+    Args:
+        code (str): Mã quốc gia theo Alpha-2 hoặc Alpha-3
+
+    Raises:
+        ValueError: Khi mã quốc gia không hợp lệ.
+
+    Returns:
+        str: Mã Alpha-2 của quốc gia
+    """
+    return lookup_iso_country(code)[0]
+
+class Country(Interned):
     """
-    Đại diện cho 1 đối tượng dữ liệu country.
+    Đại diện cho 1 đối tượng dữ liệu country. Các đối tượng dùng chung (bất biến)
+    được lấy qua `Country.of`.
     """
     
+    __slots__ = ('__code', '__name')
+    
     def __init__(self, code: str, name: str|None = None,
                  use_iso_name: bool = False):
         """
@@ -29,10 +99,31 @@ class Country:
             use_iso_name(bool, optional): Sử dụng tên ISO của quốc gia, ghi đè lên trường `name`
                 nếu được sử dụng. Defaults to False
         """
+        self._frozen = False
         self.code = code
         self.name = name
         if use_iso_name:
             self.name = self.get_iso_name()
+    
+    @staticmethod
+    def of(code: str, name: str|None = None) -> 'Country':
+        """
+        Lấy đối tượng Country dùng chung ứng với (code, name). Đối tượng trả về là
+        bất biến, các lần gọi sau với cùng tham số (kể cả khi dùng mã Alpha-3)
+        đều trả về cùng một đối tượng.
+
+        Args:
+            code (str): Mã của quốc gia theo chuẩn ISO 3166-1 (Alpha-2 hoặc Alpha-3)
+            name (str | None, optional): Tên của quốc gia. Defaults to None.
+
+        Raises:
+            ValueError: Khi mã quốc gia không hợp lệ.
+
+        Returns:
+            Country: Đối tượng dùng chung
+        """
+        code = normalize_country_code(code)
+        return Country._intern((code, name), lambda: Country(code, name))
         
     @property
     def code(self):
@@ -44,22 +135,13 @@ class Country:
     
     @code.setter
     def code(self, code: str):
-        # Dùng module pycountry để lấy đối tượng Country theo ISO 
-        # tùy thuộc vào code là Alpha-2 hay Alpha-3, sau đó đều
-        # chuyển về Alpha-2
-        try:
-            if len(code) == 2:
-                country_iso = pycountry.countries.get(alpha_2=code.upper())
-            elif len(code) == 3:
-                country_iso = pycountry.countries.get(alpha_3=code.upper())
-            else:
-                raise ValueError("Invalid country code!")
-            self.__code = country_iso.alpha_2
-        except ValueError as valueErr:
-            raise ValueError("Invalid country code!")
+        self._check_mutable()
+        # Tra bảng ISO để chuẩn hóa code (Alpha-2 hoặc Alpha-3) về Alpha-2
+        self.__code = normalize_country_code(code)
         
     @name.setter
     def name(self, name: str|None):
+        self._check_mutable()
         self.__name = name
             
     def get_code_with_type(self, code_type: Literal['alpha_2', 'alpha_3'] = 'alpha_3') -> str:
@@ -78,14 +160,11 @@ class Country:
         """
         if self.__code is None:
             raise ValueError("Code is null!")
-        try:
-            country_iso = pycountry.countries.get(alpha_2=self.code)
-            if code_type == 'alpha_2':
-                return country_iso.alpha_2
-            else:
-                return country_iso.alpha_3
-        except ValueError as e:
-            raise e
+        alpha_2, alpha_3, _, _ = lookup_iso_country(self.__code)
+        if code_type == 'alpha_2':
+            return alpha_2
+        else:
+            return alpha_3
         
     def get_iso_name(self) -> str:
         """
@@ -97,11 +176,7 @@ class Country:
         Returns:
             str: Tên của quốc gia theo chuẩn ISO
         """
-        try:
-            country_iso = pycountry.countries.get(alpha_2=self.__code)
-            return country_iso.name
-        except ValueError as e:
-            raise e
+        return lookup_iso_country(self.__code)[2]
         
     def get_offical_name(self) -> str:
         """
@@ -113,11 +188,7 @@ class Country:
         Returns:
             str: Tên chính thức của quốc gia theo chuẩn ISO
         """
-        try:
-            country_iso = pycountry.countries.get(alpha_2=self.__code)
-            return country_iso.official_name
-        except ValueError as e:
-            raise e
+        return lookup_iso_country(self.__code)[3]
         
     def __str__(self):
         s = f'Country('
@@ -129,7 +200,7 @@ class Country:
     @staticmethod
     def from_tuple(source: tuple[str, str|None]) -> 'Country':
         """
-        Chuyển đổi 1 tuple sang một đối tượng Country.
+        Chuyển đổi 1 tuple sang một đối tượng Country (dùng chung).
         
         Args:
             source (tuple[str, str | None]): dữ liệu nguồn cho dưới dạng 1 tuple,
@@ -145,7 +216,7 @@ class Country:
             return None
         if len(source) != 2:
             raise ValueError("Invalid argurment, required 2 argument!")
-        return Country(
+        return Country.of(
             code=source[0],
             name=source[1]
         )
@@ -162,7 +233,7 @@ class Country:
     @staticmethod
     def from_json(source: dict) -> 'Country':
         """
-        Chuyển 1 đối tượng JSON sang Country. Đối tượng JSON này phải 
+        Chuyển 1 đối tượng JSON sang Country (dùng chung). Đối tượng JSON này phải 
         chứa các trường code và name, các trường trống mang giá trị None.
 
         Args:
@@ -171,7 +242,7 @@ class Country:
         Returns:
             Country: Đối tượng Country thu được
         """
-        return Country(
+        return Country.of(
             code=source['code'],
             name=source['name']
         )
@@ -192,12 +263,17 @@ class City:
     """
     Đối tượng đại diện cho dữ liệu của các City.
     """
+    
+    __slots__ = ('__city_id', '__name', '__lat', '__lon', '__time_zone',
+                 '__country', '__owm_id')
+    
     def __init__(self, city_id: int, 
                  name: str|None = None,
                  lon: float = 0.0,
                  lat: float = 0.0,       
                  time_zone: int = 0,
-                 country: Country|None = None):
+                 country: Country|None = None,
+                 owm_id: int|None = None):
         """
         Khởi tạo 1 đối tượng City.
 
@@ -209,6 +285,8 @@ class City:
             time_zone (int, optional): Múi giờ của thành phố (phải nằm trong [-12, 14]). 
                 Defaults to 0.
             country (Country | None, optional): Quốc gia mà thành phố thuộc về. Defaults to None.
+            owm_id (int | None, optional): Mã định danh của thành phố trên Open Weather Map, dùng
+                để lấy dữ liệu theo nhóm. Defaults to None.
         """
         self.city_id = city_id
         self.name = name
@@ -216,6 +294,7 @@ class City:
         self.lon = lon
         self.time_zone = time_zone
         self.country = country
+        self.owm_id = owm_id
     
     @property
     def city_id(self):
@@ -241,6 +320,10 @@ class City:
     def country(self):
         return self.__country
     
+    @property
+    def owm_id(self):
+        return self.__owm_id
+    
     @city_id.setter
     def city_id(self, city_id: int):
         self.__city_id = city_id
@@ -267,6 +350,10 @@ class City:
     def country(self, country: Country|None):
         self.__country = country
         
+    @owm_id.setter
+    def owm_id(self, owm_id: int|None):
+        self.__owm_id = owm_id
+        
     def get_coord(self) -> tuple[float, float]:
         return self.__lon, self.__lat
     
@@ -277,54 +364,57 @@ class City:
         s += f'lon={self.lon:.2f}, ' if self.lon is not None else 'lon=None, '
         s += f'lat={self.lat:.2f}, ' if self.lat is not None else 'lat=None, '
         s += f'time_zone=UTC{"+" if self.time_zone>=0 else "-"}{abs(self.time_zone)}, '
-        s += f'country={self.country}'
+        s += f'country={self.country}, '
+        s += f'owm_id={self.owm_id}'
         s += f')'
         return s
     
     @staticmethod
-    def from_tuple(source: tuple[int, str|None, float, float, int, tuple]) -> 'City':
+    def from_tuple(source: tuple) -> 'City':
         """
         Chuyển đổi 1 tuple sang một đối tượng City.
 
         Args:
-            source (tuple[int, str | None, float, float, int, tuple]): Một tuple
-                có dạng (city_id, name, lon, lat, time_zone, country).
+            source (tuple): Một tuple có dạng (city_id, name, lon, lat, time_zone, owm_id, country)
+                hoặc (city_id, name, lon, lat, time_zone, country) nếu không có owm_id.
 
         Raises:
-            ValueError: Khi tuple không có đủ 6 tham số
+            ValueError: Khi tuple không có 6 hoặc 7 tham số
 
         Returns:
             City: Đối tượng City tương ứng
         """
         if len(source) == 0:
             return None
-        if len(source) != 6:
-            raise ValueError("Invalid argurment, required 6 argument!")
+        if len(source) not in (6, 7):
+            raise ValueError("Invalid argurment, required 6 or 7 argument!")
         return City(
             city_id=source[0],
             name=source[1],
             lon=source[2],
             lat=source[3],
             time_zone=source[4],
-            country=Country.from_tuple(source[5])
+            owm_id=source[5] if len(source) == 7 else None,
+            country=Country.from_tuple(source[-1])
         )
         
-    def to_tuple(self) -> tuple[int, str|None, float, float, int, tuple]:
+    def to_tuple(self) -> tuple[int, str|None, float, float, int, int|None, tuple]:
         """
         Chuyển 1 đối tượng City sang một tuple
 
         Returns:
             tuple: tuple tương ứng với thứ tự
-                (city_id, name, lon, lat, time_zone, country)
+                (city_id, name, lon, lat, time_zone, owm_id, country)
         """
-        return self.__city_id, self.__name, self.__lon, self.__lat, self.__time_zone, self.__country.to_tuple()
+        return (self.__city_id, self.__name, self.__lon, self.__lat, self.__time_zone,
+                self.__owm_id, self.__country.to_tuple())
     
     @staticmethod
     def from_json(source: dict) -> 'City':
         """
         Chuyển 1 đối tượng JSON sang City. Đối tượng JSON này phải 
         chứa các trường city_id, name, lon, lat, time_zone và country(một dict), 
-        các trường trống mang giá trị None.
+        các trường trống mang giá trị None. Trường owm_id có thể không có.
 
         Args:
             source (dict): Một dict lưu giữ đối tượng JSON nguồn
@@ -338,7 +428,8 @@ class City:
             lon=source['lon'],
             lat=source['lat'],
             time_zone=source['time_zone'],
-            country=Country.from_json(source['country'])
+            country=Country.from_json(source['country']),
+            owm_id=source.get('owm_id')
         )
     
     def to_json(self) -> dict:
@@ -354,5 +445,6 @@ class City:
             'lon': self.__lon,
             'lat': self.__lat,
             'time_zone': self.__time_zone,
+            'owm_id': self.__owm_id,
             'country': self.__country.to_json()
         }
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Cấu hình chung của các test: thêm thư mục dự án vào `sys.path`, ghi log ra stderr
+(không ghi vào etl_log.log) và các fixture dùng chung.
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import os
+init_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+import sys
+sys.path.insert(0, init_dir)
+
+import json
+import logging
+import threading
+
+# Phải được cấu hình trước khi import etl, logging.basicConfig trong etl.py sẽ không làm gì
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+import pytest
+import mysql.connector
+from mysql.connector import Error
+
+class FakeMySQLCursor:
+    """
+    Cursor giả lập của mysql-connector. Giống `MySQLCursorPrepared`, statement chỉ
+    được prepare lại khi câu lệnh truyền vào không phải là đối tượng đã prepare lần trước.
+    """
+
+    def __init__(self, connection: 'FakeMySQLConnection', prepared: bool = False):
+        self._connection = connection
+        self._prepared = prepared
+        self._executed = None
+        self.prepares = 0
+        self.executes = 0
+
+    def execute(self, operation: str, params: tuple = ()) -> None:
+        if self._connection.dead:
+            raise Error(msg='Lost connection to MySQL server', errno=2013)
+        if self._prepared and operation is not self._executed:
+            self.prepares += 1
+            self._executed = operation
+        self.executes += 1
+
+    def fetchone(self) -> tuple|None:
+        return None
+
+    def fetchall(self) -> list[tuple]:
+        return []
+
+    def close(self) -> None:
+        pass
+
+class FakeMySQLConnection:
+    """
+    Kết nối giả lập của mysql-connector, ghi lại số thread đang dùng kết nối cùng lúc.
+    """
+
+    _count = 0
+    _count_lock = threading.Lock()
+
+    def __init__(self, **connect_args):
+        with FakeMySQLConnection._count_lock:
+            FakeMySQLConnection._count += 1
+            self.id = FakeMySQLConnection._count
+        self.dead = False
+        self.closed = False
+        self.in_transaction = False
+        self.unread_result = False
+        self.cursors: list[FakeMySQLCursor] = []
+
+    def cursor(self, prepared: bool = False) -> FakeMySQLCursor:
+        cursor = FakeMySQLCursor(self, prepared)
+        self.cursors.append(cursor)
+        return cursor
+
+    def is_connected(self) -> bool:
+        return not self.dead and not self.closed
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        self.in_transaction = False
+
+    def close(self) -> None:
+        self.closed = True
+
+@pytest.fixture
+def fake_mysql(monkeypatch) -> list[FakeMySQLConnection]:
+    """
+    Thay `mysql.connector.connect` bằng kết nối giả lập.
+
+    Returns:
+        list[FakeMySQLConnection]: Các kết nối đã được tạo
+    """
+    connections: list[FakeMySQLConnection] = []
+
+    def connect(**connect_args) -> FakeMySQLConnection:
+        connection = FakeMySQLConnection(**connect_args)
+        connections.append(connection)
+        return connection
+
+    monkeypatch.setattr(mysql.connector, 'connect', connect)
+    return connections
+
+@pytest.fixture
+def fake_api_key(tmp_path):
+    """
+    Dùng một file cấu hình tạm thời có API Key giả, khôi phục file cấu hình cũ khi xong.
+    """
+    from common import settings
+
+    config_file = tmp_path / 'config.json'
+    config_file.write_text(json.dumps({'OPEN_WEATHER_MAP_API_KEY': 'fake-api-key'}))
+    old_manager = settings._manager
+    settings.set_config_file(str(config_file))
+    yield
+    settings._manager = old_manager
@@ -0,0 +1,72 @@
+"""
+Các test của chỉ mục thời điểm thu thập mới nhất (`weather.business.LatestCollectTimeIndex`)
+dùng để bỏ qua các trạng thái thời tiết chưa thay đổi.
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import etl
+from weather.business import LatestCollectTimeIndex
+from weather.model import WeatherStatus
+
+class _FakeWeatherStatusDAO:
+    def __init__(self, latest: dict[int, datetime]):
+        self.latest = latest
+        self.calls = 0
+
+    def get_latest_collect_times(self) -> dict[int, datetime]:
+        self.calls += 1
+        return dict(self.latest)
+
+def _status(city_id: int, hour: int) -> WeatherStatus:
+    return WeatherStatus(city_id=city_id, collect_time=datetime(2025, 1, 1, hour), temp=300.0)
+
+def test_warm_and_is_changed():
+    index = LatestCollectTimeIndex()
+    assert not index.warmed
+    assert index.warm(_FakeWeatherStatusDAO({1: datetime(2025, 1, 1, 10)})) == 1
+    assert index.warmed
+
+    assert not index.is_changed(_status(1, 9))
+    assert not index.is_changed(_status(1, 10))
+    assert index.is_changed(_status(1, 11))
+    assert index.is_changed(_status(2, 0))
+
+def test_update_only_moves_forward():
+    index = LatestCollectTimeIndex()
+    index.update(_status(1, 10))
+    index.update(_status(1, 8))
+    assert not index.is_changed(_status(1, 10))
+    assert index.is_changed(_status(1, 11))
+
+    # Dữ liệu cũ hơn từ CSDL không ghi đè dữ liệu mới hơn trong chỉ mục
+    index.warm(_FakeWeatherStatusDAO({1: datetime(2025, 1, 1, 5)}))
+    assert not index.is_changed(_status(1, 10))
+
+    index.clear()
+    assert len(index) == 0 and not index.warmed
+
+def test_concurrent_updates_keep_latest():
+    index = LatestCollectTimeIndex()
+    statuses = [_status(city_id, hour) for city_id in range(10) for hour in range(24)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(index.update, reversed(statuses)))
+    assert len(index) == 10
+    assert not any(index.is_changed(_status(city_id, 23)) for city_id in range(10))
+
+def test_etl_skips_unchanged_and_warms_once():
+    dao = _FakeWeatherStatusDAO({1: datetime(2025, 1, 1, 10)})
+    index = LatestCollectTimeIndex()
+    etl._warm_collect_time_index(index, dao)
+    etl._warm_collect_time_index(index, dao)
+    assert dao.calls == 1
+
+    statuses = [_status(1, 10), _status(1, 11), _status(2, 0)]
+    assert etl._skip_unchanged(index, statuses) == statuses[1:]
+    assert etl._skip_unchanged(None, statuses) == statuses
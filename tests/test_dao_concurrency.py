@@ -0,0 +1,47 @@
+"""
+Kiểm tra độ an toàn luồng của các weather status DAO trên CSDL thật: nhiều thread cùng
+dùng một DAO để thêm và đọc dữ liệu. Cần CSDL chạy ở địa chỉ trong cấu hình, nếu không
+kết nối được thì test bị bỏ qua.
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import pytest
+
+import benchmark
+from common.settings import get_mysql_config, get_mongodb_config
+
+def _mysql_available() -> bool:
+    import mysql.connector
+    config = get_mysql_config()
+    try:
+        mysql.connector.connect(host=config['host'], database=config['db'], user=config['user'],
+                                password=config['password'], connection_timeout=2).close()
+        return True
+    except Exception:
+        return False
+
+def _mongodb_available() -> bool:
+    from pymongo import MongoClient
+    config = get_mongodb_config()
+    client = MongoClient(config['host'], config['port'], serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command('ping')
+        return True
+    except Exception:
+        return False
+    finally:
+        client.close()
+
+@pytest.mark.parametrize('dbms, available', [('MySQL', _mysql_available), ('MongoDB', _mongodb_available)])
+def test_concurrent_inserts_and_reads_on_one_dao(dbms, available):
+    if not available():
+        pytest.skip(f'{dbms} is not reachable at the configured address')
+
+    result = benchmark.bench_dao_stress(dbms=dbms, n_calls=200, max_workers=16)
+
+    assert result['errors'] == 0
+    assert result['stored'] == result['inserted'] == 100
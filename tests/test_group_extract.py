@@ -0,0 +1,119 @@
+"""
+Các test của chế độ extract theo nhóm (API group): các nhóm được request dần, các thành phố
+thuộc nhóm bị lỗi chỉ được extract lại dữ liệu Current Weather. Các request tới Open Weather Map
+được thay bằng các hàm giả lập.
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import threading
+
+import pytest
+
+import etl
+import weather.business as weather_business
+from place.model import City
+
+class _FakeOpenWeatherMap:
+    """
+    Giả lập các API của Open Weather Map, ghi lại các request đã gửi.
+    """
+
+    def __init__(self, failed_groups: set[int] = frozenset()):
+        self.failed_groups = failed_groups
+        self.group_requests: list[list[int]] = []
+        self.air_requests: list[float] = []
+        self.weather_requests: list[float] = []
+        self._lock = threading.Lock()
+
+    def group(self, owm_ids: list[int]) -> list[dict]:
+        with self._lock:
+            index = len(self.group_requests)
+            self.group_requests.append(list(owm_ids))
+        if index in self.failed_groups:
+            raise RuntimeError('boom')
+        return [{'id': owm_id, 'source': 'group'} for owm_id in owm_ids]
+
+    def air(self, lon: float, lat: float) -> dict:
+        with self._lock:
+            self.air_requests.append(lat)
+        return {'lat': lat}
+
+    def weather(self, lon: float, lat: float) -> dict:
+        with self._lock:
+            self.weather_requests.append(lat)
+        return {'id': 10_000 + int(lat), 'source': 'single'}
+
+class _FakeCityDAO:
+    def __init__(self):
+        self.inserted: list[City] = []
+
+    def insert(self, city: City) -> None:
+        self.inserted.append(city)
+
+@pytest.fixture
+def owm(monkeypatch) -> _FakeOpenWeatherMap:
+    fake = _FakeOpenWeatherMap()
+    monkeypatch.setattr(weather_business, 'extract_group_weather', fake.group)
+    monkeypatch.setattr(weather_business, 'extract_air_pollution', fake.air)
+    monkeypatch.setattr(etl, 'extract_weather', fake.weather)
+    monkeypatch.setattr(etl, 'extract_from_open_weather',
+                        lambda lon, lat: {'weather': fake.weather(lon, lat), 'air': fake.air(lon, lat)})
+    old_cache = weather_business.set_response_cache(None)
+    yield fake
+    weather_business.set_response_cache(old_cache)
+
+def _cities(n: int, owm_id_start: int|None = 1000) -> list[City]:
+    return [City(city_id=i, name=f'City {i}', lon=105.0, lat=float(i), time_zone=7,
+                 owm_id=None if owm_id_start is None else owm_id_start + i)
+            for i in range(1, n + 1)]
+
+def test_failed_group_only_refetches_current_weather(owm):
+    owm.failed_groups = {1}
+    cities = _cities(45)
+
+    json_datas = etl._extract_all_group(cities, _FakeCityDAO(), max_workers=4)
+
+    assert sorted(json_data['city'].city_id for json_data in json_datas) == list(range(1, 46))
+    assert [len(owm_ids) for owm_ids in owm.group_requests] == [20, 20, 5]
+    # Air Pollution được lấy đúng một lần cho mỗi thành phố, kể cả thành phố thuộc nhóm lỗi
+    assert sorted(owm.air_requests) == [float(i) for i in range(1, 46)]
+    assert sorted(owm.weather_requests) == [float(i) for i in range(21, 41)]
+    for json_data in json_datas:
+        city = json_data['city']
+        assert json_data['data']['air'] == {'lat': city.lat}
+        assert json_data['data']['weather']['source'] == ('single' if 21 <= city.city_id <= 40 else 'group')
+
+def test_cities_sharing_owm_id_are_requested_once(owm):
+    cities = _cities(3)
+    cities[2].owm_id = cities[1].owm_id
+
+    results = weather_business.extract_group_from_open_weather(cities)
+
+    assert owm.group_requests == [[1001, 1002]]
+    assert set(results) == {1, 2, 3}
+    assert results[3]['weather'] == results[2]['weather']
+
+def test_group_mode_streams_a_bounded_number_of_groups(owm):
+    cities = _cities(100)
+
+    results = weather_business.iter_extract_group_from_open_weather(cities, max_pending_groups=2)
+    next(results)
+    assert len(owm.group_requests) <= 2
+    assert len(list(results)) == 99
+    assert len(owm.group_requests) == 5
+
+def test_cities_without_owm_id_are_extracted_alone_and_saved(owm):
+    city_dao = _FakeCityDAO()
+    cities = _cities(2) + _cities(1, owm_id_start=None)
+    cities[2].city_id = 3
+
+    json_datas = etl._extract_all_group(cities, city_dao, max_workers=1)
+
+    assert len(json_datas) == 3
+    assert owm.group_requests == [[1001, 1002]]
+    assert [city.city_id for city in city_dao.inserted] == [3]
+    assert city_dao.inserted[0].owm_id == 10_001
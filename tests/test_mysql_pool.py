@@ -0,0 +1,117 @@
+"""
+Các test của pool kết nối MySQL (`common.dao.MySQLConnectionPool`) và cách các DAO
+mượn/trả kết nối, dùng kết nối giả lập (không cần CSDL).
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import common.dao as common_dao
+from common.dao import MySQLConnectionPool, DAOException
+from place.dao import MySQLCityDAO
+
+def _pool(size: int = 2, **options) -> MySQLConnectionPool:
+    return MySQLConnectionPool('test', 'localhost', 'db', 'user', 'password', size=size, **options)
+
+def test_connections_are_created_lazily_and_reused(fake_mysql):
+    pool = _pool()
+    assert fake_mysql == []
+
+    connection = pool.acquire()
+    pool.release(connection)
+    assert pool.acquire() is connection
+    assert len(fake_mysql) == 1
+
+def test_release_rolls_back_open_transaction(fake_mysql):
+    pool = _pool()
+    connection = pool.acquire()
+    connection.in_transaction = True
+    pool.release(connection)
+    assert not connection.in_transaction
+    assert pool.idle_count == 1
+
+def test_failed_dead_connection_is_discarded(fake_mysql):
+    pool = _pool()
+    connection = pool.acquire()
+    connection.dead = True
+    pool.mark_failed(connection)
+    pool.release(connection)
+
+    assert pool.idle_count == 0
+    assert connection.closed
+    assert pool.acquire() is not connection
+
+def test_failed_live_connection_is_kept(fake_mysql):
+    pool = _pool()
+    connection = pool.acquire()
+    pool.mark_failed(connection)
+    pool.release(connection)
+
+    assert pool.idle_count == 1
+    assert pool.acquire() is connection
+
+def test_checkout_times_out_when_pool_is_exhausted(fake_mysql):
+    pool = _pool(size=1, checkout_timeout=0.05)
+    connection = pool.acquire()
+    with pytest.raises(DAOException):
+        pool.acquire()
+    pool.release(connection)
+    pool.release(pool.acquire())
+
+def test_closed_pool_refuses_checkout_and_closes_returned_connections(fake_mysql):
+    pool = _pool()
+    connection = pool.acquire()
+    pool.close()
+    with pytest.raises(DAOException):
+        pool.acquire()
+    pool.release(connection)
+    assert connection.closed
+
+def test_dao_drops_connection_broken_during_operation(fake_mysql, monkeypatch):
+    # Pool riêng của test, không dùng các pool dùng chung của tiến trình
+    monkeypatch.setattr(common_dao, '_mysql_pools', {})
+    dao = MySQLCityDAO('localhost', 'db', 'user', 'password')
+    connection = dao._pool.acquire()
+    dao._pool.release(connection)
+    connection.dead = True
+
+    with pytest.raises(DAOException):
+        dao.get(1)
+    assert dao._pool.idle_count == 0
+    dao._pool.close()
+
+def test_concurrent_checkouts_never_share_a_connection(fake_mysql):
+    size = 4
+    pool = _pool(size=size)
+    lock = threading.Lock()
+    in_use: set[int] = set()
+    violations: list[str] = []
+    peak = [0]
+
+    def work(index: int) -> None:
+        with pool.connection() as connection:
+            with lock:
+                if connection.id in in_use:
+                    violations.append(f'connection {connection.id} shared')
+                in_use.add(connection.id)
+                peak[0] = max(peak[0], len(in_use))
+            # Thỉnh thoảng có thao tác lỗi trên kết nối còn sống
+            if index % 7 == 0:
+                pool.mark_failed(connection)
+            with lock:
+                in_use.discard(connection.id)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(work, range(800)))
+
+    assert violations == []
+    assert peak[0] <= size
+    assert len(fake_mysql) <= size
+    assert pool.idle_count == len(fake_mysql)
@@ -0,0 +1,43 @@
+"""
+Các test của `common.dao.PreparedStatementCursor`: mỗi câu lệnh chỉ được prepare một lần
+trên mỗi kết nối, kể cả khi câu lệnh được truyền vào là một chuỗi mới có cùng nội dung.
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+from common.dao import PreparedStatementCursor
+from db.sql_reader import get_query_registry
+from conftest import FakeMySQLConnection
+
+def _query(table: str) -> str:
+    # Tạo một đối tượng chuỗi mới mỗi lần gọi, giống như câu lệnh được đọc lại từ file
+    return ''.join(['SELECT * FROM ', table, ' WHERE id = %s'])
+
+def test_statement_is_prepared_once_per_connection():
+    connection = FakeMySQLConnection()
+    registry = get_query_registry()
+    start = registry.stats()
+
+    for _ in range(5):
+        cursor = PreparedStatementCursor(connection)
+        cursor.execute(_query('city'), (1, ))
+        cursor.execute(_query('country'), ('VN', ))
+        cursor.close()
+
+    assert len(connection.cursors) == 2
+    assert [cursor.prepares for cursor in connection.cursors] == [1, 1]
+    assert [cursor.executes for cursor in connection.cursors] == [5, 5]
+    stats = registry.stats()
+    assert stats['prepares'] - start['prepares'] == 2
+    assert stats['executes'] - start['executes'] == 10
+
+def test_statements_are_prepared_separately_on_each_connection():
+    connections = [FakeMySQLConnection(), FakeMySQLConnection()]
+    for connection in connections:
+        for _ in range(3):
+            PreparedStatementCursor(connection).execute(_query('city'), (1, ))
+
+    assert [[cursor.prepares for cursor in connection.cursors] for connection in connections] == [[1], [1]]
@@ -0,0 +1,80 @@
+"""
+Các test của cách tạo nhanh trạng thái thời tiết từ dữ liệu CSDL (`WeatherStatus._from_db_row`)
+và của batch theo cột (`WeatherStatusBatch`).
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from weather.model import WeatherStatus, WeatherStatusBatch, GeneralWeather
+
+def _status(city_id: int = 1, **fields) -> WeatherStatus:
+    values = dict(
+        city_id=city_id, collect_time=datetime(2025, 2, 6, 9, 7, 0), temp=284.2, feels_temp=282.93,
+        pressure=1021, humidity=60, sea_level=1021, grnd_level=910, visibility=10000,
+        wind_speed=4.09, wind_deg=121, wind_gust=3.47, clouds_all=83, rain=2.73,
+        sunrise=datetime(2025, 2, 6, 6, 30, 0), sunset=datetime(2025, 2, 6, 18, 0, 0),
+        aqi=3, pm2_5=35.52, general_weathers=[GeneralWeather.of(500, 'light rain'), GeneralWeather.of(804)]
+    )
+    values.update(fields)
+    return WeatherStatus(**values)
+
+def test_from_db_row_matches_from_tuple():
+    status = _status()
+    row = tuple(Decimal(str(value)) if isinstance(value, float) else value
+                for value in status.to_tuple()[:18])
+    general_weathers = list(status.general_weathers)
+
+    fast = WeatherStatus._from_db_row(row, general_weathers)
+    checked = WeatherStatus.from_tuple(row + ([general_weather.to_tuple() for general_weather in general_weathers], ))
+
+    assert fast.to_tuple() == checked.to_tuple() == status.to_tuple()
+    assert isinstance(fast.temp, float)
+
+def test_batch_round_trip_keeps_values_nulls_and_conditions():
+    statuses = [_status(1), _status(2, rain=None, sunrise=None, aqi=None, general_weathers=[]),
+                _status(3, collect_time=datetime(1969, 12, 31, 23, 59, 59))]
+    batch = WeatherStatusBatch(statuses)
+
+    assert len(batch) == 3
+    assert batch.null_mask('collect_time') is None
+    assert list(batch.null_mask('rain')) == [0, 1, 0]
+    assert list(batch.condition_ids(0)) == [500, 804]
+    assert list(batch.condition_ids(1)) == []
+
+    round_trip = batch.to_weather_statuses()
+    assert [status.to_tuple()[:18] for status in round_trip] == [status.to_tuple()[:18] for status in statuses]
+    assert [general_weather.status_id for general_weather in round_trip[0].general_weathers] == [500, 804]
+    # Các diễn giải được lấy lại từ cache dùng chung
+    assert all(general_weather.description for general_weather in round_trip[0].general_weathers)
+
+def test_batch_time_columns_are_naive_wall_clock_seconds():
+    batch = WeatherStatusBatch([_status(collect_time=datetime(1970, 1, 2, 0, 0, 1))])
+    assert list(batch.column('collect_time')) == [86401]
+
+def test_batch_rejects_timezone_aware_datetimes():
+    status = WeatherStatus._from_db_row(
+        _status().to_tuple()[:1] + (datetime(2025, 2, 6, tzinfo=timezone.utc), ) + _status().to_tuple()[2:18], []
+    )
+    with pytest.raises(ValueError):
+        WeatherStatusBatch([status])
+
+def test_batch_database_params():
+    statuses = [_status(1), _status(2, general_weathers=[GeneralWeather.of(800)])]
+    status_rows, key_rows, condition_rows = WeatherStatusBatch(statuses).to_mysql_params()
+
+    assert status_rows == [status.to_tuple()[:18] for status in statuses]
+    assert key_rows == [(1, statuses[0].collect_time), (2, statuses[1].collect_time)]
+    assert condition_rows == [(1, statuses[0].collect_time, 500), (1, statuses[0].collect_time, 804),
+                              (2, statuses[1].collect_time, 800)]
+
+    documents = WeatherStatusBatch(statuses).to_mongo_documents()
+    assert documents[1]['general_weathers'] == [{'status_id': 800}]
+    assert documents[0]['collect_time'] == statuses[0].collect_time
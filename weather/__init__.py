@@ -1,3 +1,3 @@
-from . import model, dao, business, api
+from . import model, cache, dao, business, api
 
-__all__ = ['model', 'dao', 'business', 'api']
\ No newline at end of file
+__all__ = ['model', 'cache', 'dao', 'business', 'api']
\ No newline at end of file
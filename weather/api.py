@@ -7,19 +7,16 @@ from typing import Literal
 
 import weather.dao as weather_dao
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 
 weather_bp = Blueprint('weather_bp', __name__)
 
+# Các DAO dùng chung được tạo một lần bởi DAOProvider của ứng dụng (xem app.py)
 def get_gen_weather_dao(type: Literal['MySQL', 'MongoDB'] = 'MongoDB') -> weather_dao.BasicGeneralWeatherDAO:
-    if type == 'MySQL':
-        return weather_dao.MySQLGeneralWeatherDAO('localhost', 'weather_vietnam', 'root', 'Asensio1234@')
-    return weather_dao.MongoDBGeneralWeatherDAO('localhost', 27017, 'weather_vietnam')
+    return current_app.extensions['dao_provider'].get('general_weather', 'MySQL' if type == 'MySQL' else 'MongoDB')
 
 def get_weather_status_dao(type: Literal['MySQL', 'MongoDB'] = 'MongoDB') -> weather_dao.BasicWeatherStatusDAO:
-    if type == 'MySQL':
-        return weather_dao.MySQLWeatherStatusDAO('localhost', 'weather_vietnam', 'root', 'Asensio1234@')
-    return weather_dao.MongoDBWeatherStatusDAO('localhost', 27017, 'weather_vietnam')
+    return current_app.extensions['dao_provider'].get('weather_status', 'MySQL' if type == 'MySQL' else 'MongoDB')
 
 @weather_bp.route('/weather/general_status', methods=['GET'])
 def get_general_weathers():
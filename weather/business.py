@@ -13,76 +13,458 @@ init_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 import sys
 sys.path.append(init_dir)
 
-from typing import List, Literal
+from typing import Dict, Iterator, List, Literal
 from datetime import datetime
 
-from weather.model import WeatherStatus, GeneralWeather
+from weather.model import WeatherStatus, WeatherStatusBatch, GeneralWeather
 from weather.dao import BasicGeneralWeatherDAO, BasicWeatherStatusDAO
+from weather.cache import get_general_weather_cache
+from place.model import City
+from common.http_client import get_client
+from common.settings import get_api_key
+from common.response_cache import BasicResponseCache, MemoryResponseCache
 
-import requests
-import json
+import asyncio
+import aiohttp
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+WEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
+AIR_BASE_URL = "https://api.openweathermap.org/data/2.5/air_pollution"
+GROUP_BASE_URL = "https://api.openweathermap.org/data/2.5/group"
+
+# Số thành phố tối đa trong 1 request của API group
+GROUP_MAX_SIZE = 20
+
+# Số thread của thread pool dùng chung gửi các request song song (Air Pollution, group),
+# các request này chạy cùng lúc với các request của các thread extract
+OWM_EXECUTOR_WORKERS = 16
+
+_executor: ThreadPoolExecutor|None = None
+_executor_lock = threading.Lock()
+
+# Response cache dùng chung của tiến trình, None nếu không dùng cache
+_response_cache: BasicResponseCache|None = None
+
+def get_response_cache() -> BasicResponseCache|None:
+    """
+    Lấy response cache đang được dùng cho các request tới Open Weather Map.
+
+    Returns:
+        BasicResponseCache | None: Response cache hiện tại, None nếu không dùng cache
+    """
+    return _response_cache
+
+def set_response_cache(cache: BasicResponseCache|None) -> BasicResponseCache|None:
+    """
+    Thay thế response cache dùng cho các request tới Open Weather Map.
+
+    Args:
+        cache (BasicResponseCache | None): Cache mới, None để không dùng cache
+
+    Returns:
+        BasicResponseCache | None: Cache trước đó
+    """
+    global _response_cache
+    old_cache = _response_cache
+    _response_cache = cache
+    return old_cache
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Lấy thread pool dùng chung để gửi các request tới Open Weather Map song song
+    (ví dụ request Air Pollution song song với request Current Weather).
+
+    Returns:
+        ThreadPoolExecutor: Thread pool dùng chung
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=OWM_EXECUTOR_WORKERS, thread_name_prefix='owm')
+        return _executor
+
+def _get_params(lon: float, lat: float) -> dict:
+    """
+    Tạo tham số chung cho các request tới Open Weather Map.
+
+    Args:
+        lon (float): Kinh độ của thành phố
+        lat (float): Vĩ độ của thành phố
+
+    Returns:
+        dict: Các tham số của request
+    """
+    return {
+        'lat': lat,
+        'lon': lon,
+        'appid': get_api_key()
+    }
+
+def _cached_get_json(endpoint: str, url: str, lon: float, lat: float) -> dict:
+    """
+    Lấy response của một API theo tọa độ, ưu tiên lấy từ response cache (nếu có)
+    và chỉ gửi request khi cache không có hoặc đã hết hạn.
+
+    Args:
+        endpoint (str): Tên của endpoint, dùng làm một phần của khóa cache
+        url (str): URL của API
+        lon (float): Kinh độ
+        lat (float): Vĩ độ
+
+    Returns:
+        dict: Response dạng JSON
+    """
+    cache = _response_cache
+    if cache is not None:
+        cached_response = cache.get(endpoint, lat, lon)
+        if cached_response is not None:
+            return cached_response
+    response = get_client().get_json(url, params=_get_params(lon, lat))
+    if cache is not None:
+        cache.set(endpoint, lat, lon, response)
+    return response
+
+def extract_weather(lon: float, lat: float) -> dict:
+    """
+    Extract dữ liệu Current Weather của một tọa độ.
+
+    Args:
+        lon (float): Kinh độ của thành phố
+        lat (float): Vĩ độ của thành phố
+
+    Returns:
+        dict: Response của API Current Weather
+    """
+    return _cached_get_json('weather', WEATHER_BASE_URL, lon, lat)
+
+def extract_air_pollution(lon: float, lat: float) -> dict:
+    """
+    Extract dữ liệu Air Pollution của một tọa độ.
+
+    Args:
+        lon (float): Kinh độ của thành phố
+        lat (float): Vĩ độ của thành phố
+
+    Returns:
+        dict: Response của API Air Pollution
+    """
+    return _cached_get_json('air_pollution', AIR_BASE_URL, lon, lat)
 
 def extract_from_open_weather(lon: float, lat: float) -> dict:
     """
     Extract dữ liệu thời tiết từ API của Open Weathep Map.
     Sẽ sử dụng 2 API, một API về Current Weather, một API
-    về Air Pollution.
+    về Air Pollution. Hai API được gọi đồng thời.
+    
+    Dữ liệu Current Weather là bắt buộc, còn nếu chỉ API Air Pollution bị lỗi
+    thì vẫn giữ lại dữ liệu Current Weather và `air` sẽ là None.
+    
+    Nếu có response cache (xem `set_response_cache`) thì các response còn hạn
+    trong cache sẽ được dùng lại mà không gửi request.
 
     Args:
         lon (float): Kinh độ của thành phố
         lat (float): Vĩ độ của thành phố
+        
+    Raises:
+        Exception: Nếu việc lấy dữ liệu Current Weather bị lỗi.
 
     Returns:
         dict: Một dict có 2 key là `weather` và `air`, lưu giữ lần lượt
         các response của 2 API kể trên
     """
-    # Mở file cấu hình và lấy API Key
-    config_dir = os.path.join(init_dir, 'config.json')
-    with open(config_dir, 'r') as config_file:
-        config = json.load(config_file)
-    api_key = config['OPEN_WEATHER_MAP_API_KEY']
+    # Gửi request Air Pollution sang thread pool, request Current Weather thực hiện ngay tại đây
+    air_future = _get_executor().submit(extract_air_pollution, lon, lat)
+    try:
+        weather_response = extract_weather(lon, lat)
+    except Exception:
+        air_future.cancel()
+        raise
+    
+    try:
+        air_response = air_future.result()
+    except Exception as e:
+        logging.warning(f'Failed to extracting air pollution data at ({lon}, {lat}): {e}')
+        air_response = None
     
-    # Set tham số cho request
+    # Tổng hợp kết quả
+    response = {
+        'weather': weather_response,
+        'air': air_response
+    }
+    return response
+
+def extract_group_weather(owm_ids: list[int]) -> list[dict]:
+    """
+    Extract dữ liệu Current Weather của nhiều thành phố trong 1 request, dùng API group.
+
+    Args:
+        owm_ids (list[int]): Mã định danh trên Open Weather Map của các thành phố
+            (tối đa `GROUP_MAX_SIZE`)
+
+    Raises:
+        ValueError: Nếu số thành phố vượt quá `GROUP_MAX_SIZE`.
+
+    Returns:
+        list[dict]: Danh sách các response Current Weather, mỗi phần tử có cùng dạng
+            với response của API Current Weather
+    """
+    if len(owm_ids) > GROUP_MAX_SIZE:
+        raise ValueError(f"Group request supports at most {GROUP_MAX_SIZE} cities!")
+    params = {
+        'id': ','.join(str(owm_id) for owm_id in owm_ids),
+        'appid': get_api_key()
+    }
+    return get_client().get_json(GROUP_BASE_URL, params=params)['list']
+
+def _submit_group(cities: list[City], owm_ids: list[int]) -> tuple[Future|None, Dict[int, Future]]:
+    """
+    Gửi đồng thời request group của một nhóm thành phố và các request Air Pollution
+    của các thành phố đó.
+
+    Args:
+        cities (list[City]): Các thành phố của nhóm
+        owm_ids (list[int]): Các `owm_id` cần request group, rỗng nếu cả nhóm đã có
+            dữ liệu Current Weather trong cache
+
+    Returns:
+        tuple[Future | None, Dict[int, Future]]: Future của request group (None nếu không cần)
+            và các future Air Pollution theo `city_id`
+    """
+    executor = _get_executor()
+    group_future = executor.submit(extract_group_weather, owm_ids) if owm_ids else None
+    air_futures = {city.city_id: executor.submit(extract_air_pollution, city.lon, city.lat)
+                   for city in cities}
+    return group_future, air_futures
+
+def iter_extract_group_from_open_weather(cities: list[City],
+                                         max_pending_groups: int|None = 2) -> Iterator[tuple[City, dict]]:
+    """
+    Extract dữ liệu thời tiết của nhiều thành phố và trả về dần kết quả của từng nhóm.
+    Dữ liệu Current Weather được lấy theo nhóm `GROUP_MAX_SIZE` thành phố mỗi request,
+    còn dữ liệu Air Pollution vẫn được lấy riêng cho từng thành phố. Chỉ có tối đa
+    `max_pending_groups` nhóm được request cùng lúc nên bộ nhớ không tăng theo số thành phố.
+    
+    Các thành phố có response còn hạn trong response cache sẽ không được request lại.
+    Nếu một nhóm bị lỗi thì `weather` của các thành phố trong nhóm đó là None (dữ liệu
+    Air Pollution đã lấy vẫn được giữ lại), các nhóm khác không bị ảnh hưởng. Nếu chỉ
+    dữ liệu Air Pollution của một thành phố bị lỗi thì `air` của thành phố đó là None.
+
+    Args:
+        cities (list[City]): Các thành phố cần lấy dữ liệu, phải có `owm_id`
+        max_pending_groups (int | None, optional): Số nhóm tối đa được request cùng lúc,
+            None để request tất cả các nhóm cùng lúc. Defaults to 2.
+
+    Yields:
+        Iterator[tuple[City, dict]]: Thành phố và một dict có 2 key là `weather` và `air`
+            giống như kết quả của `extract_from_open_weather`, theo thứ tự các nhóm
+    """
+    cache = _response_cache
+    
+    # Các thành phố đã có dữ liệu Current Weather trong cache thì không cần request group.
+    # Nhiều thành phố có thể có cùng owm_id, khi đó owm_id chỉ được request một lần
+    cached_cities: list[tuple[City, dict]] = []
+    cities_by_owm_id: Dict[int, list[City]] = {}
+    for city in cities:
+        cached_response = cache.get('weather', city.lat, city.lon) if cache is not None else None
+        if cached_response is not None:
+            cached_cities.append((city, cached_response))
+        else:
+            cities_by_owm_id.setdefault(city.owm_id, []).append(city)
+    owm_ids = list(cities_by_owm_id.keys())
+    
+    # Mỗi nhóm gồm các owm_id cần request và các thành phố ứng với chúng
+    groups: list[tuple[list[int], list[City]]] = [
+        ([], [city for city, _ in cached_cities[i:i + GROUP_MAX_SIZE]])
+        for i in range(0, len(cached_cities), GROUP_MAX_SIZE)
+    ]
+    for i in range(0, len(owm_ids), GROUP_MAX_SIZE):
+        group_owm_ids = owm_ids[i:i + GROUP_MAX_SIZE]
+        groups.append((group_owm_ids, [city for owm_id in group_owm_ids for city in cities_by_owm_id[owm_id]]))
+    cached_responses = {city.city_id: response for city, response in cached_cities}
+    
+    group_iter = iter(groups)
+    pending: deque = deque()
+    while True:
+        # Giữ số nhóm đang được request không vượt quá max_pending_groups
+        while max_pending_groups is None or len(pending) < max_pending_groups:
+            group = next(group_iter, None)
+            if group is None:
+                break
+            pending.append((group[1], *_submit_group(group[1], group[0])))
+        if not pending:
+            return
+        group_cities, group_future, air_futures = pending.popleft()
+        
+        # Ánh xạ các phần tử trong response group về các thành phố tương ứng
+        weather_responses: Dict[int, dict] = {}
+        if group_future is not None:
+            try:
+                for item in group_future.result():
+                    for city in cities_by_owm_id.get(item['id'], []):
+                        weather_responses[city.city_id] = item
+                        if cache is not None:
+                            cache.set('weather', city.lat, city.lon, item)
+            except Exception as e:
+                logging.error(f'Failed to extracting group weather data: {e}')
+        
+        for city in group_cities:
+            try:
+                air_response = air_futures[city.city_id].result()
+            except Exception as e:
+                logging.warning(f'Failed to extracting air pollution data of city with id {city.city_id}: {e}')
+                air_response = None
+            yield city, {
+                'weather': weather_responses.get(city.city_id, cached_responses.get(city.city_id)),
+                'air': air_response
+            }
+
+def extract_group_from_open_weather(cities: list[City]) -> Dict[int, dict]:
+    """
+    Extract dữ liệu thời tiết của nhiều thành phố theo nhóm như
+    `iter_extract_group_from_open_weather`, tất cả các nhóm được request đồng thời.
+
+    Args:
+        cities (list[City]): Các thành phố cần lấy dữ liệu, phải có `owm_id`
+
+    Returns:
+        Dict[int, dict]: Một dict với key là `city_id` (có đủ các thành phố), value là một dict
+            có 2 key là `weather` và `air` giống như kết quả của `extract_from_open_weather`
+    """
+    return {city.city_id: response
+            for city, response in iter_extract_group_from_open_weather(cities, max_pending_groups=None)}
+
+async def _async_get_json(session: aiohttp.ClientSession, url: str, params: dict,
+                          semaphore: asyncio.Semaphore|None = None) -> dict:
+    """
+    Gửi một GET request bất đồng bộ và trả về response dạng JSON. Nếu có
+    semaphore thì request chỉ được gửi khi lấy được semaphore.
+    
+    Request dùng chung quota và bộ giới hạn số request đồng thời với HTTP client
+    của tiến trình, các response 429/5xx sẽ được thử lại giống như `HTTPClient.get_json`.
+
+    Args:
+        session (aiohttp.ClientSession): Session dùng để gửi request
+        url (str): URL cần lấy dữ liệu
+        params (dict): Các tham số của request
+        semaphore (asyncio.Semaphore | None, optional): Semaphore giới hạn số
+            request đồng thời. Defaults to None.
+
+    Returns:
+        dict: Response dạng JSON
+    """
+    client = get_client()
+    attempt = 0
+    while True:
+        if client.rate_limiter is not None:
+            await client.rate_limiter.async_acquire()
+        if semaphore is not None:
+            await semaphore.acquire()
+        if client.concurrency_limiter is not None:
+            await client.concurrency_limiter.async_acquire()
+        healthy = False
+        try:
+            async with session.get(url, params=params) as response:
+                healthy = not client.is_retry_status(response.status)
+                if healthy or attempt == client.max_retries:
+                    response.raise_for_status()
+                    return await response.json()
+                delay = client.retry_delay(attempt, response.headers.get('Retry-After'))
+        finally:
+            if client.concurrency_limiter is not None:
+                client.concurrency_limiter.release(healthy)
+            if semaphore is not None:
+                semaphore.release()
+        logging.warning(f'{url} responded {response.status}, retrying in {delay:.2f}s...')
+        await asyncio.sleep(delay)
+        attempt += 1
+
+async def async_extract_from_open_weather(session: aiohttp.ClientSession,
+                                          lon: float, lat: float,
+                                          semaphore: asyncio.Semaphore|None = None,
+                                          api_key: str|None = None) -> dict:
+    """
+    Phiên bản bất đồng bộ của `extract_from_open_weather`. Hai request Current
+    Weather và Air Pollution được gửi đồng thời trên cùng event loop. Nếu chỉ
+    request Air Pollution bị lỗi thì `air` sẽ là None. Response cache (nếu có)
+    được dùng giống như `extract_from_open_weather`, các thao tác với cache không nằm
+    trong bộ nhớ (ví dụ `DiskResponseCache`) được chạy trong thread riêng để không
+    chặn event loop.
+
+    Args:
+        session (aiohttp.ClientSession): Session dùng để gửi request
+        lon (float): Kinh độ của thành phố
+        lat (float): Vĩ độ của thành phố
+        semaphore (asyncio.Semaphore | None, optional): Semaphore giới hạn số
+            request đồng thời. Defaults to None.
+        api_key (str | None, optional): API Key, nếu là None thì sẽ lấy từ
+            cấu hình của ứng dụng. Defaults to None.
+
+    Returns:
+        dict: Một dict có 2 key là `weather` và `air`, giống như `extract_from_open_weather`
+    """
     params = {
         'lat': lat,
         'lon': lon,
-        'appid': api_key
+        'appid': api_key if api_key is not None else get_api_key()
     }
+    cache = _response_cache
+    blocking_cache = cache is not None and not isinstance(cache, MemoryResponseCache)
     
-    # Thực hiện lấy dữ liệu Current Weather
-    weather_base_url = "https://api.openweathermap.org/data/2.5/weather"
-    weather_response = requests.get(weather_base_url, params=params).json()
+    async def call_cache(method, *args):
+        if blocking_cache:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
     
-    # Thực hiện lấy dữ liệu Air Pollution
-    air_base_url = "https://api.openweathermap.org/data/2.5/air_pollution"
-    air_response = requests.get(air_base_url, params=params).json()
+    async def get_json(endpoint: str, url: str) -> dict:
+        if cache is not None:
+            cached_response = await call_cache(cache.get, endpoint, lat, lon)
+            if cached_response is not None:
+                return cached_response
+        response = await _async_get_json(session, url, params, semaphore)
+        if cache is not None:
+            await call_cache(cache.set, endpoint, lat, lon, response)
+        return response
     
-    # Tổng hợp kết quả
-    response = {
+    weather_response, air_response = await asyncio.gather(
+        get_json('weather', WEATHER_BASE_URL),
+        get_json('air_pollution', AIR_BASE_URL),
+        return_exceptions=True
+    )
+    if isinstance(weather_response, BaseException):
+        raise weather_response
+    if isinstance(air_response, BaseException):
+        logging.warning(f'Failed to extracting air pollution data at ({lon}, {lat}): {air_response}')
+        air_response = None
+    return {
         'weather': weather_response,
         'air': air_response
     }
-    return response
 
 def transform(json_data: dict, city_id: int) -> WeatherStatus:
     """
     Chuyển đổi response dạng JSON về model có thể thao tác với CSDL
 
     Args:
-        json_data (dict): Response thu được từ API, có dạng JSON
+        json_data (dict): Response thu được từ API, có dạng JSON. Giá trị của key `air`
+            có thể là None, khi đó aqi và pm2_5 sẽ là None.
         city_id (int): Mã định danh của thành phố mà tại đó thu thập dữ liệu này
 
     Returns:
         WeatherStatus: Đối tượng model đại diện cho trạng thái thời tiết của thành phố
     """
-    # Lấy từng thành phần
+    # Lấy từng thành phần, dữ liệu Air Pollution có thể không có
     weather_data = json_data['weather']
     air_data = json_data['air']
+    air_item = air_data['list'][0] if air_data else None
     
     # Lấy riêng các trạng thái thời tiết
     general_weathers: List[GeneralWeather] = []
     for item in weather_data['weather']:
-        general_weathers.append(GeneralWeather(status_id=item['id']))
+        general_weathers.append(GeneralWeather.of(status_id=item['id']))
     
     # Ánh xạ mỗi trường trong response tới các thuộc tính của model
     return WeatherStatus(
@@ -102,8 +484,8 @@ def transform(json_data: dict, city_id: int) -> WeatherStatus:
         rain=weather_data['rain']['1h'] if 'rain' in weather_data else None,
         sunrise=datetime.fromtimestamp(weather_data['sys']['sunrise']),
         sunset=datetime.fromtimestamp(weather_data['sys']['sunset']),
-        aqi=air_data['list'][0]['main']['aqi'],
-        pm2_5=air_data['list'][0]['components']['pm2_5'],
+        aqi=air_item['main']['aqi'] if air_item is not None else None,
+        pm2_5=air_item['components']['pm2_5'] if air_item is not None else None,
         general_weathers=general_weathers
     )
     
@@ -118,6 +500,91 @@ def load(weather_status_dao: BasicWeatherStatusDAO,
     """
     weather_status_dao.insert(new_weather_status)
 
+def load_many(weather_status_dao: BasicWeatherStatusDAO,
+              new_weather_statuses: list[WeatherStatus]|WeatherStatusBatch) -> None:
+    """
+    Load nhiều trạng thái thời tiết vào trong CSDL trong một lần ghi
+
+    Args:
+        weather_status_dao (BasicWeatherStatusDAO): Một DAO có thể thao tác với CSDL các trạng thái thời tiết
+        new_weather_statuses (list[WeatherStatus] | WeatherStatusBatch): Các trạng thái thời tiết mới
+            cần được thêm vào, có thể là một batch lưu theo cột
+    """
+    weather_status_dao.insert_many(new_weather_statuses)
+
+class LatestCollectTimeIndex:
+    """
+    Chỉ mục thời điểm thu thập mới nhất đã được lưu vào CSDL của mỗi thành phố,
+    dùng để bỏ qua các trạng thái thời tiết chưa thay đổi (Open Weather Map chưa
+    cập nhật) trước khi load. Có thể dùng chung giữa nhiều thread.
+    """
+
+    def __init__(self):
+        """
+        Khởi tạo một chỉ mục rỗng, cần gọi `warm` để lấy dữ liệu từ CSDL.
+        """
+        self._latest: Dict[int, datetime] = {}
+        self._warmed = False
+        self._lock = threading.Lock()
+
+    @property
+    def warmed(self) -> bool:
+        return self._warmed
+
+    def warm(self, weather_status_dao: BasicWeatherStatusDAO) -> int:
+        """
+        Lấy thời điểm thu thập mới nhất của các thành phố từ CSDL.
+
+        Args:
+            weather_status_dao (BasicWeatherStatusDAO): Một DAO có thể thao tác với CSDL các trạng thái thời tiết
+
+        Returns:
+            int: Số thành phố có trong chỉ mục
+        """
+        latest = weather_status_dao.get_latest_collect_times()
+        with self._lock:
+            for city_id, collect_time in latest.items():
+                if city_id not in self._latest or self._latest[city_id] < collect_time:
+                    self._latest[city_id] = collect_time
+            self._warmed = True
+            return len(self._latest)
+
+    def is_changed(self, weather_status: WeatherStatus) -> bool:
+        """
+        Kiểm tra một trạng thái thời tiết có mới hơn dữ liệu đã lưu của thành phố hay không.
+
+        Args:
+            weather_status (WeatherStatus): Trạng thái thời tiết cần kiểm tra
+
+        Returns:
+            bool: True nếu thành phố chưa có dữ liệu hoặc `collect_time` mới hơn
+        """
+        latest = self._latest.get(weather_status.city_id)
+        return latest is None or weather_status.collect_time > latest
+
+    def update(self, weather_status: WeatherStatus) -> None:
+        """
+        Cập nhật chỉ mục sau khi một trạng thái thời tiết đã được load thành công.
+
+        Args:
+            weather_status (WeatherStatus): Trạng thái thời tiết đã được load
+        """
+        with self._lock:
+            latest = self._latest.get(weather_status.city_id)
+            if latest is None or latest < weather_status.collect_time:
+                self._latest[weather_status.city_id] = weather_status.collect_time
+
+    def clear(self) -> None:
+        """
+        Xóa toàn bộ chỉ mục, cần gọi lại `warm` trước khi dùng tiếp.
+        """
+        with self._lock:
+            self._latest.clear()
+            self._warmed = False
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
 def clear(weather_status_dao: BasicWeatherStatusDAO,
           city_id: int) -> None:
     """
@@ -152,12 +619,29 @@ def get_status(general_weather_dao: BasicGeneralWeatherDAO,
     else:
         status_id_lst = status_id
     
-    # Với mỗi ID trong list thì thực hiện lấy từ CSDL
+    # Với mỗi ID trong list thì lấy từ cache, chỉ lấy từ CSDL nếu cache chưa có
+    cache = get_general_weather_cache()
     for status_id_item in status_id_lst:
-        general_weathers.append(general_weather_dao.get(status_id_item))
+        general_weather = cache.get(status_id_item)
+        if general_weather is None:
+            general_weather = general_weather_dao.get(status_id_item)
+        general_weathers.append(general_weather)
     
     return general_weathers
 
+def refresh_general_weathers(general_weather_dao: BasicGeneralWeatherDAO) -> int:
+    """
+    Làm mới cache dùng chung của các kiểu thời tiết từ CSDL, cần gọi khi bảng
+    các kiểu thời tiết bị thay đổi.
+
+    Args:
+        general_weather_dao (BasicGeneralWeatherDAO): Một DAO có thể thao tác với CSDL các kiểu thời tiết
+
+    Returns:
+        int: Số kiểu thời tiết trong cache sau khi làm mới
+    """
+    return get_general_weather_cache().refresh(general_weather_dao.get_all)
+
 def get_weather_status(weather_status_dao: BasicWeatherStatusDAO,
                        city_id: int):
     """
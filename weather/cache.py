@@ -0,0 +1,163 @@
+"""
+Module `cache` cung cấp bộ nhớ đệm dùng chung của tiến trình cho các
+kiểu thời tiết chung (general weather). Danh sách các kiểu thời tiết gần
+như không thay đổi (khoảng 55 mã của Open Weather Map), nên được nạp sẵn
+từ file dữ liệu khởi tạo và chỉ được làm mới khi có yêu cầu.
+
+Cache được dùng bởi `get` của các general weather DAO (và được nạp thêm từ `get_all`),
+`weather.business.get_status` và `WeatherStatusBatch.to_weather_statuses`. Các weather
+status DAO không dùng cache: diễn giải của các kiểu thời tiết được lấy cùng trạng thái
+thời tiết trong một truy vấn (JOIN với MySQL, `$lookup` với MongoDB).
+
+Author:
+    Lê Minh Triết
+Last Modified Date:
+    18/10/2026
+"""
+
+import os
+init_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+import sys
+sys.path.append(init_dir)
+
+import json
+import threading
+from typing import Callable, Dict, Iterable, List
+
+from weather.model import GeneralWeather
+
+GENERAL_WEATHER_SEED_FILE = os.path.join(init_dir, 'db', 'init_general_weather_json.json')
+
+class GeneralWeatherCache:
+    """
+    Bộ nhớ đệm các kiểu thời tiết chung theo mã định danh. Có thể dùng chung
+    giữa nhiều thread.
+    """
+
+    def __init__(self, seed_file: str|None = GENERAL_WEATHER_SEED_FILE):
+        """
+        Khởi tạo một cache, dữ liệu được nạp từ file khởi tạo ở lần truy cập đầu tiên.
+
+        Args:
+            seed_file (str | None, optional): File JSON chứa danh sách các kiểu thời tiết
+                (có các trường `status_id` và `description`), None nếu không nạp sẵn.
+                Defaults to GENERAL_WEATHER_SEED_FILE.
+        """
+        self._seed_file = seed_file
+        self._items: Dict[int, GeneralWeather] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        """
+        Nạp dữ liệu từ file khởi tạo nếu chưa nạp. Nếu không đọc được file thì cache
+        bắt đầu rỗng và được điền dần từ CSDL.
+        """
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if self._seed_file is not None and os.path.exists(self._seed_file):
+                with open(self._seed_file, 'r') as file:
+                    for item in json.load(file):
+                        self._items.setdefault(item['status_id'], GeneralWeather.from_json(item))
+            self._loaded = True
+
+    def get(self, status_id: int) -> GeneralWeather|None:
+        """
+        Lấy một kiểu thời tiết theo mã định danh.
+
+        Args:
+            status_id (int): Mã định danh của kiểu thời tiết
+
+        Returns:
+            GeneralWeather | None: Kiểu thời tiết, None nếu không có trong cache
+        """
+        self._ensure_loaded()
+        return self._items.get(status_id)
+
+    def get_all(self) -> list[GeneralWeather]:
+        """
+        Lấy tất cả các kiểu thời tiết có trong cache.
+
+        Returns:
+            list[GeneralWeather]: Danh sách các kiểu thời tiết, theo thứ tự mã định danh
+        """
+        self._ensure_loaded()
+        return [self._items[status_id] for status_id in sorted(self._items)]
+
+    def missing(self, status_ids: Iterable[int]) -> list[int]:
+        """
+        Lọc ra các mã định danh chưa có trong cache.
+
+        Args:
+            status_ids (Iterable[int]): Các mã định danh cần kiểm tra
+
+        Returns:
+            list[int]: Các mã định danh chưa có (không trùng lặp)
+        """
+        self._ensure_loaded()
+        return [status_id for status_id in dict.fromkeys(status_ids) if status_id not in self._items]
+
+    def put(self, general_weathers: GeneralWeather|Iterable[GeneralWeather]) -> None:
+        """
+        Thêm hoặc cập nhật một hoặc nhiều kiểu thời tiết vào cache.
+
+        Args:
+            general_weathers (GeneralWeather | Iterable[GeneralWeather]): Các kiểu thời tiết
+        """
+        if isinstance(general_weathers, GeneralWeather):
+            general_weathers = [general_weathers]
+        self._ensure_loaded()
+        with self._lock:
+            for general_weather in general_weathers:
+                self._items[general_weather.status_id] = general_weather
+
+    def replace_all(self, general_weathers: Iterable[GeneralWeather]) -> None:
+        """
+        Thay toàn bộ nội dung của cache bằng danh sách mới (ví dụ lấy từ CSDL).
+
+        Args:
+            general_weathers (Iterable[GeneralWeather]): Danh sách các kiểu thời tiết mới
+        """
+        items = {general_weather.status_id: general_weather for general_weather in general_weathers}
+        with self._lock:
+            self._items = items
+            self._loaded = True
+
+    def refresh(self, loader: Callable[[], List[GeneralWeather]]) -> int:
+        """
+        Làm mới cache từ một nguồn dữ liệu, thường là `get_all` của một general weather DAO.
+
+        Args:
+            loader (Callable[[], List[GeneralWeather]]): Hàm lấy tất cả các kiểu thời tiết
+
+        Returns:
+            int: Số kiểu thời tiết trong cache sau khi làm mới
+        """
+        self.replace_all(loader())
+        return len(self._items)
+
+    def clear(self) -> None:
+        """
+        Xóa cache, dữ liệu sẽ được nạp lại từ file khởi tạo ở lần truy cập tiếp theo.
+        """
+        with self._lock:
+            self._items = {}
+            self._loaded = False
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._items)
+
+_cache = GeneralWeatherCache()
+
+def get_general_weather_cache() -> GeneralWeatherCache:
+    """
+    Lấy cache các kiểu thời tiết chung dùng chung của tiến trình.
+
+    Returns:
+        GeneralWeatherCache: Cache dùng chung
+    """
+    return _cache
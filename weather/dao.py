@@ -2,6 +2,9 @@
 Module `dao` cung cấp các DAO để thao tác CSDL
 của các general_weather và weather_status.
 
+Các DAO đều có thể dùng chung giữa nhiều thread, xem `common.dao.BasicMySQLDAO`
+và `common.dao.BasicMongoDBDAO`.
+
 Author: 
     Lê Minh Triết
 Last Modified Date: 
@@ -14,15 +17,22 @@ import sys
 sys.path.append(init_dir)
 
 from mysql.connector import Error
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from typing import List
+from operator import itemgetter
 from abc import ABC, abstractmethod
 from datetime import datetime
 
-from weather.model import GeneralWeather, WeatherStatus
+from weather.model import GeneralWeather, WeatherStatus, WeatherStatusBatch
+from weather.cache import get_general_weather_cache
 import db.config as dbconfig
 from common.dao import BasicMySQLDAO, DAOException, NotExistDataException, BasicMongoDBDAO
 
+# Số khóa (city_id, collect_time) tối đa trong một câu lệnh xóa các condition của `insert_many`
+DELETE_KEYS_BATCH_SIZE = 1000
+
 class BasicGeneralWeatherDAO(ABC):
     """
     Cung cấp các phương thức có thể thao tác trên CSDL các general weather.
@@ -74,39 +84,45 @@ class MySQLGeneralWeatherDAO(BasicMySQLDAO, BasicGeneralWeatherDAO):
         self._general_weather_reader = self._sqlFileReaders[dbconfig.GENERAL_WEATHER_SQL_FILE]
         
     def get(self, status_id: int) -> GeneralWeather:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
+        # Ưu tiên lấy từ cache dùng chung
+        cache = get_general_weather_cache()
+        general_weather = cache.get(status_id)
+        if general_weather is not None:
+            return general_weather
         
         # Lấy các query
         get_status_query = self._general_weather_reader.get_query_of(
             dbconfig.GeneralWeatherEnableQueries.GET_BY_STATUS.value
         )
         
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
         # Lấy dữ liệu
         try:
             cursor.execute(get_status_query, (status_id, ))
             get_general_weather_result = cursor.fetchone()
             if get_general_weather_result is None:
                 raise NotExistDataException()
-            return GeneralWeather.from_tuple(source=get_general_weather_result)
+            general_weather = GeneralWeather.from_tuple(source=get_general_weather_result)
+            cache.put(general_weather)
+            return general_weather
         except Error as e:
+            self.mark_failed_(connection)
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
             
     def get_all(self) -> list[GeneralWeather]:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor()
-        
         # Lấy query
         get_status_query = self._general_weather_reader.get_query_of(
             dbconfig.GeneralWeatherEnableQueries.GET_ALL_STATUS.value
         )
         
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_()
+        
         # Lấy dữ liệu
         try:
             cursor.execute(get_status_query)
@@ -114,11 +130,14 @@ class MySQLGeneralWeatherDAO(BasicMySQLDAO, BasicGeneralWeatherDAO):
             results: List[GeneralWeather] = []
             for result in get_general_weather_results:
                 results.append(GeneralWeather.from_tuple(source=result))
+            get_general_weather_cache().put(results)
             return results
         except Error as e:
+            self.mark_failed_(connection)
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
             
 class BasicWeatherStatusDAO(ABC):
     """
@@ -153,6 +172,17 @@ class BasicWeatherStatusDAO(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_latest_collect_times(self) -> dict[int, datetime]:
+        """
+        Lấy thời điểm thu thập mới nhất đã được lưu của mỗi thành phố.
+
+        Returns:
+            dict[int, datetime]: Một dict với key là `city_id`, value là thời điểm
+                thu thập mới nhất của thành phố đó
+        """
+        pass
+    
     @abstractmethod
     def insert(self, new_weather: WeatherStatus) -> None:
         """
@@ -163,6 +193,18 @@ class BasicWeatherStatusDAO(ABC):
         """
         pass
     
+    @abstractmethod
+    def insert_many(self, new_weathers: list[WeatherStatus]|WeatherStatusBatch) -> None:
+        """
+        Thêm nhiều trạng thái thời tiết mới vào CSDL trong một lần ghi. Nếu trạng thái
+        đã tồn tại (cùng thành phố và thời điểm) thì sẽ được cập nhật.
+
+        Args:
+            new_weathers (list[WeatherStatus] | WeatherStatusBatch): Các trạng thái thời tiết mới,
+                có thể là một batch lưu theo cột
+        """
+        pass
+    
     @abstractmethod
     def delete(self, city_id: int, collect_time: datetime) -> None:
         """
@@ -209,177 +251,243 @@ class MySQLWeatherStatusDAO(BasicMySQLDAO, BasicWeatherStatusDAO):
         self._weather_status_reader = self._sqlFileReaders[dbconfig.WEATHER_STATUS_SQL_FILE]
         self._weather_condition_reader = self._sqlFileReaders[dbconfig.WEATHER_CONDITION_SQL_FILE]
             
+    @staticmethod
+    def _group_status_rows(rows: list[tuple]) -> list[WeatherStatus]:
+        """
+        Gộp các dòng kết quả của câu truy vấn JOIN (mỗi dòng là một trạng thái thời tiết
+        kèm theo một kiểu thời tiết của nó) thành các trạng thái thời tiết, trong một lần duyệt.
+        Các dòng của cùng một trạng thái phải đứng liền nhau.
+
+        Args:
+            rows (list[tuple]): Các dòng có dạng (18 cột của weather_status, status_id, description),
+                status_id là None nếu trạng thái không có kiểu thời tiết nào
+
+        Returns:
+            list[WeatherStatus]: Các trạng thái thời tiết theo thứ tự của các dòng
+        """
+        # Dữ liệu đã được kiểm tra khi thêm vào CSDL nên dùng cách tạo nhanh không kiểm tra lại
+        weather_statuses: List[WeatherStatus] = []
+        current_key = None
+        for row in rows:
+            key = (row[0], row[1])
+            if key != current_key:
+                current_key = key
+                general_weathers: List[GeneralWeather] = []
+                weather_statuses.append(WeatherStatus._from_db_row(row[:18], general_weathers))
+            if row[18] is not None:
+                general_weathers.append(GeneralWeather.of(row[18], row[19]))
+        return weather_statuses
+            
     def get(self, city_id: int, collect_time: datetime) -> WeatherStatus:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
-        # Lấy các query từ 3 bảng liên quan
-        get_status_query = self._general_weather_reader.get_query_of(
-            dbconfig.GeneralWeatherEnableQueries.GET_BY_STATUS.value
-        )      
+        # Lấy query JOIN từ 3 bảng liên quan
         get_weather_query = self._weather_status_reader.get_query_of(
-            dbconfig.WeatherStatusEnableQueries.GET_BY_CITY_AND_TIME.value
-        )
-        get_condition_query = self._weather_condition_reader.get_query_of(
-            dbconfig.WeatherConditionEnableQueries.GET_ALL_BY_CITY_AND_TIME.value
+            dbconfig.WeatherStatusEnableQueries.GET_BY_CITY_AND_TIME_WITH_CONDITIONS.value
         )
         
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
         # Lấy dữ liệu
         try:
-            # Lấy từ bảng chính weather_status
             cursor.execute(get_weather_query, (city_id, collect_time))
-            get_weather_result = cursor.fetchone()
-            if get_weather_result is None:
+            weather_statuses = self._group_status_rows(cursor.fetchall())
+            if not weather_statuses:
                 raise NotExistDataException()
-            
-            # Lấy từ bảng weather_condition các mã định danh của kiểu thời tiết chung
-            cursor.execute(get_condition_query, (city_id, collect_time))
-            conditions: List[tuple] = []
-            get_condition_results = cursor.fetchall()
-            
-            # Lấy chi tiết các kiểu thời tiết chung từ bảng general_weather 
-            for get_condition_result in get_condition_results:
-                status_id = get_condition_result[2]
-                cursor.execute(get_status_query, (status_id, ))
-                conditions.append(cursor.fetchone())
-                
-            source = get_weather_result + (conditions, )
-            return WeatherStatus.from_tuple(source)
+            return weather_statuses[0]
         except Error as e:
+            self.mark_failed_(connection)
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
             
     def get_all(self, city_id: int) -> list[WeatherStatus]:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
-        # Lấy query từ 3 bảng liên quan
-        get_status_query = self._general_weather_reader.get_query_of(
-            dbconfig.GeneralWeatherEnableQueries.GET_BY_STATUS.value
-        )      
+        # Lấy query JOIN từ 3 bảng liên quan
         get_weather_query = self._weather_status_reader.get_query_of(
-            dbconfig.WeatherStatusEnableQueries.GET_ALL_BY_CITY.value
-        )
-        get_condition_query = self._weather_condition_reader.get_query_of(
-            dbconfig.WeatherConditionEnableQueries.GET_ALL_BY_CITY_AND_TIME.value
+            dbconfig.WeatherStatusEnableQueries.GET_ALL_BY_CITY_WITH_CONDITIONS.value
         )
         
-        # Lấy dữ liệu
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
+        # Lấy dữ liệu, các dòng của cùng một trạng thái đứng liền nhau nhờ ORDER BY
         try:
-            # Lấy dữ liệu từ bảng chính weather_status
             cursor.execute(get_weather_query, (city_id, ))
-            get_weather_results = cursor.fetchall()
+            return self._group_status_rows(cursor.fetchall())
+        except Error as e:
+            self.mark_failed_(connection)
+            raise DAOException(e.msg)
+        finally:
+            cursor.close()
+            self.release_(connection)
             
-            weather_statuses: List[WeatherStatus] = []
-            for get_weather_result in get_weather_results:
-                # Với mỗi dữ liệu lấy được, lấy mã các kiểu thời tiết từ weather_condition
-                collect_time = get_weather_result[1]
-                cursor.execute(get_condition_query, (city_id, collect_time))
-                conditions: List[tuple] = []
-                get_condition_results = cursor.fetchall()
-                
-                # Lấy chi tiết các kiểu thời tiết từ general_weather
-                for get_condition_result in get_condition_results:
-                    status_id = get_condition_result[2]
-                    cursor.execute(get_status_query, (status_id, ))
-                    conditions.append(cursor.fetchone())
-                    
-                source = get_weather_result + (conditions, )
-                weather_statuses.append(WeatherStatus.from_tuple(source))
-                
-            return weather_statuses
+    def get_latest_collect_times(self) -> dict[int, datetime]:
+        # Lấy query
+        get_latest_query = self._weather_status_reader.get_query_of(
+            dbconfig.WeatherStatusEnableQueries.GET_LATEST_COLLECT_TIMES.value
+        )
+        
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_()
+        
+        # Lấy dữ liệu
+        try:
+            cursor.execute(get_latest_query)
+            return {city_id: collect_time for city_id, collect_time in cursor.fetchall()}
         except Error as e:
+            self.mark_failed_(connection)
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
     
     def insert(self, new_weather: WeatherStatus) -> None:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
         # Lấy query để thao tác trên 2 bảng liên quan
         insert_status_query = self._weather_status_reader.get_query_of(
             dbconfig.WeatherStatusEnableQueries.INSERT.value
         )
         insert_condition_query = self._weather_condition_reader.get_query_of(
-            dbconfig.WeatherConditionEnableQueries.INSERT.value
+            dbconfig.WeatherConditionEnableQueries.INSERT_BY_STATUSES.value
         )
         delete_condition_query = self._weather_condition_reader.get_query_of(
-            dbconfig.WeatherConditionEnableQueries.DELETE.value
+            dbconfig.WeatherConditionEnableQueries.DELETE_STALE.value
         )
+        count_condition_query = self._weather_condition_reader.get_query_of(
+            dbconfig.WeatherConditionEnableQueries.COUNT_BY_CITY_AND_TIME.value
+        )
+        
+        # Danh sách mã các kiểu thời tiết dạng 'id1,id2,...' để dùng với FIND_IN_SET
+        status_ids = ','.join(str(general_weather.status_id)
+                              for general_weather in new_weather.general_weathers)
+        condition_params = (new_weather.city_id, new_weather.collect_time, status_ids)
+        condition_cnt = len({general_weather.status_id for general_weather in new_weather.general_weathers})
+        
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
         
         # Thực hiện, nếu có lỗi thì rollback toàn bộ
         try:
             # Thêm trạng thái thời tiết cơ bản vào bảng weather_status
             cursor.execute(insert_status_query, new_weather.to_tuple()[:-1])
             
-            # Xóa các condition đã tồn tại tại thành phố ở thời điểm cần thêm (nếu đã có)
-            cursor.execute(delete_condition_query, (new_weather.city_id, new_weather.collect_time))
+            # Chỉ xóa các condition không còn trong trạng thái mới (nếu đã có)
+            cursor.execute(delete_condition_query, condition_params)
+            
+            # Thêm tất cả các kiểu thời tiết của trạng thái mới trong 1 câu lệnh, giữ nguyên các condition đã có
+            cursor.execute(insert_condition_query, condition_params)
             
-            # Với mỗi kiểu thời tiết trong trạng thái mới, thực hiện thêm vào weather_condidtion
-            for general_weather in new_weather.general_weathers:
-                cursor.execute(insert_condition_query, (
-                    new_weather.city_id, new_weather.collect_time, general_weather.status_id
-                ))
+            # Các kiểu thời tiết không có trong bảng general_weather sẽ không được thêm
+            cursor.execute(count_condition_query, condition_params[:2])
+            if cursor.fetchone()[0] != condition_cnt:
+                raise DAOException("Some general weathers don't exist!")
                 
-            self._connection.commit()
+            connection.commit()
         except Error as e:
-            if self._connection.is_connected():
-                self._connection.rollback()
+            self.mark_failed_(connection)
+            if connection.is_connected():
+                connection.rollback()
             raise DAOException(e.msg)
+        except DAOException:
+            if connection.is_connected():
+                connection.rollback()
+            raise
         finally:
             cursor.close()
+            self.release_(connection)
             
-    def delete(self, city_id: int, collect_time: datetime) -> None:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
+    def insert_many(self, new_weathers: list[WeatherStatus]|WeatherStatusBatch) -> None:
+        if not new_weathers:
+            return
         
+        # Lấy query để thao tác trên 2 bảng liên quan
+        insert_status_query = self._weather_status_reader.get_query_of(
+            dbconfig.WeatherStatusEnableQueries.INSERT.value
+        )
+        insert_condition_query = self._weather_condition_reader.get_query_of(
+            dbconfig.WeatherConditionEnableQueries.INSERT.value
+        )
+        delete_conditions_query = self._weather_condition_reader.get_query_of(
+            dbconfig.WeatherConditionEnableQueries.DELETE_ALL_BY_KEYS.value
+        )
+        
+        # Chuẩn bị dữ liệu của từng bảng
+        if isinstance(new_weathers, WeatherStatusBatch):
+            status_rows, key_rows, condition_rows = new_weathers.to_mysql_params()
+        else:
+            status_rows = [new_weather.to_tuple()[:-1] for new_weather in new_weathers]
+            key_rows = [(new_weather.city_id, new_weather.collect_time) for new_weather in new_weathers]
+            condition_rows = [(new_weather.city_id, new_weather.collect_time, general_weather.status_id)
+                              for new_weather in new_weathers
+                              for general_weather in new_weather.general_weathers]
+        
+        # Mượn một kết nối từ pool và lấy cursor, executemany của cursor thường sẽ gộp
+        # các câu lệnh INSERT thành một câu lệnh INSERT nhiều dòng
+        connection, cursor = self.checkout_()
+        
+        # Thực hiện trong 1 transaction, nếu có lỗi thì rollback toàn bộ
+        try:
+            cursor.executemany(insert_status_query, status_rows)
+            # executemany không gộp được câu lệnh DELETE, nên xóa các condition cũ của
+            # nhiều trạng thái trong 1 câu lệnh với điều kiện (city_id, collect_time) IN (...)
+            for i in range(0, len(key_rows), DELETE_KEYS_BATCH_SIZE):
+                chunk = key_rows[i:i + DELETE_KEYS_BATCH_SIZE]
+                cursor.execute(delete_conditions_query.format(keys=', '.join(['(%s, %s)'] * len(chunk))),
+                               [value for key in chunk for value in key])
+            if condition_rows:
+                cursor.executemany(insert_condition_query, condition_rows)
+            connection.commit()
+        except Error as e:
+            self.mark_failed_(connection)
+            if connection.is_connected():
+                connection.rollback()
+            raise DAOException(e.msg)
+        finally:
+            cursor.close()
+            self.release_(connection)
+            
+    def delete(self, city_id: int, collect_time: datetime) -> None:
         # Lấy query để xóa (do mối quan hệ khóa ngoài nên không cần xóa ở bảng weather_condition)
         delete_query = self._weather_status_reader.get_query_of(
             dbconfig.WeatherStatusEnableQueries.DELETE.value
         )
         
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
         # Thực hiện, nếu lỗi thì rollback
         try:
             cursor.execute(delete_query, (city_id, collect_time))
-            self._connection.commit()
+            connection.commit()
         except Error as e:
-            if self._connection.is_connected():
-                self._connection.rollback()
+            self.mark_failed_(connection)
+            if connection.is_connected():
+                connection.rollback()
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
     
     def delete_all(self, city_id: int) -> None:
-        # Check kết nối và lấy cursor
-        if not self._connection.is_connected():
-            raise DAOException("Connection is null!")
-        cursor = self._connection.cursor(prepared=True)
-        
         # Lấy query để xóa (do mối quan hệ khóa ngoài nên không cần xóa ở bảng weather_condition)
         delete_query = self._weather_status_reader.get_query_of(
             dbconfig.WeatherStatusEnableQueries.DELETE_ALL_BY_CITY.value
         )
         
+        # Mượn một kết nối từ pool và lấy cursor
+        connection, cursor = self.checkout_(prepared=True)
+        
         # Thực hiện, nếu lỗi thì rollback
         try:
             cursor.execute(delete_query, (city_id, ))
-            self._connection.commit()
+            connection.commit()
         except Error as e:
-            if self._connection.is_connected():
-                self._connection.rollback()
+            self.mark_failed_(connection)
+            if connection.is_connected():
+                connection.rollback()
             raise DAOException(e.msg)
         finally:
             cursor.close()
+            self.release_(connection)
             
 class MongoDBGeneralWeatherDAO(BasicMongoDBDAO, BasicGeneralWeatherDAO):
     """
@@ -405,6 +513,12 @@ class MongoDBGeneralWeatherDAO(BasicMongoDBDAO, BasicGeneralWeatherDAO):
         self._general_weather_collection = self._collections['general_weather']
         
     def get(self, status_id: int) -> GeneralWeather:
+        # Ưu tiên lấy từ cache dùng chung
+        cache = get_general_weather_cache()
+        general_weather = cache.get(status_id)
+        if general_weather is not None:
+            return general_weather
+        
         query = {
             'status_id': status_id
         }
@@ -412,7 +526,9 @@ class MongoDBGeneralWeatherDAO(BasicMongoDBDAO, BasicGeneralWeatherDAO):
         result = self._general_weather_collection.find_one(query)
         if result is None:
             raise NotExistDataException()
-        return GeneralWeather.from_json(result)
+        general_weather = GeneralWeather.from_json(result)
+        cache.put(general_weather)
+        return general_weather
     
     def get_all(self) -> list[GeneralWeather]:
         results = self._general_weather_collection.find()
@@ -421,6 +537,7 @@ class MongoDBGeneralWeatherDAO(BasicMongoDBDAO, BasicGeneralWeatherDAO):
         # Với mỗi result thực hiện chuyển đổi
         for result in results:
             general_weathers.append(GeneralWeather.from_json(result))
+        get_general_weather_cache().put(general_weathers)
         return general_weathers
 
 class MongoDBWeatherStatusDAO(BasicMongoDBDAO, BasicWeatherStatusDAO):
@@ -447,60 +564,93 @@ class MongoDBWeatherStatusDAO(BasicMongoDBDAO, BasicWeatherStatusDAO):
         self._general_weather_collection = self._collections['general_weather']
         self._weather_status_collection = self._collections['weather_status']
         
+    # Số document mỗi lần lấy về từ cursor của aggregation pipeline
+    AGGREGATE_BATCH_SIZE = 1000
+    
+    # Lấy các trường của trạng thái từ document theo thứ tự của WeatherStatus.DB_FIELDS
+    _status_fields = staticmethod(itemgetter(*WeatherStatus.DB_FIELDS))
+    
+    @staticmethod
+    def _lookup_stages() -> list[dict]:
+        """
+        Tạo các stage của aggregation pipeline để lấy chi tiết các general weather
+        của mỗi weather status (join phía server bằng `$lookup`). Thứ tự các general
+        weather trong mỗi status được giữ nguyên, general weather không có trong
+        collection general_weather được giữ nguyên như trong status (chỉ có `status_id`).
+
+        Returns:
+            list[dict]: Các stage của aggregation pipeline
+        """
+        return [
+            {'$lookup': {
+                'from': 'general_weather',
+                'localField': 'general_weathers.status_id',
+                'foreignField': 'status_id',
+                'as': '_general_weathers'
+            }},
+            # $lookup không giữ thứ tự của mảng nên ánh xạ lại theo thứ tự ban đầu
+            {'$set': {'general_weathers': {'$map': {
+                'input': '$general_weathers',
+                'as': 'item',
+                'in': {'$ifNull': [
+                    {'$arrayElemAt': [
+                        {'$filter': {
+                            'input': '$_general_weathers',
+                            'cond': {'$eq': ['$$this.status_id', '$$item.status_id']}
+                        }}, 0
+                    ]},
+                    '$$item'
+                ]}
+            }}}},
+            {'$unset': '_general_weathers'}
+        ]
+    
+    @classmethod
+    def _build_weather_status(cls, result: dict) -> WeatherStatus:
+        """
+        Tạo một trạng thái thời tiết từ một document kết quả của aggregation pipeline.
+
+        Args:
+            result (dict): Document đã có chi tiết các general weather
+
+        Returns:
+            WeatherStatus: Trạng thái thời tiết
+        """
+        # Dữ liệu đã được kiểm tra khi thêm vào CSDL nên dùng cách tạo nhanh không kiểm tra lại
+        general_weathers = [GeneralWeather.of(item['status_id'], item.get('description'))
+                            for item in result['general_weathers']]
+        return WeatherStatus._from_db_row(cls._status_fields(result), general_weathers)
+        
     def get(self, city_id: int, collect_time: datetime) -> WeatherStatus:
-        status_query = {
-            '$and': [
-                {'city_id': city_id},
-                {'collect_time': collect_time}
-            ]
-        }
+        pipeline = [
+            {'$match': {'city_id': city_id, 'collect_time': collect_time}},
+            {'$limit': 1}
+        ] + self._lookup_stages()
         
-        # Lấy các status trước
-        result = self._weather_status_collection.find_one(status_query)
-        if result is None:
+        # Lấy status kèm các general weather trong 1 lần truy vấn
+        results = list(self._weather_status_collection.aggregate(pipeline))
+        if not results:
             raise NotExistDataException()
-        
-        # Với mỗi general_weather thì lấy thông tin chi tiết về nó
-        general_weathers_dict: List[dict] = []
-        for item in result['general_weathers']:
-            general_query = {
-                'status_id': item['status_id']
-            }
-            
-            general_result = self._general_weather_collection.find_one(general_query)
-            general_weathers_dict.append(general_result)
-            
-        # Tổng hợp
-        result['general_weathers'] = general_weathers_dict
-        return WeatherStatus.from_json(result)
-        
+        return self._build_weather_status(results[0])
     
     def get_all(self, city_id: int) -> list[WeatherStatus]:
-        status_query = {
-            'city_id': city_id
-        }
+        pipeline = [
+            {'$match': {'city_id': city_id}}
+        ] + self._lookup_stages()
         
-        # Lấy các status trước
-        results = self._weather_status_collection.find(status_query)
-        status_results: List[WeatherStatus] = []
+        # Lấy tất cả các status kèm các general weather trong 1 aggregation, đọc theo từng batch
+        results = self._weather_status_collection.aggregate(
+            pipeline, batchSize=self.AGGREGATE_BATCH_SIZE
+        )
+        return [self._build_weather_status(result) for result in results]
+    
+    def get_latest_collect_times(self) -> dict[int, datetime]:
+        pipeline = [
+            {'$group': {'_id': '$city_id', 'collect_time': {'$max': '$collect_time'}}}
+        ]
         
-        # Với mỗi result thì lấy dữ liệu các general weather mà result đó sở hữu
-        for result in results:
-            # Với mỗi general_weather thì lấy thông tin chi tiết về nó
-            general_weathers_dict: List[dict] = []
-            for item in result['general_weathers']:
-                general_query = {
-                    'status_id': item['status_id']
-                }
-                
-                general_result = self._general_weather_collection.find_one(general_query)
-                general_weathers_dict.append(general_result)
-                
-            # Tổng hợp
-            result['general_weathers'] = general_weathers_dict
-            status_results.append(WeatherStatus.from_json(result))
-            
-        return status_results
+        results = self._weather_status_collection.aggregate(pipeline)
+        return {result['_id']: result['collect_time'] for result in results}
         
     def insert(self, new_weather: WeatherStatus) -> None:
         query = {
@@ -521,6 +671,38 @@ class MongoDBWeatherStatusDAO(BasicMongoDBDAO, BasicWeatherStatusDAO):
         result = self._weather_status_collection.update_one(query, update, upsert=True)
         if result.upserted_id is None and result.matched_count == 0:
             raise DAOException("Failed inserted!")
+        
+    def insert_many(self, new_weathers: list[WeatherStatus]|WeatherStatusBatch) -> None:
+        if not new_weathers:
+            return
+        
+        # Chuẩn bị các document, các general weather chỉ lưu status_id
+        if isinstance(new_weathers, WeatherStatusBatch):
+            documents = new_weathers.to_mongo_documents()
+        else:
+            documents = []
+            for new_weather in new_weathers:
+                values = new_weather.to_json()
+                for item in values['general_weathers']:
+                    item.pop('description')
+                documents.append(values)
+        
+        # Mỗi trạng thái là một thao tác upsert, tất cả được gửi trong 1 lần bulk_write
+        requests: List[UpdateOne] = []
+        for values in documents:
+            query = {
+                'city_id': values['city_id'],
+                'collect_time': values['collect_time']
+            }
+            requests.append(UpdateOne(query, {"$set": values}, upsert=True))
+        
+        # Không cần thứ tự, các thao tác lỗi không làm dừng các thao tác còn lại
+        try:
+            result = self._weather_status_collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            raise DAOException(f"Failed inserted {len(e.details['writeErrors'])}/{len(requests)}!")
+        if result.upserted_count + result.matched_count < len(requests):
+            raise DAOException("Failed inserted!")
     
     def delete(self, city_id: int, collect_time: datetime) -> None:
         query = {
@@ -3,19 +3,28 @@ Module `model` cung cấp class để đại diện
 cho các dữ liệu thời tiết, bao gồm các kiểu thời tiết
 và trạng thái thời tiết của các thành phố.
 
+Các class dùng `__slots__` thay cho `__dict__` để giảm bộ nhớ của mỗi đối tượng.
+
 Author: 
     Lê Minh Triết
 Last Modified Date: 
-    04/02/2025
+    18/10/2026
 """
 
-from datetime import datetime
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterable, Sequence
+
+from common.interning import Interned
 
-class GeneralWeather:
+class GeneralWeather(Interned):
     """
-    Đại diện cho một kiểu thời tiết chung.
+    Đại diện cho một kiểu thời tiết chung. Các đối tượng dùng chung (bất biến)
+    được lấy qua `GeneralWeather.of`.
     """
     
+    __slots__ = ('__status_id', '__description')
+    
     def __init__(self, status_id: int, description: str|None = None):
         """
         Khởi tạo 1 đối tượng thời tiết chung.
@@ -24,9 +33,27 @@ class GeneralWeather:
             status_id (int): Mã định danh của kiểu thời tiết
             description (str | None, optional): Diễn giải về kiểu thời tiết. Defaults to None.
         """
+        self._frozen = False
         self.status_id = status_id
         self.description = description
     
+    @staticmethod
+    def of(status_id: int, description: str|None = None) -> 'GeneralWeather':
+        """
+        Lấy đối tượng GeneralWeather dùng chung ứng với (status_id, description).
+        Đối tượng trả về là bất biến, mọi lần gọi với cùng tham số đều trả về
+        cùng một đối tượng.
+
+        Args:
+            status_id (int): Mã định danh của kiểu thời tiết
+            description (str | None, optional): Diễn giải về kiểu thời tiết. Defaults to None.
+
+        Returns:
+            GeneralWeather: Đối tượng dùng chung
+        """
+        return GeneralWeather._intern((status_id, description),
+                                      lambda: GeneralWeather(status_id, description))
+    
     @property
     def status_id(self):
         return self.__status_id
@@ -37,10 +64,12 @@ class GeneralWeather:
     
     @status_id.setter
     def status_id(self, status_id: int):
+        self._check_mutable()
         self.__status_id = status_id
     
     @description.setter
     def description(self, description: str|None):
+        self._check_mutable()
         self.__description = description
     
     def __str__(self):
@@ -53,7 +82,7 @@ class GeneralWeather:
     @staticmethod
     def from_tuple(source: tuple[int, str|None]) -> 'GeneralWeather':
         """
-        Lấy một General Weather từ một tuple
+        Lấy một General Weather (dùng chung) từ một tuple
 
         Args:
             source (tuple[int, str | None]): một tuple có dạng (status_id, description)
@@ -68,7 +97,7 @@ class GeneralWeather:
             return None
         if len(source) != 2:
             raise ValueError("Invalid argurment, required 2 argument!")
-        return GeneralWeather(
+        return GeneralWeather.of(
             status_id=source[0],
             description=source[1]
         )
@@ -85,7 +114,7 @@ class GeneralWeather:
     @staticmethod
     def from_json(source: dict) -> 'GeneralWeather':
         """
-        Chuyển 1 đối tượng JSON sang General Weather. Đối tượng JSON này phải 
+        Chuyển 1 đối tượng JSON sang General Weather (dùng chung). Đối tượng JSON này phải 
         chứa các trường status_id và description, các trường trống mang giá trị None.
 
         Args:
@@ -94,7 +123,7 @@ class GeneralWeather:
         Returns:
             GeneralWeather: Đối tượng GeneralWeather thu được
         """
-        return GeneralWeather(
+        return GeneralWeather.of(
             status_id=source['status_id'],
             description=source['description']
         )
@@ -116,6 +145,19 @@ class WeatherStatus:
     Đối tượng đại diện cho trạng thái thời tiết được thu thập từ các thành phố.
     """
     
+    # Các API thường giữ toàn bộ lịch sử thời tiết của thành phố trong bộ nhớ
+    __slots__ = ('__city_id', '__collect_time', '__temp', '__feels_temp',
+                 '__pressure', '__humidity', '__sea_level', '__grnd_level',
+                 '__visibility', '__wind_speed', '__wind_deg', '__wind_gust',
+                 '__clouds_all', '__rain', '__sunrise', '__sunset', '__aqi',
+                 '__pm2_5', '__general_weathers', '__max_decimal')
+    
+    # Thứ tự các cột của bảng weather_status (cũng là tên các trường của document
+    # trong MongoDB), dùng cho `_from_db_row`
+    DB_FIELDS = ('city_id', 'collect_time', 'temp', 'feels_temp', 'pressure', 'humidity',
+                 'sea_level', 'grnd_level', 'visibility', 'wind_speed', 'wind_deg', 'wind_gust',
+                 'clouds_all', 'rain', 'sunrise', 'sunset', 'aqi', 'pm2_5')
+    
     def __init__(self, city_id: int, collect_time: datetime,
                  temp: float|None = None, feels_temp: float|None = None,
                  pressure: int|None = None, humidity: int|None = None,
@@ -461,6 +503,49 @@ class WeatherStatus:
             general_weathers=[GeneralWeather.from_tuple(item) for item in source[18]],
         )
 
+    @staticmethod
+    def _from_db_row(row: Sequence, general_weathers: list[GeneralWeather],
+                     max_decimal: int = 7) -> 'WeatherStatus':
+        """
+        Tạo một trạng thái thời tiết từ dữ liệu đọc lên từ CSDL mà không kiểm tra lại.
+        Dữ liệu trong CSDL đã được kiểm tra và làm tròn bởi các setter khi được thêm vào,
+        nên ở đây chỉ đổi các số thập phân (ví dụ `Decimal` của MySQL) sang float.
+        Chỉ dùng cho dữ liệu do các DAO lưu trữ.
+
+        Args:
+            row (Sequence): Các giá trị theo thứ tự của `WeatherStatus.DB_FIELDS`
+            general_weathers (list[GeneralWeather]): Danh sách các kiểu thời tiết chung
+            max_decimal (int, optional): Số lượng số sau dấu phẩy của các thuộc tính float. Defaults to 7.
+
+        Returns:
+            WeatherStatus: Trạng thái thời tiết thu được
+        """
+        (city_id, collect_time, temp, feels_temp, pressure, humidity, sea_level, grnd_level,
+         visibility, wind_speed, wind_deg, wind_gust, clouds_all, rain, sunrise, sunset,
+         aqi, pm2_5) = row
+        weather_status = WeatherStatus.__new__(WeatherStatus)
+        weather_status.__max_decimal = max_decimal
+        weather_status.__city_id = city_id
+        weather_status.__collect_time = collect_time
+        weather_status.__temp = None if temp is None else float(temp)
+        weather_status.__feels_temp = None if feels_temp is None else float(feels_temp)
+        weather_status.__pressure = pressure
+        weather_status.__humidity = humidity
+        weather_status.__sea_level = sea_level
+        weather_status.__grnd_level = grnd_level
+        weather_status.__visibility = visibility
+        weather_status.__wind_speed = None if wind_speed is None else float(wind_speed)
+        weather_status.__wind_deg = wind_deg
+        weather_status.__wind_gust = None if wind_gust is None else float(wind_gust)
+        weather_status.__clouds_all = clouds_all
+        weather_status.__rain = None if rain is None else float(rain)
+        weather_status.__sunrise = sunrise
+        weather_status.__sunset = sunset
+        weather_status.__aqi = aqi
+        weather_status.__pm2_5 = None if pm2_5 is None else float(pm2_5)
+        weather_status.__general_weathers = general_weathers
+        return weather_status
+
     def to_tuple(self) -> tuple:
         """
         Chuyển đối tượng hiện tại thành 1 tuple
@@ -540,4 +625,209 @@ class WeatherStatus:
             'aqi': self.__aqi,
             'pm2_5': self.__pm2_5,
             'general_weathers': [item.to_json() for item in self.__general_weathers]
-        }
\ No newline at end of file
+        }
+
+class WeatherStatusBatch:
+    """
+    Một tập các trạng thái thời tiết được lưu theo cột, dùng cho các quy trình xử lý
+    hàng loạt (transform, load, phân tích) mà không cần tạo từng đối tượng WeatherStatus.
+    
+    Mỗi trường số được lưu trong một `array.array` (float là `'d'`, int là `'q'`), các
+    trường thời gian được lưu dưới dạng số giây (int64) từ `1970-01-01 00:00:00` tới thời điểm
+    naive (giờ địa phương, như trong WeatherStatus và CSDL), không phải Unix timestamp: thời điểm
+    được tính như thể là UTC để đổi qua lại chính xác. Không nhận các datetime có múi giờ.
+    Các trường có thể trống có thêm một mặt nạ (bytearray, 1 là trống), giá trị tương ứng
+    trong cột là 0.
+    Các kiểu thời tiết chung được lưu dưới dạng mã định danh, theo 2 cột `condition_offsets`
+    và `condition_ids` (các mã của trạng thái thứ i nằm trong đoạn
+    `condition_ids[condition_offsets[i]:condition_offsets[i + 1]]`).
+    """
+    
+    __slots__ = ('_columns', '_nulls', '_condition_offsets', '_condition_ids')
+    
+    _FLOAT_FIELDS = ('temp', 'feels_temp', 'wind_speed', 'wind_gust', 'rain', 'pm2_5')
+    _TIME_FIELDS = ('collect_time', 'sunrise', 'sunset')
+    # Các trường luôn có giá trị nên không cần mặt nạ
+    _REQUIRED_FIELDS = ('city_id', 'collect_time')
+    _EPOCH = datetime(1970, 1, 1)
+    _SECOND = timedelta(seconds=1)
+    
+    def __init__(self, weather_statuses: Iterable[WeatherStatus] = ()):
+        """
+        Khởi tạo một batch, có thể kèm các trạng thái thời tiết ban đầu.
+
+        Args:
+            weather_statuses (Iterable[WeatherStatus], optional): Các trạng thái thời tiết
+                được thêm vào batch. Defaults to ().
+        """
+        self._columns: dict[str, array] = {
+            field: array('d' if field in self._FLOAT_FIELDS else 'q')
+            for field in WeatherStatus.DB_FIELDS
+        }
+        self._nulls: dict[str, bytearray] = {
+            field: bytearray() for field in WeatherStatus.DB_FIELDS
+            if field not in self._REQUIRED_FIELDS
+        }
+        self._condition_offsets = array('q', [0])
+        self._condition_ids = array('q')
+        self.extend(weather_statuses)
+    
+    def append(self, weather_status: WeatherStatus) -> None:
+        """
+        Thêm một trạng thái thời tiết vào cuối batch.
+
+        Args:
+            weather_status (WeatherStatus): Trạng thái thời tiết cần thêm
+        """
+        for field, value in zip(WeatherStatus.DB_FIELDS, weather_status.to_tuple()):
+            nulls = self._nulls.get(field)
+            if nulls is not None:
+                nulls.append(value is None)
+                if value is None:
+                    value = 0
+                elif field in self._TIME_FIELDS:
+                    value = self._to_seconds(value)
+            elif field == 'collect_time':
+                value = self._to_seconds(value)
+            self._columns[field].append(value)
+        self._condition_ids.extend(general_weather.status_id
+                                   for general_weather in weather_status.general_weathers)
+        self._condition_offsets.append(len(self._condition_ids))
+    
+    @classmethod
+    def _to_seconds(cls, value: datetime) -> int:
+        """
+        Đổi một thời điểm naive thành số giây được lưu trong batch.
+
+        Args:
+            value (datetime): Thời điểm naive
+
+        Raises:
+            ValueError: Nếu thời điểm có múi giờ.
+
+        Returns:
+            int: Số giây từ `1970-01-01 00:00:00`
+        """
+        if value.tzinfo is not None:
+            raise ValueError("WeatherStatusBatch only stores naive datetimes!")
+        return (value - cls._EPOCH) // cls._SECOND
+    
+    def extend(self, weather_statuses: Iterable[WeatherStatus]) -> None:
+        """
+        Thêm nhiều trạng thái thời tiết vào cuối batch.
+
+        Args:
+            weather_statuses (Iterable[WeatherStatus]): Các trạng thái thời tiết cần thêm
+        """
+        for weather_status in weather_statuses:
+            self.append(weather_status)
+    
+    def __len__(self) -> int:
+        return len(self._condition_offsets) - 1
+    
+    def column(self, field: str) -> array:
+        """
+        Lấy cột dữ liệu của một trường, dùng cho các phép tính trên cả batch.
+        Các vị trí trống có giá trị 0, xem `null_mask`.
+
+        Args:
+            field (str): Tên trường, là một trong `WeatherStatus.DB_FIELDS`
+
+        Returns:
+            array: Cột dữ liệu (các trường thời gian là số giây từ `1970-01-01 00:00:00`, naive)
+        """
+        return self._columns[field]
+    
+    def null_mask(self, field: str) -> bytearray|None:
+        """
+        Lấy mặt nạ các giá trị trống của một trường.
+
+        Args:
+            field (str): Tên trường, là một trong `WeatherStatus.DB_FIELDS`
+
+        Returns:
+            bytearray | None: Mặt nạ (1 là trống), None nếu trường luôn có giá trị
+        """
+        return self._nulls.get(field)
+    
+    def condition_ids(self, index: int) -> array:
+        """
+        Lấy mã các kiểu thời tiết chung của trạng thái thứ `index`.
+
+        Args:
+            index (int): Vị trí của trạng thái trong batch
+
+        Returns:
+            array: Các mã định danh kiểu thời tiết
+        """
+        return self._condition_ids[self._condition_offsets[index]:self._condition_offsets[index + 1]]
+    
+    def _rows(self) -> list[tuple]:
+        """
+        Chuyển các cột về các dòng theo thứ tự của `WeatherStatus.DB_FIELDS`,
+        các trường thời gian được đổi lại thành datetime.
+
+        Returns:
+            list[tuple]: Các dòng dữ liệu
+        """
+        columns: list[list] = []
+        for field in WeatherStatus.DB_FIELDS:
+            values = self._columns[field]
+            if field in self._TIME_FIELDS:
+                values = [self._EPOCH + timedelta(seconds=value) for value in values]
+            else:
+                values = values.tolist()
+            nulls = self._nulls.get(field)
+            if nulls is not None and any(nulls):
+                values = [None if null else value for value, null in zip(values, nulls)]
+            columns.append(values)
+        return list(zip(*columns))
+    
+    def to_weather_statuses(self) -> list[WeatherStatus]:
+        """
+        Chuyển batch thành danh sách các trạng thái thời tiết. Các kiểu thời tiết chung
+        được lấy từ cache dùng chung (`weather.cache`), kiểu nào không có trong cache
+        thì chỉ có mã định danh (không có diễn giải).
+
+        Returns:
+            list[WeatherStatus]: Danh sách các trạng thái thời tiết
+        """
+        # Import tại đây vì module cache cần tới module này
+        from weather.cache import get_general_weather_cache
+        cache = get_general_weather_cache()
+        
+        # Các giá trị đã được kiểm tra khi tạo WeatherStatus ban đầu nên không cần kiểm tra lại
+        return [WeatherStatus._from_db_row(row, [cache.get(status_id) or GeneralWeather.of(status_id)
+                                                 for status_id in self.condition_ids(index)])
+                for index, row in enumerate(self._rows())]
+    
+    def to_mysql_params(self) -> tuple[list[tuple], list[tuple], list[tuple]]:
+        """
+        Tạo các tham số cho `executemany` khi thêm batch vào CSDL MySQL.
+
+        Returns:
+            tuple[list[tuple], list[tuple], list[tuple]]: Các dòng của bảng weather_status
+                (theo thứ tự của `WeatherStatus.DB_FIELDS`), các khóa (city_id, collect_time)
+                và các dòng của bảng weather_condition (city_id, collect_time, status_id)
+        """
+        status_rows = self._rows()
+        key_rows = [(row[0], row[1]) for row in status_rows]
+        condition_rows = [(city_id, collect_time, status_id)
+                          for index, (city_id, collect_time) in enumerate(key_rows)
+                          for status_id in self.condition_ids(index)]
+        return status_rows, key_rows, condition_rows
+    
+    def to_mongo_documents(self) -> list[dict]:
+        """
+        Tạo các document của collection weather_status (các general weather chỉ có `status_id`).
+
+        Returns:
+            list[dict]: Các document
+        """
+        documents: list[dict] = []
+        for index, row in enumerate(self._rows()):
+            document = dict(zip(WeatherStatus.DB_FIELDS, row))
+            document['general_weathers'] = [{'status_id': status_id}
+                                            for status_id in self.condition_ids(index)]
+            documents.append(document)
+        return documents